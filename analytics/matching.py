@@ -0,0 +1,266 @@
+#tenabot/analytics/matching.py
+"""
+Candidate-to-job matching over parsed resumes.
+
+Every resume is a sparse row of sublinear term frequencies (1 + log tf)
+over normalized skills, position words and resume text. IDF weights are
+kept separately as document frequencies, so appending resumes never
+rewrites existing rows: a query is one sparse matrix-vector product
+X @ (q * idf^2), divided by the cached tf-idf row norms.
+
+The index is persisted as .npy arrays in a versioned directory under
+MATCHING_INDEX_DIR and loaded with mmap_mode="r": workers start without
+parsing anything and share the arrays through the page cache.
+"""
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, Optional
+
+import numpy as np
+from django.conf import settings
+from scipy.sparse import csr_matrix
+
+from .normalization import normalize_skill
+
+logger = logging.getLogger(__name__)
+
+# Term weights: a listed skill counts more than a word in the position, which counts more than body text
+SKILL_WEIGHT, POSITION_WEIGHT, TEXT_WEIGHT = 3, 2, 1
+MAX_SKILL_WORDS = 3
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the their this to was we were will with
+you your able work working team teams experience years year role job using use including etc
+""".split())
+
+ARRAYS = ("df", "data", "indices", "indptr", "row_ids")
+CURRENT_FILE = "CURRENT"
+KEEP_VERSIONS = 2
+
+
+def words(text: Optional[str]) -> list:
+    if not text:
+        return []
+    return [w for w in _WORD.findall(text.casefold()) if len(w) > 1 and w not in STOP_WORDS]
+
+
+def resume_terms(skills: Iterable[str], position: Optional[str], text: Optional[str]) -> Counter:
+    """Weighted term counts of one resume; skills are expected already normalized."""
+    counts = Counter()
+    for skill in skills or ():
+        counts[skill] += SKILL_WEIGHT
+    for word in words(position):
+        counts[word] += POSITION_WEIGHT
+    for word in words(text):
+        counts[word] += TEXT_WEIGHT
+    return counts
+
+
+class MatchingIndex:
+    """Append-only tf matrix plus document frequencies; see the module docstring."""
+
+    def __init__(self, vocab: list = None, df=None, data=None, indices=None, indptr=None, row_ids=None,
+                 watermark: Optional[datetime] = None):
+        self.terms = list(vocab or [])
+        self.vocab = {term: i for i, term in enumerate(self.terms)}
+        self.df = np.asanyarray(df if df is not None else [], dtype=np.int64)
+        self.data = np.asanyarray(data if data is not None else [], dtype=np.float32)
+        # int32 or int64, as written by _compact
+        self.indices = np.asanyarray(indices) if indices is not None else np.zeros(0, dtype=np.int32)
+        self.indptr = np.asanyarray(indptr) if indptr is not None else np.zeros(1, dtype=np.int32)
+        self.row_ids = np.asanyarray(row_ids if row_ids is not None else [], dtype=np.int64)
+        # resume_text.created_at of the newest row indexed; the next incremental build starts here
+        self.watermark = watermark
+
+        self._pending_data, self._pending_indices, self._pending_lengths, self._pending_ids = [], [], [], []
+        self._pending_df = Counter()
+        self._known_ids = None
+        self._matrix = None
+        self._norms = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.row_ids) + len(self._pending_ids)
+
+    # --- building ---
+
+    def add(self, resume_info_id: int, counts: Counter) -> bool:
+        """Append one resume; returns False if it is already indexed or has no terms."""
+        if self._known_ids is None:
+            self._known_ids = set(self.row_ids.tolist())
+        if resume_info_id in self._known_ids or not counts:
+            return False
+        columns = []
+        for term in counts:
+            column = self.vocab.get(term)
+            if column is None:
+                column = self.vocab[term] = len(self.terms)
+                self.terms.append(term)
+            columns.append(column)
+        order = np.argsort(columns)
+        tf = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+        self._pending_indices.append(np.asarray(columns, dtype=np.int64)[order])
+        self._pending_data.append(tf[order])
+        self._pending_lengths.append(len(columns))
+        self._pending_ids.append(resume_info_id)
+        self._pending_df.update(columns)
+        self._known_ids.add(resume_info_id)
+        return True
+
+    def _compact(self):
+        """Fold pending rows into the arrays (copies them out of the mmap)."""
+        if not self._pending_ids:
+            return
+        df = np.zeros(len(self.terms), dtype=np.int64)
+        df[:len(self.df)] = self.df
+        columns = np.fromiter(self._pending_df.keys(), dtype=np.int64, count=len(self._pending_df))
+        df[columns] += np.fromiter(self._pending_df.values(), dtype=np.int64, count=len(self._pending_df))
+        self.df = df
+        self.data = np.concatenate([self.data, *self._pending_data])
+        # scipy uses int32 indices whenever they fit and would copy wider arrays to get them
+        index_dtype = np.int32 if max(len(self.data), len(self.terms)) < 2 ** 31 else np.int64
+        self.indices = np.concatenate([self.indices, *self._pending_indices]).astype(index_dtype, copy=False)
+        self.indptr = np.concatenate(
+            [self.indptr, self.indptr[-1] + np.cumsum(self._pending_lengths)]
+        ).astype(index_dtype, copy=False)
+        self.row_ids = np.concatenate([self.row_ids, np.asarray(self._pending_ids, dtype=np.int64)])
+        self._pending_data, self._pending_indices, self._pending_lengths, self._pending_ids = [], [], [], []
+        self._pending_df = Counter()
+        self._matrix = None
+        self._norms = None
+
+    # --- querying ---
+
+    def _idf(self):
+        return np.log((1.0 + len(self.row_ids)) / (1.0 + self.df)) + 1.0
+
+    def _prepare(self):
+        """Matrix, squared idf and tf-idf row norms, recomputed only after the index changed."""
+        with self._lock:
+            self._compact()
+            if self._matrix is None:
+                # Index dtypes match what scipy picks, so it wraps the mmaps instead of copying them
+                self._matrix = csr_matrix((self.data, self.indices, self.indptr),
+                                          shape=(len(self.row_ids), len(self.terms)), copy=False)
+                self._idf_sq = self._idf() ** 2
+            if self._norms is None:
+                norms = np.sqrt(self._matrix.multiply(self._matrix) @ self._idf_sq)
+                norms[norms == 0] = 1.0
+                self._norms = norms
+            return self._matrix, self._idf_sq, self._norms
+
+    def _query_terms(self, job_description: str) -> Counter:
+        """Column counts for the words of the job description plus any 1-3 word phrase naming an indexed skill."""
+        tokens = words(job_description)
+        counts = Counter(self.vocab[token] for token in tokens if token in self.vocab)
+        for size in range(1, MAX_SKILL_WORDS + 1):
+            for start in range(len(tokens) - size + 1):
+                phrase = normalize_skill(" ".join(tokens[start:start + size]))
+                # Single words were counted above unless an alias maps them elsewhere (postgres -> postgresql)
+                if phrase in self.vocab and (size > 1 or phrase != tokens[start]):
+                    counts[self.vocab[phrase]] += 1
+        return counts
+
+    def top_k(self, job_description: str, k: int = 10) -> list:
+        """[(resume_info_id, cosine similarity)] best first; empty if nothing in the index overlaps."""
+        matrix, idf_sq, norms = self._prepare()
+        counts = self._query_terms(job_description)
+        if not counts or not matrix.shape[0] or k < 1:
+            return []
+        columns = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float64, count=len(counts)))
+        weights = np.zeros(matrix.shape[1])
+        weights[columns] = tf * idf_sq[columns]
+        query_norm = math.sqrt(float(np.sum(tf ** 2 * idf_sq[columns])))
+
+        scores = (matrix @ weights) / (norms * query_norm)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(self.row_ids[i]), float(scores[i])) for i in top if scores[i] > 0]
+
+    # --- persistence ---
+
+    def save(self, directory: str) -> str:
+        """Write a new version and point CURRENT at it atomically; returns the version path."""
+        self._prepare()  # row norms are stored too, so loading workers skip computing them
+        os.makedirs(directory, exist_ok=True)
+        version = os.path.join(directory, f"v{time.time_ns()}")
+        os.makedirs(version)
+        for name in ARRAYS:
+            np.save(os.path.join(version, f"{name}.npy"), getattr(self, name))
+        np.save(os.path.join(version, "norms.npy"), self._norms)
+        with open(os.path.join(version, "meta.json"), "w") as f:
+            json.dump({"terms": self.terms, "watermark": self.watermark.isoformat() if self.watermark else None}, f)
+
+        pointer = os.path.join(directory, f"{CURRENT_FILE}.tmp")
+        with open(pointer, "w") as f:
+            f.write(os.path.basename(version))
+        os.replace(pointer, os.path.join(directory, CURRENT_FILE))
+
+        # Workers that loaded an older version keep their mmaps (unlinked files stay readable)
+        versions = sorted(d for d in os.listdir(directory) if d.startswith("v"))
+        for old in versions[:-KEEP_VERSIONS]:
+            shutil.rmtree(os.path.join(directory, old), ignore_errors=True)
+        return version
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["MatchingIndex"]:
+        """The current version, memory-mapped; None if nothing has been built yet."""
+        try:
+            with open(os.path.join(directory, CURRENT_FILE)) as f:
+                version = os.path.join(directory, f.read().strip())
+        except FileNotFoundError:
+            return None
+        with open(os.path.join(version, "meta.json")) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(version, f"{name}.npy"), mmap_mode="r") for name in ARRAYS}
+        watermark = datetime.fromisoformat(meta["watermark"]) if meta["watermark"] else None
+        index = cls(vocab=meta["terms"], watermark=watermark, **arrays)
+        index._norms = np.load(os.path.join(version, "norms.npy"), mmap_mode="r")
+        return index
+
+
+def current_version(directory: str) -> Optional[str]:
+    try:
+        with open(os.path.join(directory, CURRENT_FILE)) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+class _IndexHolder:
+    """Per-process index, re-loaded when build_matching_index publishes a newer version."""
+
+    def __init__(self):
+        self._index = None
+        self._version = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[MatchingIndex]:
+        now = time.monotonic()
+        if self._index is not None and now - self._checked < settings.MATCHING_RELOAD_INTERVAL:
+            return self._index
+        with self._lock:
+            if self._index is None or now - self._checked >= settings.MATCHING_RELOAD_INTERVAL:
+                directory = settings.MATCHING_INDEX_DIR
+                version = current_version(directory)
+                if version != self._version:
+                    index = MatchingIndex.load(directory)
+                    logger.info(f"🧮 [MATCH] Loaded matching index {version} ({len(index) if index else 0} resumes)")
+                    self._index, self._version = index, version
+                self._checked = now
+            return self._index
+
+
+matching_index = _IndexHolder()
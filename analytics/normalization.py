@@ -0,0 +1,75 @@
+#tenabot/analytics/normalization.py
+"""
+Canonical forms for values extracted from resumes: skills, so "PostgreSQL",
+"postgres" and " Postgresql " are counted and searched as one, and the raw
+PDF text kept for full-text search.
+"""
+import re
+import unicodedata
+
+# Spelling variants seen in parsed resumes -> canonical name
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "reactjs": "react",
+    "react.js": "react",
+    "nodejs": "node.js",
+    "node": "node.js",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "ms excel": "excel",
+    "microsoft excel": "excel",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "c sharp": "c#",
+    "amazon web services": "aws",
+    "google cloud platform": "gcp",
+    "drf": "django rest framework",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+_BLANK_RUNS = re.compile(r"[ \t\f\v\r]+")
+_LINE_RUNS = re.compile(r"\n\s*\n+")
+_EDGE_PUNCTUATION = " \t.,;:-–—•*\"'()"
+
+# PostgreSQL's tsvector is capped at 1 MB; resumes are far below this
+MAX_TEXT_CHARS = 200_000
+
+
+def normalize_skill(skill: str) -> str:
+    """Case-folded, whitespace-collapsed, alias-resolved skill name ('' if nothing is left)."""
+    value = unicodedata.normalize("NFKC", skill).casefold()
+    value = _WHITESPACE.sub(" ", value).strip(_EDGE_PUNCTUATION)
+    return SKILL_ALIASES.get(value, value)
+
+
+def normalize_skills(skills) -> list:
+    """Distinct normalized skills in first-seen order; non-string entries are skipped."""
+    if not isinstance(skills, list):
+        return []
+    seen = {}
+    for skill in skills:
+        if isinstance(skill, str):
+            value = normalize_skill(skill)
+            if value:
+                seen.setdefault(value, None)
+    return list(seen)
+
+
+def normalize_label(value) -> str:
+    """Position or education level as a grouping key: case-folded, whitespace-collapsed, at most 255 chars."""
+    if not isinstance(value, str):
+        return ""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", value).casefold()).strip()[:255]
+
+
+def compact_text(text: str) -> str:
+    """PDF text with runs of blanks and empty lines collapsed and NUL bytes (rejected by PostgreSQL) removed."""
+    text = unicodedata.normalize("NFKC", text).replace("\x00", "")
+    text = _BLANK_RUNS.sub(" ", text)
+    text = _LINE_RUNS.sub("\n", text)
+    return "\n".join(line.strip() for line in text.strip().split("\n"))[:MAX_TEXT_CHARS]
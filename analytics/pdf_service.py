@@ -4,6 +4,7 @@ import os
 import time
 import logging
 from django.conf import settings
+from tenabot.media import sharded_path
 import re
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -24,6 +25,7 @@ from reportlab.platypus import Paragraph
 logger = logging.getLogger(__name__)
 
 from math import ceil
+from itertools import zip_longest
 
 
 def split_in_two_columns(items):
@@ -31,6 +33,18 @@ def split_in_two_columns(items):
     half = ceil(len(items) / 2)
     return items[:half], items[half:]
 
+
+def two_column_table(items, style):
+    """Bulleted two-column table with one row per pair so long lists can split across pages."""
+    col1, col2 = split_in_two_columns(items)
+    rows = [
+        [Paragraph(f"• {left}", style), Paragraph(f"• {right}", style) if right is not None else ""]
+        for left, right in zip_longest(col1, col2)
+    ]
+    table = Table(rows, colWidths=[3.2 * inch, 3.2 * inch])
+    table.setStyle(TableStyle([("VALIGN", (0, 0), (-1, -1), "TOP")]))
+    return table
+
 # --- Helper Function to Clean List Data (Prevents 'float' errors) ---
 def clean_list_data(data_list: list) -> list:
     """Ensure list only contains clean strings (no floats or None)."""
@@ -66,10 +80,8 @@ def generate_harvard_pdf(resume_data: dict, telegram_id: int) -> str | None:
     """Generate a clean and visually appealing Harvard-style resume PDF."""
     try:
         # --- File Path Setup ---
-        output_dir = os.path.join(settings.MEDIA_ROOT, "generated_resumes")
-        os.makedirs(output_dir, exist_ok=True)
         filename_base = f"resume_{telegram_id}_{int(time.time())}.pdf"
-        pdf_path = os.path.join(output_dir, filename_base)
+        pdf_path = os.path.join(settings.MEDIA_ROOT, sharded_path("generated_resumes", filename_base))
 
         logger.info(f"🧾 [PDF] Generating Harvard-style resume for user {telegram_id}")
         logger.info(f"🗂 Saving to {pdf_path}")
@@ -211,12 +223,7 @@ def generate_harvard_pdf(resume_data: dict, telegram_id: int) -> str | None:
         core_values = clean_list_data(resume_data.get("core_values", []))
         if core_values:
             story.append(Paragraph("Core Values", styles["SectionTitle"]))
-            col1, col2 = split_in_two_columns(core_values)
-            col1_items = [Paragraph(f"• {v}", styles["Body"]) for v in col1]
-            col2_items = [Paragraph(f"• {v}", styles["Body"]) for v in col2]
-            core_table = Table([[col1_items, col2_items]], colWidths=[3.2 * inch, 3.2 * inch])
-            core_table.setStyle(TableStyle([("VALIGN", (0, 0), (-1, -1), "TOP")]))
-            story.append(core_table)
+            story.append(two_column_table(core_values, styles["Body"]))
             story.append(Spacer(1, 0.25 * inch))
             story.append(HRFlowable(width="100%", thickness=0.5, color=colors.lightgrey))
             story.append(Spacer(1, 0.25 * inch))
@@ -225,12 +232,7 @@ def generate_harvard_pdf(resume_data: dict, telegram_id: int) -> str | None:
         skills = clean_list_data(resume_data.get("skills", []))
         if skills:
             story.append(Paragraph("Skills", styles["SectionTitle"]))
-            col1, col2 = split_in_two_columns(skills)
-            col1_items = [Paragraph(f"• {s}", styles["Body"]) for s in col1]
-            col2_items = [Paragraph(f"• {s}", styles["Body"]) for s in col2]
-            skill_table = Table([[col1_items, col2_items]], colWidths=[3.2 * inch, 3.2 * inch])
-            skill_table.setStyle(TableStyle([("VALIGN", (0, 0), (-1, -1), "TOP")]))
-            story.append(skill_table)
+            story.append(two_column_table(skills, styles["Body"]))
             story.append(Spacer(1, 0.25 * inch))
             story.append(HRFlowable(width="100%", thickness=0.5, color=colors.lightgrey))
             story.append(Spacer(1, 0.25 * inch))
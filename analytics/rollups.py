@@ -0,0 +1,159 @@
+#tenabot/analytics/rollups.py
+"""
+Pre-aggregated counts for the analytics dashboards.
+
+rollup_daily_counts holds processed resumes per (dimension, day, value) for
+normalized skills, positions and education levels; rollup_hourly_volume
+holds uploads and processed resumes per UTC hour. Both are bumped with
+UPSERTs in the same transaction as the upload or processing commit, and
+compact_rollups rebuilds recent days from the source tables every night
+(re-processed resumes, rows written before the rollups existed). Daily counts
+are keyed by upload day, so a resume re-processed later is only corrected by
+a rebuild whose window covers the day it was uploaded.
+"""
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import DateTime, func, select, text
+
+from bot.models import DailyDimensionCount, HourlyVolume, Resume, ResumeInfo, ResumeText
+from .normalization import normalize_label
+
+SKILL, POSITION, EDUCATION_LEVEL = "skill", "position", "education_level"
+DIMENSIONS = (SKILL, POSITION, EDUCATION_LEVEL)
+
+_BUMP_DAILY = text("""
+    INSERT INTO rollup_daily_counts (dimension, day, value, count) VALUES (:dimension, :day, :value, :count)
+    ON CONFLICT (dimension, day, value) DO UPDATE SET count = rollup_daily_counts.count + EXCLUDED.count
+""")
+
+_BUMP_HOURLY = text("""
+    INSERT INTO rollup_hourly_volume (hour, uploads, processed) VALUES (:hour, :uploads, :processed)
+    ON CONFLICT (hour) DO UPDATE SET uploads = rollup_hourly_volume.uploads + EXCLUDED.uploads,
+                                     processed = rollup_hourly_volume.processed + EXCLUDED.processed
+""")
+
+# Conflicts with the ROW EXCLUSIVE lock every bump takes, and with itself; plain reads still go through.
+_LOCK_ROLLUPS = text("LOCK TABLE rollup_daily_counts, rollup_hourly_volume IN SHARE ROW EXCLUSIVE MODE")
+
+
+def _hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def dimension_values(skills_normalized, position, education_level) -> list:
+    """(dimension, value) pairs one processed resume contributes to rollup_daily_counts."""
+    pairs = [(SKILL, skill[:255]) for skill in dict.fromkeys(skills_normalized or ()) if skill]
+    for dimension, raw in ((POSITION, position), (EDUCATION_LEVEL, education_level)):
+        value = normalize_label(raw)
+        if value:
+            pairs.append((dimension, value))
+    return pairs
+
+
+def record_upload(session, uploaded_at: datetime):
+    """Count an upload; runs in the caller's transaction."""
+    session.execute(_BUMP_HOURLY, {"hour": _hour(uploaded_at), "uploads": 1, "processed": 0})
+
+
+def record_processed(session, resume_info, processed_at: Optional[datetime] = None):
+    """Count a processed resume by its dimensions (on its upload day) and processing hour; caller's transaction."""
+    day = (resume_info.created_at or datetime.utcnow()).date()
+    # One lock order for every writer, so concurrent commits don't deadlock on shared rows
+    params = [
+        {"dimension": dimension, "day": day, "value": value, "count": 1}
+        for dimension, value in sorted(dimension_values(
+            resume_info.skills_normalized, resume_info.position, resume_info.education_level
+        ))
+    ]
+    if params:
+        session.execute(_BUMP_DAILY, params)
+    session.execute(_BUMP_HOURLY, {"hour": _hour(processed_at or datetime.utcnow()), "uploads": 0, "processed": 1})
+
+
+# --- nightly compaction ---
+
+def _day_bounds(start: date, end: date):
+    """[start 00:00, day after end 00:00) as naive UTC datetimes."""
+    return datetime.combine(start, time.min), datetime.combine(end + timedelta(days=1), time.min)
+
+
+def compact(session, start: date, end: date, fetch_size: int = 1000, lock_timeout_ms: int = 5000) -> dict:
+    """
+    Rebuild both rollups for the days start..end (inclusive) from resume_info, resumes and resume_text,
+    replacing whatever the incremental updates wrote. Commits once, so readers never see a partial day.
+
+    Both rollup tables are locked against writers from before the source reads until the commit:
+    uploads and processing commits in flight finish first and are counted, later ones wait and
+    add to the rebuilt rows. Raises if the lock isn't granted within lock_timeout_ms.
+    """
+    low, high = _day_bounds(start, end)
+
+    # SQLite (tests) has no table locks and serialises writers anyway.
+    if session.get_bind().dialect.name == "postgresql":
+        session.execute(text(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}"))
+        session.execute(_LOCK_ROLLUPS)
+
+    counts = Counter()
+    rows = session.execute(
+        select(ResumeInfo.created_at, ResumeInfo.skills_normalized, ResumeInfo.position, ResumeInfo.education_level)
+        .join(Resume, Resume.id == ResumeInfo.resume_id)
+        .where(Resume.processed.is_(True), ResumeInfo.created_at >= low, ResumeInfo.created_at < high)
+        .execution_options(yield_per=fetch_size)
+    )
+    for created_at, skills, position, education_level in rows:
+        day = created_at.date()
+        for dimension, value in dimension_values(skills, position, education_level):
+            counts[(dimension, day, value)] += 1
+
+    hour = func.date_trunc("hour", Resume.created_at, type_=DateTime)
+    uploads = dict(session.execute(
+        select(hour, func.count()).where(Resume.created_at >= low, Resume.created_at < high).group_by(hour)
+    ).all())
+    hour = func.date_trunc("hour", ResumeText.created_at, type_=DateTime)
+    processed = dict(session.execute(
+        select(hour, func.count()).where(ResumeText.created_at >= low, ResumeText.created_at < high).group_by(hour)
+    ).all())
+
+    session.query(DailyDimensionCount).filter(
+        DailyDimensionCount.day >= start, DailyDimensionCount.day <= end
+    ).delete(synchronize_session=False)
+    session.query(HourlyVolume).filter(HourlyVolume.hour >= low, HourlyVolume.hour < high).delete(synchronize_session=False)
+    if counts:
+        session.execute(DailyDimensionCount.__table__.insert(), [
+            {"dimension": dimension, "day": day, "value": value, "count": count}
+            for (dimension, day, value), count in counts.items()
+        ])
+    hours = sorted(set(uploads) | set(processed))
+    if hours:
+        session.execute(HourlyVolume.__table__.insert(), [
+            {"hour": h, "uploads": uploads.get(h, 0), "processed": processed.get(h, 0)} for h in hours
+        ])
+    session.commit()
+    return {"daily_rows": len(counts), "hourly_rows": len(hours)}
+
+
+# --- reads ---
+
+def top_values(session, dimension: str, start: date, end: date, limit: int = 50) -> list:
+    """[(value, count)] for the days start..end, most frequent first."""
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"dimension must be one of {', '.join(DIMENSIONS)}")
+    total = func.sum(DailyDimensionCount.count).label("total")
+    return [tuple(row) for row in session.execute(
+        select(DailyDimensionCount.value, total)
+        .where(DailyDimensionCount.dimension == dimension,
+               DailyDimensionCount.day >= start, DailyDimensionCount.day <= end)
+        .group_by(DailyDimensionCount.value)
+        .order_by(total.desc(), DailyDimensionCount.value)
+        .limit(limit)
+    )]
+
+
+def hourly_volume(session, start: date, end: date) -> list:
+    """HourlyVolume rows for the days start..end, oldest first; hours without activity are absent."""
+    low, high = _day_bounds(start, end)
+    return session.execute(
+        select(HourlyVolume).where(HourlyVolume.hour >= low, HourlyVolume.hour < high).order_by(HourlyVolume.hour)
+    ).scalars().all()
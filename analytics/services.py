@@ -5,14 +5,15 @@ from google import genai
 from google.genai import types
 from django.conf import settings
 from tenabot.db import get_db
-from bot.models import Resume, ResumeInfo
+from bot.models import Resume, ResumeInfo, ResumeText
 from .pdf_service import generate_harvard_pdf
 from tenabot.notification import send_pdf_to_telegram
+from tenabot.dispatcher import get_dispatcher, log_send_failure
 import json
 
-import telegram
-
 from .models import ResumeAnalysisSchema, FinalResumeOutput
+from . import rollups
+from .normalization import compact_text, normalize_skills
 
 import logging
 logger = logging.getLogger(__name__)  # ✅ Correct logger usage
@@ -125,21 +126,23 @@ def analyze_resume_with_gemini(resume_text: str, job_description: str = "") -> d
 
 # --- Main Processing Pipeline ---
 
-def process_and_save_resume_info(resume_id: int, file_path: str, job_description: str):
+def process_and_save_resume_info(resume_id: int, file_path: str, job_description: str,
+                                 telegram_id=None, job_title: str = None):
     """
     Main function: extract → analyze → validate content → update DB → generate/send PDF.
+    Callers that already know the user's telegram_id and the job title pass them,
+    which saves loading the user row.
     """
     db_gen = get_db()
     db = next(db_gen)
-    telegram_id = None
-    job_title = "Resume"
     
     # Pre-fetch user/job info for error reporting outside the main try block
     try:
-        resume_record = db.query(Resume).filter(Resume.id == resume_id).one_or_none()
+        resume_record = db.get(Resume, resume_id)
         if resume_record:
-            telegram_id = resume_record.user.telegram_id
-            job_title = resume_record.job_title
+            if telegram_id is None:
+                telegram_id = resume_record.user.telegram_id
+            job_title = job_title or resume_record.job_title or "Resume"
         else:
             logger.error(f"❌ Resume record not found for ID={resume_id}. Cannot proceed.")
             return
@@ -168,17 +171,16 @@ def process_and_save_resume_info(resume_id: int, file_path: str, job_description
             error_msg = f"PDF validation failed. The document does not appear to be a resume (missing keywords: {', '.join(MANDATORY_RESUME_KEYWORDS[:3])}...)."
             logger.warning(f"⚠️ [VALIDATION FAIL] Resume ID={resume_id}: {error_msg}")
             
-            # Send specific validation failure message to Telegram
-            bot = telegram.Bot(token=settings.TELEGRAM_BOT_TOKEN)
-            bot.send_message(
-                chat_id=telegram_id,
+            # Send specific validation failure message to Telegram (queued, rate-limited)
+            log_send_failure(get_dispatcher().send_message(
+                telegram_id,
                 text=(
                     f"⚠️ *Resume Analysis Halted - Invalid Content*\n\n"
                     f"The file you uploaded for *{job_title}* does not contain typical resume content "
                     f"(e.g., *Education*, *Skills*, *Experience*). Please ensure you are uploading a clear resume PDF."
                 ),
                 parse_mode="Markdown",
-            )
+            ), "Validation failure notification")
             return
 
         logger.info("✅ PDF content validated successfully.")
@@ -203,11 +205,15 @@ def process_and_save_resume_info(resume_id: int, file_path: str, job_description
         resume_info.education_level = analysis_data.get("education_level")
         resume_info.work_history = analysis_data.get("work_history")
         resume_info.skills = analysis_data.get("skills")
+        resume_info.skills_normalized = normalize_skills(resume_info.skills)
         resume_info.core_values = analysis_data.get("core_values")
-        resume_info.structured_json = json.dumps(analysis_data)
+        resume_info.structured_json = analysis_data
+        # Keep what the CV actually says, for full-text search (bot.fulltext)
+        db.merge(ResumeText(resume_info_id=resume_info.id, content=compact_text(resume_text)))
         
         # Mark as processed
         resume_record.processed = True
+        rollups.record_processed(db, resume_info)
         db.commit()
         logger.info(f"💾 [COMMIT] Database updated successfully for resume_id={resume_id}")
 
@@ -217,8 +223,9 @@ def process_and_save_resume_info(resume_id: int, file_path: str, job_description
 
         if pdf_path:
             logger.info(f"✅ [STEP 5] PDF generated. Sending to Telegram user {telegram_id}...")
-            send_pdf_to_telegram(telegram_id, pdf_path, job_title)
-            logger.info(f"📨 [STEP 6] PDF sent successfully.")
+            # The send stores Telegram's file_id on the resume itself, even if it outlasts this wait
+            send_pdf_to_telegram(telegram_id, pdf_path, job_title, resume_id=resume_id)
+            logger.info(f"📨 [STEP 6] PDF delivery finished or continuing in the background.")
         else:
             logger.error(f"⚠️ PDF generation failed for resume ID={resume_id}")
             # Consider sending a failure message here too, if generation failed.
@@ -230,17 +237,16 @@ def process_and_save_resume_info(resume_id: int, file_path: str, job_description
         # Send General Failure Notification to Telegram
         if telegram_id:
             try:
-                # Use existing bot if defined, or create a new one
-                bot = telegram.Bot(token=settings.TELEGRAM_BOT_TOKEN)
-                bot.send_message(
-                    chat_id=telegram_id,
+                # Queued on the shared dispatcher (rate limits + retries)
+                log_send_failure(get_dispatcher().send_message(
+                    telegram_id,
                     text=(
                         f"❌ *Resume Analysis Failed*\n\n"
                         f"An unexpected error occurred while processing your resume for *{job_title}*. "
                         f"Please try again or contact support."
                     ),
                     parse_mode="Markdown",
-                )
+                ), "Failure notification")
             except Exception as bot_e:
                 logger.error(f"⚠️ Telegram notification failed: {bot_e}", exc_info=True)
     finally:
@@ -0,0 +1,166 @@
+import tempfile
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from bot.models import Base, DailyDimensionCount, HourlyVolume, Resume, ResumeInfo, ResumeText, User
+
+from . import rollups
+
+from .matching import MatchingIndex, resume_terms
+from .normalization import compact_text, normalize_skill, normalize_skills
+
+
+class NormalizeSkillTest(SimpleTestCase):
+    def test_case_whitespace_and_punctuation(self):
+        self.assertEqual(normalize_skill("  Machine   Learning. "), "machine learning")
+
+    def test_aliases(self):
+        self.assertEqual(normalize_skill("Postgres"), "postgresql")
+        self.assertEqual(normalize_skill("React.js"), "react")
+
+    def test_symbols_inside_names_survive(self):
+        self.assertEqual(normalize_skill("C++"), "c++")
+        self.assertEqual(normalize_skill("C#"), "c#")
+
+    def test_normalize_skills_dedupes_in_order(self):
+        self.assertEqual(
+            normalize_skills(["PostgreSQL", "Django", "postgres", "", None, "  "]),
+            ["postgresql", "django"],
+        )
+
+    def test_non_list_is_empty(self):
+        self.assertEqual(normalize_skills(None), [])
+        self.assertEqual(normalize_skills("python"), [])
+
+
+class CompactTextTest(SimpleTestCase):
+    def test_collapses_blanks_and_empty_lines(self):
+        self.assertEqual(compact_text("  Jane   Doe\n\n\n  Skills:\tPython \r\n"), "Jane Doe\nSkills: Python")
+
+    def test_drops_nul_bytes(self):
+        self.assertEqual(compact_text("a\x00b"), "ab")
+
+
+class MatchingIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.index = MatchingIndex()
+        self.index.add(1, resume_terms(["python", "django", "postgresql"], "Backend Engineer", "Built REST APIs"))
+        self.index.add(2, resume_terms(["react", "javascript"], "Frontend Developer", "Built web interfaces"))
+        self.index.add(3, resume_terms(["machine learning", "python"], "Data Scientist", "Trained models"))
+
+    def test_best_match_first(self):
+        matches = self.index.top_k("Backend engineer with Django and Postgres", k=3)
+        self.assertEqual(matches[0][0], 1)
+        self.assertNotIn(2, [row_id for row_id, _ in matches])
+
+    def test_multi_word_skills_match_phrases(self):
+        self.assertEqual(self.index.top_k("Machine learning researcher", k=1)[0][0], 3)
+
+    def test_scores_are_cosine_similarities(self):
+        for _, score in self.index.top_k("python django postgresql react", k=3):
+            self.assertTrue(0 < score <= 1)
+
+    def test_no_overlap(self):
+        self.assertEqual(self.index.top_k("forklift operator", k=3), [])
+
+    def test_duplicates_are_skipped(self):
+        self.assertFalse(self.index.add(1, resume_terms(["go"], None, None)))
+        self.assertEqual(len(self.index), 3)
+
+    def test_persisted_index_is_memory_mapped_and_appendable(self):
+        with tempfile.TemporaryDirectory() as directory:
+            expected = self.index.top_k("python developer", k=3)
+            self.index.save(directory)
+            loaded = MatchingIndex.load(directory)
+            self.assertIsInstance(loaded.data, np.memmap)
+            self.assertTrue(np.shares_memory(loaded._prepare()[0].indices, loaded.indices))
+            self.assertEqual(loaded.top_k("python developer", k=3), expected)
+
+            loaded.add(4, resume_terms(["kubernetes", "go"], "DevOps Engineer", None))
+            loaded.save(directory)
+            self.assertEqual(MatchingIndex.load(directory).top_k("k8s and golang", k=1)[0][0], 4)
+
+    def test_load_without_build(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertIsNone(MatchingIndex.load(directory))
+
+
+class RollupsTest(SimpleTestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+
+        @event.listens_for(engine, "connect")
+        def add_date_trunc(dbapi_connection, _):
+            # Only the 'hour' precision used by rollups.compact
+            dbapi_connection.create_function("date_trunc", 2, lambda _, value: value[:13] + ":00:00.000000")
+
+        Base.metadata.create_all(engine, tables=[
+            User.__table__, Resume.__table__, ResumeInfo.__table__,
+            DailyDimensionCount.__table__, HourlyVolume.__table__,
+        ])
+        # resume_text's generated tsvector only exists on PostgreSQL
+        with engine.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE resume_text (resume_info_id INTEGER PRIMARY KEY, content TEXT, created_at DATETIME)")
+        self.session = Session(engine)
+        self.addCleanup(self.session.close)
+
+    def resume_info(self, position="Backend  Engineer", skills=("python", "django")):
+        return SimpleNamespace(created_at=datetime(2026, 3, 1, 9, 30), skills_normalized=list(skills),
+                               position=position, education_level="Master's")
+
+    def test_incremental_updates_accumulate(self):
+        rollups.record_upload(self.session, datetime(2026, 3, 1, 9, 5))
+        rollups.record_upload(self.session, datetime(2026, 3, 1, 9, 55))
+        rollups.record_processed(self.session, self.resume_info(), datetime(2026, 3, 1, 10, 1))
+        rollups.record_processed(self.session, self.resume_info(position="backend engineer", skills=["python"]),
+                                 datetime(2026, 3, 1, 10, 2))
+        self.session.commit()
+
+        day = date(2026, 3, 1)
+        self.assertEqual(rollups.top_values(self.session, rollups.SKILL, day, day), [("python", 2), ("django", 1)])
+        self.assertEqual(rollups.top_values(self.session, rollups.POSITION, day, day), [("backend engineer", 2)])
+        volume = [(row.hour.hour, row.uploads, row.processed) for row in rollups.hourly_volume(self.session, day, day)]
+        self.assertEqual(volume, [(9, 2, 0), (10, 0, 2)])
+
+    def test_compact_rebuilds_from_source(self):
+        # A stale incremental count that the rebuild must replace
+        rollups.record_processed(self.session, self.resume_info(skills=["cobol"]), datetime(2026, 3, 1, 10, 1))
+        self.session.add_all([
+            Resume(id=1, user_id=1, file_path="f", job_title="j", processed=True, created_at=datetime(2026, 3, 1, 9, 10)),
+            Resume(id=2, user_id=1, file_path="f", job_title="j", processed=False, created_at=datetime(2026, 3, 1, 9, 20)),
+            ResumeInfo(id=1, resume_id=1, position="Data Scientist", skills_normalized=["python"],
+                       created_at=datetime(2026, 3, 1, 9, 10)),
+            ResumeInfo(id=2, resume_id=2, position="Data Scientist", skills_normalized=["python"],
+                       created_at=datetime(2026, 3, 1, 9, 20)),
+        ])
+        self.session.flush()
+        self.session.execute(ResumeText.__table__.insert().values(
+            resume_info_id=1, content="text", created_at=datetime(2026, 3, 1, 10, 5)
+        ))
+        self.session.commit()
+
+        day = date(2026, 3, 1)
+        rollups.compact(self.session, day, day)
+        self.assertEqual(rollups.top_values(self.session, rollups.SKILL, day, day), [("python", 1)])
+        self.assertEqual(rollups.top_values(self.session, rollups.POSITION, day, day), [("data scientist", 1)])
+        volume = [(row.hour.hour, row.uploads, row.processed) for row in rollups.hourly_volume(self.session, day, day)]
+        self.assertEqual(volume, [(9, 2, 0), (10, 0, 1)])
+
+    def test_compact_locks_rollups_before_reading_on_postgresql(self):
+        session = mock.MagicMock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+        rollups.compact(session, date(2026, 3, 1), date(2026, 3, 1), lock_timeout_ms=250)
+        statements = [str(c.args[0]) for c in session.execute.call_args_list[:3]]
+        self.assertEqual(statements[:2], ["SET LOCAL lock_timeout = 250", str(rollups._LOCK_ROLLUPS)])
+        self.assertIn("resume_info", statements[2])
+        session.commit.assert_called_once_with()
+
+    def test_unknown_dimension(self):
+        with self.assertRaises(ValueError):
+            rollups.top_values(self.session, "salary", date(2026, 3, 1), date(2026, 3, 1))
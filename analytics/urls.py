@@ -0,0 +1,9 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('match/', views.MatchCandidatesView.as_view(), name='match-candidates'),
+    path('rollups/top/', views.TopValuesView.as_view(), name='rollups-top'),
+    path('rollups/volume/', views.VolumeView.as_view(), name='rollups-volume'),
+]
@@ -0,0 +1,131 @@
+import logging
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils.dateparse import parse_date
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from sqlalchemy import select
+
+from bot.models import ResumeInfo
+from bot.renderers import ORJSONRenderer
+from tenabot.db import get_db
+from tenabot.metrics import registry
+
+from . import rollups
+from .matching import matching_index
+
+logger = logging.getLogger(__name__)
+
+
+class MatchCandidatesView(APIView):
+    """
+    Staff-only: the resumes that best match a job description.
+    POST {"job_description": "...", "k": 20}; k is capped at MATCHING_MAX_K.
+    """
+    permission_classes = [IsAdminUser]
+    renderer_classes = [ORJSONRenderer]
+
+    def post(self, request, *args, **kwargs):
+        job_description = (request.data.get("job_description") or "").strip()
+        try:
+            k = max(1, min(int(request.data.get("k", 20)), settings.MATCHING_MAX_K))
+        except (TypeError, ValueError):
+            return Response({"detail": "k must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        if not job_description:
+            return Response({"detail": "job_description is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        index = matching_index.get()
+        if index is None:
+            return Response({"detail": "The matching index has not been built yet."},
+                            status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        started = time.perf_counter()
+        matches = index.top_k(job_description, k)
+        registry.timer("analytics.match.query").observe(time.perf_counter() - started)
+        logger.info(f"🧮 [MATCH] {len(matches)} candidates for a {len(job_description)}-char job description")
+        if not matches:
+            return Response({"results": []})
+
+        db_gen = get_db()
+        db = next(db_gen)
+        try:
+            rows = db.execute(
+                select(ResumeInfo.id, ResumeInfo.resume_id, ResumeInfo.position, ResumeInfo.skills_normalized)
+                .where(ResumeInfo.id.in_([row_id for row_id, _ in matches]))
+            ).all()
+        finally:
+            db_gen.close()
+
+        by_id = {row.id: row for row in rows}
+        results = [
+            {"id": row_id, "resume_id": by_id[row_id].resume_id, "position": by_id[row_id].position,
+             "skills": by_id[row_id].skills_normalized, "score": round(score, 4)}
+            for row_id, score in matches
+            if row_id in by_id  # deleted since the index was built
+        ]
+        return Response({"results": results})
+
+
+def _date_range(params, default_days: int, max_days: int):
+    """(start, end) from ?since=/?until= (YYYY-MM-DD, UTC days, inclusive); ValueError if malformed or too long."""
+    end = parse_date(params["until"]) if params.get("until") else datetime.utcnow().date()
+    start = parse_date(params["since"]) if params.get("since") else end - timedelta(days=default_days - 1)
+    if start is None or end is None:
+        raise ValueError("since and until must be YYYY-MM-DD")
+    if start > end:
+        raise ValueError("since must not be after until")
+    if (end - start).days >= max_days:
+        raise ValueError(f"at most {max_days} days per request")
+    return start, end
+
+
+class TopValuesView(APIView):
+    """
+    Staff-only: most frequent skills, positions or education levels among processed resumes.
+    ?dimension=skill|position|education_level, ?since=/?until= (default last 30 days), ?limit= (max 500).
+    """
+    permission_classes = [IsAdminUser]
+    renderer_classes = [ORJSONRenderer]
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        db_gen = get_db()
+        db = next(db_gen)
+        try:
+            start, end = _date_range(params, default_days=30, max_days=366)
+            limit = max(1, min(int(params.get("limit", 50)), 500))
+            dimension = params.get("dimension", rollups.SKILL)
+            rows = rollups.top_values(db, dimension, start, end, limit)
+            return Response({
+                "dimension": dimension, "since": start, "until": end,
+                "results": [{"value": value, "count": count} for value, count in rows],
+            })
+        except ValueError as e:
+            return Response({"detail": f"Invalid query parameters: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        finally:
+            db_gen.close()
+
+
+class VolumeView(APIView):
+    """Staff-only: uploads and processed resumes per UTC hour. ?since=/?until= (default last 7 days, max 92)."""
+    permission_classes = [IsAdminUser]
+    renderer_classes = [ORJSONRenderer]
+
+    def get(self, request, *args, **kwargs):
+        db_gen = get_db()
+        db = next(db_gen)
+        try:
+            start, end = _date_range(request.query_params, default_days=7, max_days=92)
+            rows = rollups.hourly_volume(db, start, end)
+            return Response({
+                "since": start, "until": end,
+                "results": [{"hour": row.hour, "uploads": row.uploads, "processed": row.processed} for row in rows],
+            })
+        except ValueError as e:
+            return Response({"detail": f"Invalid query parameters: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        finally:
+            db_gen.close()
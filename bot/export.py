@@ -0,0 +1,114 @@
+#tenabot/bot/export.py
+"""
+Streaming export of parsed resumes (resume_info) as NDJSON or CSV.
+
+Rows are read through a server-side cursor (yield_per) and encoded one
+at a time, so memory stays flat whatever the export size. Used by the
+staff export endpoint and the export_resume_info management command.
+"""
+import csv
+import io
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+
+from .models import Resume, ResumeInfo
+from .renderers import dumps
+from .row_serializers import declared_fields, row_serializer
+from .serializers import ResumeInfoSerializer
+
+FORMATS = ("ndjson", "csv")
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# Same schema as resume-info-list/
+EXPORT_FIELDS = declared_fields(ResumeInfoSerializer)
+
+
+def parse_date(value: Optional[str]) -> Optional[date]:
+    """YYYY-MM-DD or None; ValueError otherwise."""
+    return date.fromisoformat(value) if value else None
+
+
+def parse_processed(value: Optional[str]) -> Optional[bool]:
+    """true/false (also 1/0, yes/no) or None for both states; ValueError otherwise."""
+    if value in (None, ""):
+        return None
+    lowered = value.lower()
+    if lowered in ("1", "true", "yes"):
+        return True
+    if lowered in ("0", "false", "no"):
+        return False
+    raise ValueError(f"processed must be true or false, not {value!r}")
+
+
+def export_query(since: Optional[date] = None, until: Optional[date] = None, processed: Optional[bool] = None):
+    """resume_info rows created in [since, until] (inclusive days), optionally by processed state, in id order."""
+    # Plain column rows: no ORM identity map to grow during a long export.
+    query = select(*(getattr(ResumeInfo, name) for name in EXPORT_FIELDS)).order_by(ResumeInfo.id)
+    if since:
+        query = query.where(ResumeInfo.created_at >= datetime.combine(since, time.min))
+    if until:
+        query = query.where(ResumeInfo.created_at < datetime.combine(until + timedelta(days=1), time.min))
+    if processed is not None:
+        query = query.join(Resume, ResumeInfo.resume_id == Resume.id).where(Resume.processed.is_(processed))
+    return query
+
+
+def iter_rows(session, query, fetch_size: int = 1000) -> Iterator[dict]:
+    """Dicts for every row, streamed from a server-side cursor fetch_size rows at a time."""
+    serialize = row_serializer(ResumeInfo, EXPORT_FIELDS)
+    for row in session.execute(query.execution_options(yield_per=fetch_size)):
+        yield serialize(row)
+
+
+def iter_ndjson(rows: Iterator[dict]) -> Iterator[bytes]:
+    for row in rows:
+        yield dumps(row) + b"\n"
+
+
+def _csv_value(value):
+    # JSON columns become JSON text in their cell; datetimes use the same format as the NDJSON output.
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode()
+    if isinstance(value, datetime):
+        return dumps(value).decode().strip('"')
+    return value
+
+
+def iter_csv(rows: Iterator[dict]) -> Iterator[str]:
+    """Header chunk, then one chunk per row."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+
+    def flush():
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    writer.writeheader()
+    yield flush()
+    for row in rows:
+        writer.writerow({name: _csv_value(value) for name, value in row.items()})
+        yield flush()
+
+
+def stream_export(session_factory, fmt: str, since=None, until=None, processed=None, fetch_size: int = 1000):
+    """
+    Generator of encoded chunks that owns its session: it is opened on the
+    first chunk and closed when the stream ends or the client disconnects.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    encode = iter_ndjson if fmt == "ndjson" else iter_csv
+    query = export_query(since, until, processed)
+
+    def generate():
+        session = session_factory()
+        try:
+            yield from encode(iter_rows(session, query, fetch_size))
+        finally:
+            session.close()
+
+    return generate()
@@ -0,0 +1,122 @@
+#tenabot/bot/fulltext.py
+"""
+Ranked full-text search over resume_text.
+
+Matches come from the GIN index on the stored tsvector. Queries use
+websearch_to_tsquery syntax ("quoted phrases", or, -exclusions) plus
+prefix terms written with a trailing * (devel*). Results are ordered by
+ts_rank_cd and paginated on (rank, id); ts_headline, which re-parses the
+document, only runs for the rows of the returned page.
+"""
+import base64
+import json
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import text
+
+from .models import TEXT_SEARCH_CONFIG
+
+MAX_PREFIX_TERMS = 10
+_PREFIX_TERM = re.compile(r"(?<![\w\"])(-?)(\w+)\*")
+
+HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=20, MinWords=8, StartSel=<mark>, StopSel=</mark>"
+
+
+@dataclass
+class FulltextPage:
+    items: list
+    next: Optional[str]
+
+
+def encode_cursor(rank: float, row_id: int) -> str:
+    payload = json.dumps([rank, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str):
+    """(rank, id); raises ValueError for anything that isn't one of our cursors."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        rank, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(rank), int(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def parse_query(q: str):
+    """
+    (websearch text, prefix terms) from a user query; 'python devel* "data engineer"'
+    gives ('python "data engineer"', ['devel']). ValueError if nothing searchable is left.
+    """
+    q = (q or "").strip()
+    prefixes = []
+
+    def take(match):
+        if match.group(1):  # -devel* : exclusions stay with websearch_to_tsquery, without the *
+            return f"-{match.group(2)}"
+        prefixes.append(match.group(2))
+        return ""
+
+    words = _PREFIX_TERM.sub(take, q).strip()
+    if len(prefixes) > MAX_PREFIX_TERMS:
+        raise ValueError(f"At most {MAX_PREFIX_TERMS} prefix terms can be searched at once")
+    if not words and not prefixes:
+        raise ValueError("q is required")
+    return " ".join(words.split()), list(dict.fromkeys(prefixes))
+
+
+def _tsquery_sql(words: str, prefixes: list, params: dict) -> str:
+    parts = []
+    if words:
+        params["words"] = words
+        parts.append(f"websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', :words)")
+    for i, prefix in enumerate(prefixes):
+        # \w+ only, so the value is a single lexeme; :* makes it a prefix match
+        params[f"prefix_{i}"] = f"{prefix}:*"
+        parts.append(f"to_tsquery('{TEXT_SEARCH_CONFIG}', :prefix_{i})")
+    return " && ".join(parts)
+
+
+def search(session, q: str, page_size: int = 10, cursor: Optional[str] = None) -> FulltextPage:
+    """One page of resumes matching q, best match first, with highlighted snippets."""
+    words, prefixes = parse_query(q)
+    params = {"limit": page_size + 1}
+    tsquery = _tsquery_sql(words, prefixes, params)
+
+    after = ""
+    if cursor:
+        params["rank"], params["after_id"] = decode_cursor(cursor)
+        after = "WHERE (m.rank, m.id) < (CAST(:rank AS real), :after_id)"
+
+    rows = session.execute(text(f"""
+        WITH tsq AS (SELECT {tsquery} AS q),
+        page AS (
+            SELECT m.id, m.rank FROM (
+                SELECT t.resume_info_id AS id, ts_rank_cd(t.tsv, tsq.q) AS rank
+                FROM resume_text t, tsq
+                WHERE t.tsv @@ tsq.q
+            ) m
+            {after}
+            ORDER BY m.rank DESC, m.id DESC
+            LIMIT :limit
+        )
+        SELECT page.id, i.resume_id, i.position, page.rank,
+               ts_headline('{TEXT_SEARCH_CONFIG}', t.content, tsq.q, '{HEADLINE_OPTIONS}') AS headline
+        FROM page
+        JOIN resume_info i ON i.id = page.id
+        JOIN resume_text t ON t.resume_info_id = page.id
+        CROSS JOIN tsq
+        ORDER BY page.rank DESC, page.id DESC
+    """), params).all()
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    items = [
+        {"id": row.id, "resume_id": row.resume_id, "position": row.position,
+         "rank": row.rank, "headline": row.headline}
+        for row in rows
+    ]
+    last = rows[-1] if rows else None
+    return FulltextPage(items=items, next=encode_cursor(last.rank, last.id) if has_more else None)
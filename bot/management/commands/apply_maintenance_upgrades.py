@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from bot.schema import MAINTENANCE_UPGRADES, apply_maintenance_upgrades
+from tenabot.db import engine
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply the schema changes that rewrite whole tables under ACCESS EXCLUSIVE "
+        "(bot.schema.MAINTENANCE_UPGRADES, e.g. resume_info JSON -> JSONB). "
+        "Reads and writes on those tables block until each finishes: run in a maintenance window."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lock-timeout-ms", type=int, default=5000,
+                            help="Give up if a table lock isn't granted within this time (default 5000)")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        apply_maintenance_upgrades(engine, options["lock_timeout_ms"])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Applied {len(MAINTENANCE_UPGRADES)} maintenance upgrade(s) in {time.monotonic() - started:.1f}s"
+        ))
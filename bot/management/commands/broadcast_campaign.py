@@ -0,0 +1,256 @@
+import time
+from collections import deque
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from sqlalchemy import select
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import Forbidden
+
+from bot.models import User
+from promotion.links import click_url
+from promotion.models import AdCampaign, Broadcast
+from promotion.tracking import promotion_tracker
+from tenabot.db import SessionLocal
+from tenabot.dispatcher import get_dispatcher
+
+REACH_USED_UP = "its paid reach is used up"
+
+
+class Command(BaseCommand):
+    help = (
+        "Push a campaign to up to package.number_of_people users through the outbound dispatcher. "
+        "Progress is checkpointed; re-running the command resumes an unfinished broadcast. "
+        "Every message is charged to the campaign's reach, and the broadcast stops when the "
+        "campaign is deactivated, ends or runs out of reach."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("campaign_id", type=int)
+        parser.add_argument("--message", default=None,
+                            help="Text to send when starting a new broadcast (default: campaign title and description)")
+        parser.add_argument("--restart", action="store_true",
+                            help="Start a new broadcast instead of resuming the unfinished one")
+        parser.add_argument("--max-in-flight", type=int, default=200,
+                            help="Messages queued at the dispatcher at once; bounds memory and queue share")
+        parser.add_argument("--fetch-size", type=int, default=1000,
+                            help="Rows per server-side cursor fetch")
+        parser.add_argument("--checkpoint-every", type=float, default=5.0,
+                            help="Seconds between progress checkpoints and reports")
+        parser.add_argument("--send-timeout", type=float, default=120.0,
+                            help="Seconds to wait for one message's result before counting it as failed")
+
+    def handle(self, *args, **options):
+        campaign = (
+            AdCampaign.objects.select_related("package", "channel")
+            .filter(pk=options["campaign_id"])
+            .first()
+        )
+        if campaign is None:
+            raise CommandError(f"Campaign {options['campaign_id']} does not exist.")
+
+        reason = self._stop_reason(campaign)
+        if reason:
+            raise CommandError(f"Campaign {campaign.pk} can't be broadcast: {reason}.")
+
+        broadcast = self._get_broadcast(campaign, options)
+        if broadcast.sent >= broadcast.target:
+            self._finish(broadcast)
+            self.stdout.write(self.style.SUCCESS(f"Broadcast {broadcast.pk} already reached {broadcast.target} users."))
+            return
+        if broadcast.last_user_id:
+            self.stdout.write(f"▶️ Resuming broadcast {broadcast.pk} after user {broadcast.last_user_id} "
+                              f"({broadcast.sent}/{broadcast.target} sent)")
+        else:
+            self.stdout.write(f"📣 Starting broadcast {broadcast.pk} to {broadcast.target} users")
+
+        self._run(broadcast, campaign, options)
+
+    def _get_broadcast(self, campaign, options):
+        broadcast = None
+        if not options["restart"]:
+            broadcast = campaign.broadcasts.filter(status=Broadcast.RUNNING).order_by("-created_at").first()
+        if broadcast is None:
+            message = options["message"] or "\n\n".join(filter(None, [campaign.title, campaign.description]))
+            broadcast = Broadcast.objects.create(
+                campaign=campaign, message=message, target=campaign.package.number_of_people
+            )
+        elif options["message"]:
+            raise CommandError("--message only applies to a new broadcast; add --restart to start one.")
+        return broadcast
+
+    def _recipients(self, session, after_user_id, fetch_size):
+        """(user id, telegram_id) in id order, streamed from a server-side cursor in constant memory."""
+        query = (
+            select(User.id, User.telegram_id)
+            .where(User.is_active.is_(True), User.id > after_user_id)
+            .order_by(User.id)
+            .execution_options(yield_per=fetch_size)
+        )
+        yield from session.execute(query)
+
+    @staticmethod
+    def _stop_reason(campaign):
+        """Why the campaign can't be pushed right now, or None."""
+        today = timezone.localdate()
+        if not campaign.is_active:
+            return "it is not active"
+        if campaign.start_date > today:
+            return f"it starts on {campaign.start_date}"
+        if campaign.end_date and campaign.end_date < today:
+            return f"it ended on {campaign.end_date}"
+        if campaign.remaining_reach <= 0:
+            return REACH_USED_UP
+        return None
+
+    def _reserve(self, campaign_id, wanted):
+        """
+        Atomically charge up to `wanted` impressions to the campaign's reach, as the
+        rotation's leases do. Returns (granted, None) or (0, reason to stop).
+        """
+        with transaction.atomic():
+            campaign = (
+                AdCampaign.objects.select_for_update(of=("self",))
+                .select_related("package")
+                .filter(pk=campaign_id)
+                .first()
+            )
+            reason = self._stop_reason(campaign) if campaign else "it was deleted"
+            if reason == REACH_USED_UP:
+                AdCampaign.objects.filter(pk=campaign_id).update(is_active=False)
+            if reason:
+                return 0, reason
+            granted = min(wanted, campaign.remaining_reach)
+            AdCampaign.objects.filter(pk=campaign_id).update(impressions_served=F("impressions_served") + granted)
+            return granted, None
+
+    @staticmethod
+    def _release(campaign_id, unused):
+        """Give reserved but unsent impressions back to the campaign's reach."""
+        if unused > 0:
+            AdCampaign.objects.filter(pk=campaign_id).update(
+                impressions_served=Greatest(F("impressions_served") - unused, 0)
+            )
+
+    def _run(self, broadcast, campaign, options):
+        dispatcher = get_dispatcher()
+        button_text = f"📢 Join {campaign.channel.channel_name}"
+        text = broadcast.message
+        max_in_flight = max(1, options["max_in_flight"])
+        checkpoint_every = options["checkpoint_every"]
+        send_timeout = options["send_timeout"]
+
+        in_flight = deque()
+        started = last_checkpoint = time.monotonic()
+        session_sent = 0
+        # Impressions charged to the campaign but not yet used by a submitted message.
+        reserved = 0
+        stop_reason = None
+
+        def settle_oldest():
+            nonlocal session_sent, reserved
+            user_id, future = in_flight.popleft()
+            try:
+                future.result(timeout=send_timeout)
+            except FutureTimeout:
+                # A send already in progress may still go out, so it keeps its impression.
+                if future.cancel():
+                    reserved += 1
+                broadcast.failed += 1
+                self.stderr.write(f"❌ User {user_id}: no result after {send_timeout:.0f}s")
+            except Forbidden:
+                broadcast.blocked += 1
+                reserved += 1
+            except Exception as e:
+                broadcast.failed += 1
+                reserved += 1
+                self.stderr.write(f"❌ User {user_id}: {e}")
+            else:
+                broadcast.sent += 1
+                session_sent += 1
+                promotion_tracker.record_impression(campaign.pk)
+            # Futures are settled in id order, so everything up to here is done.
+            broadcast.last_user_id = user_id
+
+        session = SessionLocal()
+        try:
+            for user_id, telegram_id in self._recipients(session, broadcast.last_user_id, options["fetch_size"]):
+                # Stop submitting once the queued messages could fill the paid reach.
+                while in_flight and broadcast.sent + len(in_flight) >= broadcast.target:
+                    settle_oldest()
+                if broadcast.sent >= broadcast.target:
+                    break
+                # Each reservation re-checks the campaign, so a deactivated or
+                # ended campaign stops the push within max_in_flight messages.
+                if not reserved:
+                    wanted = min(max_in_flight, broadcast.target - broadcast.sent - len(in_flight))
+                    reserved, stop_reason = self._reserve(campaign.pk, wanted)
+                    if stop_reason:
+                        break
+
+                # The click link is signed per recipient
+                reply_markup = InlineKeyboardMarkup([[
+                    InlineKeyboardButton(button_text, url=click_url(campaign.pk, user_id))
+                ]])
+                future = dispatcher.submit(
+                    telegram_id,
+                    lambda bot, chat_id=telegram_id, reply_markup=reply_markup: bot.send_message(
+                        chat_id=chat_id, text=text, reply_markup=reply_markup
+                    ),
+                )
+                reserved -= 1
+                in_flight.append((user_id, future))
+                if len(in_flight) >= max_in_flight:
+                    settle_oldest()
+
+                if time.monotonic() - last_checkpoint >= checkpoint_every:
+                    self._checkpoint(broadcast, session_sent, started)
+                    last_checkpoint = time.monotonic()
+
+            while in_flight:
+                settle_oldest()
+        except KeyboardInterrupt:
+            # Messages already queued will still go out; record what is confirmed.
+            while in_flight and in_flight[0][1].done():
+                settle_oldest()
+            self._checkpoint(broadcast, session_sent, started)
+            self.stdout.write(self.style.WARNING(f"⏸️ Interrupted; re-run to resume after user {broadcast.last_user_id}."))
+            return
+        finally:
+            session.close()
+            self._release(campaign.pk, reserved)
+
+        self._checkpoint(broadcast, session_sent, started)
+        if stop_reason and stop_reason != REACH_USED_UP:
+            self.stdout.write(self.style.WARNING(
+                f"⏸️ Campaign {campaign.pk} stopped: {stop_reason}; re-run to resume broadcast "
+                f"{broadcast.pk} after user {broadcast.last_user_id} once it is running again."
+            ))
+            return
+        self._finish(broadcast)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Broadcast {broadcast.pk} finished: {broadcast.sent} sent, "
+            f"{broadcast.blocked} blocked, {broadcast.failed} failed"
+            + (f" ({stop_reason})" if stop_reason else "")
+        ))
+
+    def _checkpoint(self, broadcast, session_sent, started):
+        broadcast.save(update_fields=["last_user_id", "sent", "blocked", "failed", "updated_at"])
+        elapsed = time.monotonic() - started
+        rate = session_sent / elapsed if elapsed else 0.0
+        remaining = broadcast.target - broadcast.sent
+        eta = f", ETA {remaining / rate / 60:.1f} min" if rate and remaining > 0 else ""
+        self.stdout.write(
+            f"📊 {broadcast.sent}/{broadcast.target} sent, {broadcast.blocked} blocked, "
+            f"{broadcast.failed} failed — {rate:.1f} msg/s{eta}"
+        )
+
+    @staticmethod
+    def _finish(broadcast):
+        broadcast.status = Broadcast.COMPLETED
+        broadcast.finished_at = timezone.now()
+        broadcast.save(update_fields=["status", "finished_at", "updated_at"])
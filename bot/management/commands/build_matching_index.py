@@ -0,0 +1,71 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from sqlalchemy import select
+
+from analytics.matching import MatchingIndex, resume_terms
+from bot.models import Resume, ResumeInfo, ResumeText
+from tenabot.db import SessionLocal
+
+# resume_text.created_at comes from each writer's clock and commits can land late;
+# rows this far behind the watermark are re-read (already indexed ids are skipped)
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+class Command(BaseCommand):
+    help = (
+        "Append newly processed resumes to the candidate matching index and publish a new version "
+        "(workers pick it up within MATCHING_RELOAD_INTERVAL)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true",
+                            help="Index every processed resume from scratch (also covers re-processed ones)")
+        parser.add_argument("--fetch-size", type=int, default=1000, help="Rows per server-side cursor fetch")
+        parser.add_argument("--directory", default=settings.MATCHING_INDEX_DIR)
+
+    def handle(self, *args, **options):
+        directory = options["directory"]
+        index = None if options["rebuild"] else MatchingIndex.load(directory)
+        incremental = index is not None
+        if index is None:
+            index = MatchingIndex()
+
+        query = (
+            select(ResumeInfo.id, ResumeInfo.skills_normalized, ResumeInfo.position,
+                   ResumeText.content, ResumeText.created_at)
+            .join(Resume, Resume.id == ResumeInfo.resume_id)
+            .outerjoin(ResumeText, ResumeText.resume_info_id == ResumeInfo.id)
+            .where(Resume.processed.is_(True))
+            .order_by(ResumeInfo.id)
+        )
+        if incremental and index.watermark:
+            query = query.where(ResumeText.created_at > index.watermark - WATERMARK_OVERLAP)
+        self.stdout.write(f"🧮 {'Updating' if incremental else 'Building'} matching index "
+                          f"({len(index)} resumes indexed, watermark {index.watermark})")
+
+        started = time.monotonic()
+        added = 0
+        watermark = index.watermark
+        session = SessionLocal()
+        try:
+            for row_id, skills, position, content, created_at in session.execute(
+                query.execution_options(yield_per=max(1, options["fetch_size"]))
+            ):
+                added += index.add(row_id, resume_terms(skills, position, content))
+                if created_at and (watermark is None or created_at > watermark):
+                    watermark = created_at
+        finally:
+            session.close()
+
+        if not added and incremental:
+            self.stdout.write(self.style.SUCCESS("✅ Nothing new to index."))
+            return
+        index.watermark = watermark
+        version = index.save(directory)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Indexed {added} resumes ({len(index)} total, {len(index.terms)} terms) "
+            f"in {time.monotonic() - started:.1f}s → {version}"
+        ))
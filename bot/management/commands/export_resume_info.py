@@ -0,0 +1,56 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bot import export
+from tenabot.db import SessionLocal
+
+
+class Command(BaseCommand):
+    help = "Stream resume_info to a file (or stdout) as NDJSON or CSV, in constant memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=export.FORMATS, default="ndjson")
+        parser.add_argument("--output", default="-", help="File to write (default: stdout)")
+        parser.add_argument("--since", default=None, help="First created_at day to include (YYYY-MM-DD)")
+        parser.add_argument("--until", default=None, help="Last created_at day to include (YYYY-MM-DD)")
+        parser.add_argument("--processed", default=None, help="Only rows whose resume is (true) or isn't (false) processed")
+        parser.add_argument("--fetch-size", type=int, default=1000, help="Rows per server-side cursor fetch")
+
+    def handle(self, *args, **options):
+        fmt = options["format"]
+        try:
+            since, until = export.parse_date(options["since"]), export.parse_date(options["until"])
+            processed = export.parse_processed(options["processed"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        chunks = export.stream_export(SessionLocal, fmt, since, until, processed, max(1, options["fetch_size"]))
+        to_stdout = options["output"] == "-"
+        # NDJSON chunks are bytes, CSV chunks are text.
+        if to_stdout:
+            out = sys.stdout.buffer if fmt == "ndjson" else sys.stdout
+        elif fmt == "ndjson":
+            out = open(options["output"], "wb")
+        else:
+            out = open(options["output"], "w", encoding="utf-8", newline="")
+
+        started = time.monotonic()
+        rows = 0
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+                rows += 1
+        finally:
+            chunks.close()
+            if to_stdout:
+                out.flush()
+            else:
+                out.close()
+
+        if fmt == "csv":
+            rows -= 1  # header
+        self.stderr.write(self.style.SUCCESS(
+            f"✅ Exported {rows} rows as {fmt} in {time.monotonic() - started:.1f}s"
+        ))
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from telegram import Update
+
+from tenabot.telegram_client import get_telegram_client
+
+
+class Command(BaseCommand):
+    help = "Register (or delete) the Telegram webhook pointing at the ASGI update endpoint"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--delete", action="store_true", help="Remove the webhook (e.g. to go back to polling)")
+        parser.add_argument("--drop-pending", action="store_true", help="Discard updates queued at Telegram")
+        parser.add_argument("--max-connections", type=int, default=settings.TELEGRAM_WEBHOOK_MAX_CONNECTIONS)
+
+    def handle(self, *args, **options):
+        client = get_telegram_client()
+        drop_pending = options["drop_pending"]
+
+        if options["delete"]:
+            client.run(lambda bot: bot.delete_webhook(drop_pending_updates=drop_pending), timeout=30)
+            self.stdout.write(self.style.SUCCESS("Webhook deleted."))
+            return
+
+        if not settings.WEBHOOK_URL:
+            raise CommandError("WEBHOOK_URL is not set.")
+        if not settings.TELEGRAM_WEBHOOK_SECRET:
+            raise CommandError("TELEGRAM_WEBHOOK_SECRET is not set.")
+
+        client.run(lambda bot: bot.set_webhook(
+            url=settings.WEBHOOK_URL,
+            secret_token=settings.TELEGRAM_WEBHOOK_SECRET,
+            allowed_updates=Update.ALL_TYPES,
+            max_connections=options["max_connections"],
+            drop_pending_updates=drop_pending,
+        ), timeout=30)
+        info = client.run(lambda bot: bot.get_webhook_info(), timeout=30)
+        self.stdout.write(self.style.SUCCESS(
+            f"Webhook set to {info.url} (pending updates: {info.pending_update_count})"
+        ))
@@ -0,0 +1,144 @@
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from sqlalchemy import select, update
+
+from bot.models import Resume
+from tenabot.db import SessionLocal
+from tenabot.media import iter_files
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete or archive uploaded and generated PDFs older than the retention window. "
+        "Uploads of resumes that were never processed are kept; for processed ones "
+        "resumes.file_swept_at is set."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.MEDIA_RETENTION_DAYS,
+                            help="Retention window in days (default: MEDIA_RETENTION_DAYS)")
+        parser.add_argument("--tree", action="append", choices=settings.MEDIA_SWEEP_TREES,
+                            help="Media tree to sweep; repeat for several (default: all)")
+        parser.add_argument("--archive-dir", default=None,
+                            help="Move expired files here instead of deleting them")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be reclaimed")
+
+    def handle(self, *args, **options):
+        if options["days"] < 0:
+            raise CommandError("--days must be zero or positive")
+
+        self.archive_dir = options["archive_dir"]
+        self.dry_run = options["dry_run"]
+        cutoff = time.time() - options["days"] * 86400
+        trees = options["tree"] or settings.MEDIA_SWEEP_TREES
+        batch_size = max(1, options["batch_size"])
+        workers = max(1, options["workers"])
+
+        files = bytes_reclaimed = errors = 0
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+
+            def collect(done):
+                nonlocal files, bytes_reclaimed, errors
+                for future in done:
+                    batch_files, batch_bytes, batch_errors = future.result()
+                    files += batch_files
+                    bytes_reclaimed += batch_bytes
+                    errors += batch_errors
+
+            for tree in trees:
+                tree_root = os.path.join(settings.MEDIA_ROOT, tree)
+                batch = []
+                for entry in iter_files(tree_root):
+                    try:
+                        stat = entry.stat(follow_symlinks=False)
+                    except FileNotFoundError:
+                        # Removed between the directory listing and now.
+                        continue
+                    if stat.st_mtime >= cutoff:
+                        continue
+                    batch.append((entry.path, stat.st_size))
+                    if len(batch) >= batch_size:
+                        pending.add(pool.submit(self._sweep_batch, batch))
+                        batch = []
+                        # Bound the number of queued batches so memory stays flat.
+                        if len(pending) >= workers * 2:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            collect(done)
+                if batch:
+                    pending.add(pool.submit(self._sweep_batch, batch))
+
+            done, _ = wait(pending)
+            collect(done)
+
+        action = "Would reclaim" if self.dry_run else ("Archived" if self.archive_dir else "Deleted")
+        self.stdout.write(self.style.SUCCESS(
+            f"{action} {files} files, {bytes_reclaimed / (1024 * 1024):.2f} MB "
+            f"({bytes_reclaimed} bytes) in {time.monotonic() - started:.1f}s; {errors} errors"
+        ))
+
+    @staticmethod
+    def _references(session, paths) -> dict:
+        """{path relative to MEDIA_ROOT: (resume id, processed)} for the paths a Resume row points at."""
+        relative = [os.path.relpath(path, settings.MEDIA_ROOT) for path in paths]
+        rows = session.execute(
+            select(Resume.file_path, Resume.id, Resume.processed).where(Resume.file_path.in_(relative))
+        )
+        return {file_path: (resume_id, bool(processed)) for file_path, resume_id, processed in rows}
+
+    def _sweep_batch(self, batch):
+        files = bytes_reclaimed = errors = 0
+        session = SessionLocal()
+        try:
+            references = self._references(session, [path for path, _ in batch])
+            swept_resumes = []
+            for path, size in batch:
+                reference = references.get(os.path.relpath(path, settings.MEDIA_ROOT))
+                if reference is not None and not reference[1]:
+                    # Never processed: the upload is the only copy of the resume.
+                    continue
+                swept = self._sweep_file(path)
+                if swept is False:
+                    errors += 1
+                    continue
+                if swept:
+                    files += 1
+                    bytes_reclaimed += size
+                if reference is not None:
+                    swept_resumes.append(reference[0])
+            if swept_resumes and not self.dry_run:
+                session.execute(
+                    update(Resume).where(Resume.id.in_(swept_resumes)).values(file_swept_at=datetime.utcnow())
+                )
+                session.commit()
+        finally:
+            session.close()
+        return files, bytes_reclaimed, errors
+
+    def _sweep_file(self, path):
+        """Delete or archive one file: True if swept, None if it was already gone, False on error."""
+        try:
+            if not self.dry_run:
+                if self.archive_dir:
+                    target = os.path.join(self.archive_dir, os.path.relpath(path, settings.MEDIA_ROOT))
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    shutil.move(path, target)
+                else:
+                    os.remove(path)
+        except FileNotFoundError:
+            # Already removed by a concurrent sweep or request.
+            return None
+        except OSError as e:
+            self.stderr.write(f"Failed to sweep {path}: {e}")
+            return False
+        return True
@@ -1,13 +1,22 @@
 #tenabot/bot/models.py
 from datetime import datetime, date, timezone
 from sqlalchemy import (
-    Column, String, Integer, DateTime, ForeignKey, Boolean, Text, JSON, Date, Enum, Float,UniqueConstraint
+    Column, String, Integer, DateTime, ForeignKey, Boolean, Text, JSON, Date, Enum, Float,UniqueConstraint,
+    Index, desc, text, Computed,
 )
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
 from sqlalchemy.orm import relationship, declarative_base
 
 
 Base = declarative_base()
 
+
+# JSONB on PostgreSQL, JSON on SQLite (tests); holds objects or arrays
+JSONDocument = JSONB().with_variant(JSON(), "sqlite")
+
+# PostgreSQL text[] (GIN-indexable with && and @>); a JSON list on SQLite
+SkillArray = ARRAY(Text).with_variant(JSON(), "sqlite")
+
 # --- 1. User Model (The added table) ---
 class User(Base):
     __tablename__ = "users"
@@ -29,7 +38,7 @@ class User(Base):
     
     # Relationships (to complete the two-way mapping)
     resumes = relationship("Resume", back_populates="user")
-    usage = relationship("UsageTracker", back_populates="user", uselist=False)
+    usage = relationship("UsageTracker", back_populates="user")  # one row per day
 
     def __repr__(self):
         return f"<User id={self.id} telegram={self.telegram_id}>"
@@ -37,6 +46,7 @@ class User(Base):
 # --- 2. Resume Model ---
 class Resume(Base):
     __tablename__ = "resumes"
+    __table_args__ = (Index("ix_resumes_created_at_id", desc("created_at"), desc("id")),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -44,6 +54,8 @@ class Resume(Base):
     job_title = Column(String(150), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     processed = Column(Boolean, default=False)
+    telegram_file_id = Column(String(255), nullable=True) # Delivered PDF, resendable without re-upload
+    file_swept_at = Column(DateTime, nullable=True) # Upload at file_path removed by sweep_media
 
     # Relationships
     resume_info = relationship("ResumeInfo", back_populates="resume", uselist=False)
@@ -55,6 +67,14 @@ class Resume(Base):
 # --- 3. ResumeInfo Model ---
 class ResumeInfo(Base):
     __tablename__ = "resume_info"
+    __table_args__ = (
+        Index("ix_resume_info_created_at_id", desc("created_at"), desc("id")),
+        # Search (bot.search): skill overlap/containment, position substring, education level
+        Index("ix_resume_info_skills_normalized", "skills_normalized", postgresql_using="gin"),
+        Index("ix_resume_info_position_trgm", "position",
+              postgresql_using="gin", postgresql_ops={"position": "gin_trgm_ops"}),
+        Index("ix_resume_info_education_level_lower", text("lower(education_level)")),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
@@ -63,10 +83,12 @@ class ResumeInfo(Base):
     linkedin = Column(String(255))
     position = Column(String(150))
     education_level = Column(String(100))
-    work_history = Column(JSON)
-    skills = Column(JSON)
-    core_values = Column(JSON)
-    structured_json = Column(JSON)
+    work_history = Column(JSONDocument)
+    skills = Column(JSONDocument)
+    core_values = Column(JSONDocument)
+    structured_json = Column(JSONDocument)
+    # analytics.normalization.normalize_skills(skills), kept in step by the pipeline
+    skills_normalized = Column(SkillArray, nullable=False, default=list)
     created_at = Column(DateTime, default=datetime.utcnow) 
 
     # Relationships
@@ -77,7 +99,9 @@ class ResumeInfo(Base):
 
 # --- 4. UsageTracker Model ---
 class UsageTracker(Base):
+    """Uploads per user per day; written only by bot.services.quota."""
     __tablename__ = "usage_tracker"
+    __table_args__ = (UniqueConstraint("user_id", "date", name="uq_usage_tracker_user_date"),)
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     date = Column(Date, default=date.today)
@@ -85,4 +109,51 @@ class UsageTracker(Base):
     # Relationships
     user = relationship("User", back_populates="usage") # Links to the User model above
     def __repr__(self):
-        return f"<UsageTracker user={self.user_id} count={self.count}>" 
\ No newline at end of file
+        return f"<UsageTracker user={self.user_id} count={self.count}>" 
+
+# --- 5. ResumeText Model ---
+# Text search configuration of resume_text.tsv; queries must use the same one.
+TEXT_SEARCH_CONFIG = "english"
+
+
+class ResumeText(Base):
+    """
+    Compacted PDF text of a parsed resume, for full-text search (bot.fulltext).
+    Kept out of resume_info so list scans and row updates don't carry the text and its tsvector.
+    """
+    __tablename__ = "resume_text"
+    __table_args__ = (Index("ix_resume_text_tsv", "tsv", postgresql_using="gin"),)
+
+    resume_info_id = Column(Integer, ForeignKey("resume_info.id", ondelete="CASCADE"), primary_key=True)
+    content = Column(Text, nullable=False)
+    tsv = Column(TSVECTOR, Computed(f"to_tsvector('{TEXT_SEARCH_CONFIG}'::regconfig, content)", persisted=True))
+    # Incremental builds of the matching index (analytics.matching) pick up rows written after their watermark
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<ResumeText resume_info={self.resume_info_id}>"
+
+# --- 6. Analytics rollups (analytics/rollups.py) ---
+class DailyDimensionCount(Base):
+    """Processed resumes per day by normalized skill, position or education level."""
+    __tablename__ = "rollup_daily_counts"
+
+    dimension = Column(String(20), primary_key=True)
+    day = Column(Date, primary_key=True)
+    value = Column(String(255), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DailyDimensionCount {self.dimension}={self.value} {self.day} count={self.count}>"
+
+
+class HourlyVolume(Base):
+    """Uploads (by upload time) and processed resumes (by processing time) per UTC hour."""
+    __tablename__ = "rollup_hourly_volume"
+
+    hour = Column(DateTime, primary_key=True)
+    uploads = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<HourlyVolume {self.hour} uploads={self.uploads} processed={self.processed}>"
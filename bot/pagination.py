@@ -0,0 +1,109 @@
+#tenabot/bot/pagination.py
+"""
+Keyset (cursor) pagination for the SQLAlchemy list endpoints.
+
+Pages are ordered newest first on (created_at, id) and fetched with a row
+comparison against the last row seen, which the composite
+(created_at DESC, id DESC) indexes answer directly. Page 1000 costs the
+same as page 1, unlike OFFSET. Cursors are opaque base64 tokens.
+"""
+import base64
+import json
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from cachetools import TTLCache
+from django.conf import settings
+from sqlalchemy import func, select, text, tuple_
+
+NEXT, PREVIOUS = "n", "p"
+
+
+def encode_cursor(created_at: datetime, row_id: int, direction: str) -> str:
+    payload = json.dumps([created_at.isoformat(), row_id, direction], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str):
+    """(created_at, id, direction); raises ValueError for anything that isn't one of our cursors."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, row_id, direction = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if direction not in (NEXT, PREVIOUS):
+            raise ValueError(direction)
+        return datetime.fromisoformat(created_at), int(row_id), direction
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+@dataclass
+class KeysetPage:
+    items: list
+    next: Optional[str]
+    previous: Optional[str]
+
+
+def paginate(query, created_col, id_col, page_size: int, cursor: Optional[str] = None) -> KeysetPage:
+    """
+    One page of query (a SQLAlchemy ORM Query), newest first.
+    Fetches page_size + 1 rows to know whether another page exists, so no count is needed.
+    """
+    direction = NEXT
+    if cursor:
+        created_at, row_id, direction = decode_cursor(cursor)
+        key = tuple_(created_col, id_col)
+        if direction == NEXT:
+            query = query.filter(key < tuple_(created_at, row_id))
+        else:
+            query = query.filter(key > tuple_(created_at, row_id))
+
+    if direction == NEXT:
+        query = query.order_by(created_col.desc(), id_col.desc())
+    else:
+        query = query.order_by(created_col.asc(), id_col.asc())
+    rows = query.limit(page_size + 1).all()
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if direction == PREVIOUS:
+        rows.reverse()
+    if not rows:
+        return KeysetPage(items=[], next=None, previous=None)
+
+    first, last = rows[0], rows[-1]
+    # Going forward there is always something behind us once a cursor was used; going back, always something ahead.
+    more_after = has_more if direction == NEXT else True
+    more_before = bool(cursor) if direction == NEXT else has_more
+    return KeysetPage(
+        items=rows,
+        next=encode_cursor(last.created_at, last.id, NEXT) if more_after else None,
+        previous=encode_cursor(first.created_at, first.id, PREVIOUS) if more_before else None,
+    )
+
+
+_counts = TTLCache(maxsize=64, ttl=settings.LIST_COUNT_CACHE_TTL)
+_counts_lock = threading.Lock()
+
+
+def estimated_count(session, model) -> int:
+    """
+    Approximate row count from the planner statistics (pg_class.reltuples),
+    cached for LIST_COUNT_CACHE_TTL seconds. Falls back to an exact count
+    when the table has never been analyzed.
+    """
+    table = model.__tablename__
+    with _counts_lock:
+        cached = _counts.get(table)
+    if cached is not None:
+        return cached
+
+    estimate = session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+    ).scalar()
+    if estimate is None or estimate < 0:
+        estimate = session.execute(select(func.count()).select_from(model)).scalar()
+    with _counts_lock:
+        _counts[table] = estimate
+    return estimate
@@ -0,0 +1,33 @@
+from decimal import Decimal
+
+import orjson
+from rest_framework.renderers import BaseRenderer
+
+OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value):
+    # DRF renders decimals as strings (COERCE_DECIMAL_TO_STRING); keep that contract.
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+
+def dumps(value) -> bytes:
+    """orjson encoding shared by the API renderer and the exports."""
+    return orjson.dumps(value, default=_default, option=OPTIONS)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON renderer backed by orjson. Naive datetimes (SQLAlchemy columns are
+    stored in UTC) are rendered with a Z suffix, matching DRF's DateTimeField.
+    """
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return dumps(data)
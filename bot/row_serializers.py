@@ -0,0 +1,45 @@
+#tenabot/bot/row_serializers.py
+"""
+Fast SQLAlchemy row -> dict serializers for the list endpoints.
+
+DRF Serializers run every attribute of every row through generic field
+objects. For read-only listings the output is just the attributes, so
+row_serializer() builds one operator.attrgetter for the whole field set,
+once per (model, field set), and zips its values with the names. Values
+stay native (datetime, list, dict); ORJSONRenderer encodes them.
+"""
+from functools import lru_cache
+from operator import attrgetter
+
+
+@lru_cache(maxsize=64)
+def declared_fields(serializer_class) -> tuple:
+    """Field names of a DRF serializer class, used as the public schema of a listing."""
+    return tuple(serializer_class().fields)
+
+
+@lru_cache(maxsize=256)
+def row_serializer(model, fields: tuple):
+    """Function row -> dict for the given model attributes, built once and cached."""
+    for name in fields:
+        if not name.isidentifier() or not hasattr(model, name):
+            raise ValueError(f"{model.__name__} has no field {name!r}")
+    if len(fields) == 1:
+        get_one = attrgetter(fields[0])
+
+        def values(row):
+            return (get_one(row),)
+    else:
+        # attrgetter with several names returns a tuple of them in one C call
+        values = attrgetter(*fields)
+
+    def serialize(row):
+        return dict(zip(fields, values(row)))
+
+    serialize.__qualname__ = f"serialize_{model.__name__}"
+    return serialize
+
+
+def serialize_rows(model, fields: tuple, rows) -> list:
+    serialize = row_serializer(model, fields)
+    return [serialize(row) for row in rows]
@@ -0,0 +1,133 @@
+#tenabot/bot/schema.py
+"""
+Idempotent DDL for SQLAlchemy-managed tables.
+
+Base.metadata.create_all() only creates missing tables; columns and indexes
+added to existing tables are listed here and applied by create_sqla_tables.
+Every statement must be safe to run repeatedly.
+"""
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.types import Text
+
+from analytics.normalization import normalize_skills
+
+# Run before create_all: model indexes depend on them (pg_trgm is a trusted extension since PostgreSQL 13)
+EXTENSIONS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+]
+
+# resume_info JSON columns -> JSONB. structured_json held json.dumps() output,
+# i.e. a JSON string wrapping the document; unwrap it while converting.
+# Rewrites the whole table under ACCESS EXCLUSIVE: a maintenance step, see MAINTENANCE_UPGRADES.
+_RESUME_INFO_JSONB = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'resume_info' AND column_name = 'structured_json' AND data_type = 'json') THEN
+        ALTER TABLE resume_info
+            ALTER COLUMN work_history TYPE JSONB USING work_history::jsonb,
+            ALTER COLUMN skills TYPE JSONB USING skills::jsonb,
+            ALTER COLUMN core_values TYPE JSONB USING core_values::jsonb,
+            ALTER COLUMN structured_json TYPE JSONB USING (
+                CASE WHEN json_typeof(structured_json) = 'string'
+                     THEN (structured_json #>> '{}')::jsonb
+                     ELSE structured_json::jsonb END
+            );
+    END IF;
+END
+$$
+"""
+
+SCHEMA_UPGRADES = [
+    # Telegram file_id of the delivered Harvard PDF, reused for instant resends
+    "ALTER TABLE resumes ADD COLUMN IF NOT EXISTS telegram_file_id VARCHAR(255)",
+    # usage_tracker: one row per (user_id, date) so the quota can UPSERT.
+    # Fold duplicate rows left by the old read-then-insert code into one first.
+    """
+    UPDATE usage_tracker t SET count = d.total
+    FROM (SELECT max(id) AS id, sum(coalesce(count, 0)) AS total FROM usage_tracker
+          GROUP BY user_id, date HAVING count(*) > 1) d
+    WHERE t.id = d.id
+    """,
+    """
+    DELETE FROM usage_tracker a USING usage_tracker b
+    WHERE a.user_id = b.user_id AND a.date = b.date AND a.id < b.id
+    """,
+    "UPDATE usage_tracker SET count = 0 WHERE count IS NULL",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_usage_tracker_user_date ON usage_tracker (user_id, date)",
+    # Keyset pagination on (created_at, id); rows missing created_at sort last
+    "UPDATE resumes SET created_at = '1970-01-01' WHERE created_at IS NULL",
+    "UPDATE resume_info SET created_at = '1970-01-01' WHERE created_at IS NULL",
+    "CREATE INDEX IF NOT EXISTS ix_resumes_created_at_id ON resumes (created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_resume_info_created_at_id ON resume_info (created_at DESC, id DESC)",
+    # Search: normalized skills (filled by backfill_normalized_skills) and their indexes
+    "ALTER TABLE resume_info ADD COLUMN IF NOT EXISTS skills_normalized TEXT[] NOT NULL DEFAULT '{}'",
+    "CREATE INDEX IF NOT EXISTS ix_resume_info_skills_normalized ON resume_info USING gin (skills_normalized)",
+    "CREATE INDEX IF NOT EXISTS ix_resume_info_position_trgm ON resume_info USING gin (position gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_resume_info_education_level_lower ON resume_info (lower(education_level))",
+    # Matching index watermark
+    "ALTER TABLE resume_text ADD COLUMN IF NOT EXISTS created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT (now() AT TIME ZONE 'utc')",
+    "CREATE INDEX IF NOT EXISTS ix_resume_text_created_at ON resume_text (created_at)",
+    # Set by sweep_media when a processed resume's upload is deleted or archived
+    "ALTER TABLE resumes ADD COLUMN IF NOT EXISTS file_swept_at TIMESTAMP WITHOUT TIME ZONE",
+]
+
+# Statements that rewrite or lock a whole table, kept out of the routine upgrades above.
+# Run them in a maintenance window with manage.py apply_maintenance_upgrades; they are
+# idempotent too, and the code works (without the JSONB benefits) until they have run.
+MAINTENANCE_UPGRADES = [
+    _RESUME_INFO_JSONB,
+]
+
+
+def create_extensions(engine):
+    with engine.begin() as conn:
+        for statement in EXTENSIONS:
+            conn.execute(text(statement))
+
+
+def apply_schema_upgrades(engine):
+    with engine.begin() as conn:
+        for statement in SCHEMA_UPGRADES:
+            conn.execute(text(statement))
+
+
+def apply_maintenance_upgrades(engine, lock_timeout_ms: int = 5000):
+    """
+    Run MAINTENANCE_UPGRADES, one transaction each. Gives up (raising) if a table
+    lock isn't granted within lock_timeout_ms instead of queueing every other query behind it.
+    """
+    for statement in MAINTENANCE_UPGRADES:
+        with engine.begin() as conn:
+            conn.execute(text(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}"))
+            conn.execute(text(statement))
+
+
+_UNNORMALIZED = text("""
+    SELECT id, skills FROM resume_info
+    WHERE id > :after AND skills IS NOT NULL AND skills_normalized = '{}'
+    ORDER BY id LIMIT :limit
+""")
+_SET_NORMALIZED = text(
+    "UPDATE resume_info SET skills_normalized = :skills WHERE id = :id"
+).bindparams(bindparam("skills", type_=ARRAY(Text)))
+
+
+def backfill_normalized_skills(engine, batch_size: int = 500) -> int:
+    """Fill skills_normalized for rows written before it existed, one batch per transaction."""
+    updated, after = 0, 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(_UNNORMALIZED, {"after": after, "limit": batch_size}).all()
+            if not rows:
+                return updated
+            params = []
+            for row_id, skills in rows:
+                normalized = normalize_skills(skills)
+                if normalized:
+                    params.append({"id": row_id, "skills": normalized})
+            if params:
+                conn.execute(_SET_NORMALIZED, params)
+            updated += len(params)
+            after = rows[-1][0]
@@ -0,0 +1,44 @@
+#tenabot/bot/search.py
+"""
+Candidate search over resume_info.
+
+Each filter maps onto an index: skills use the GIN index on
+skills_normalized (&& for any, @> for all), position uses the pg_trgm GIN
+index (ILIKE substring) and education level the lower(education_level)
+index. Results are keyset-paginated like the list endpoints.
+"""
+from sqlalchemy import func
+
+from analytics.normalization import normalize_skill
+from .models import ResumeInfo
+
+MATCH_ANY, MATCH_ALL = "any", "all"
+MAX_SKILLS = 20
+
+
+def _like_escape(term: str) -> str:
+    return term.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+def parse_skills(raw) -> list:
+    """Normalized, de-duplicated skills from 'django, PostgreSQL'; ValueError past MAX_SKILLS."""
+    if not raw:
+        return []
+    skills = list(dict.fromkeys(filter(None, (normalize_skill(part) for part in raw.split(",")))))
+    if len(skills) > MAX_SKILLS:
+        raise ValueError(f"At most {MAX_SKILLS} skills can be searched at once")
+    return skills
+
+
+def filter_resume_info(query, skills=(), match=MATCH_ANY, position=None, education_level=None):
+    """Narrow a ResumeInfo query by normalized skills (any/all), position substring and education level."""
+    if match not in (MATCH_ANY, MATCH_ALL):
+        raise ValueError(f"match must be '{MATCH_ANY}' or '{MATCH_ALL}'")
+    if skills:
+        column = ResumeInfo.skills_normalized
+        query = query.filter(column.contains(skills) if match == MATCH_ALL else column.overlap(skills))
+    if position and position.strip():
+        query = query.filter(ResumeInfo.position.ilike(f"%{_like_escape(position.strip())}%", escape="!"))
+    if education_level and education_level.strip():
+        query = query.filter(func.lower(ResumeInfo.education_level) == education_level.strip().lower())
+    return query
@@ -0,0 +1,108 @@
+"""
+Async data access for the Telegram bot handlers.
+
+Handlers await these functions; the queries themselves run on the
+dedicated DB thread pool (tenabot.db.run_in_db_pool), so no ORM call ever
+blocks the bot's event loop and DB concurrency scales with the pool.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+from django.contrib.auth import get_user_model
+
+from tenabot.db import run_in_db_pool
+from promotion.membership import membership_verifier
+from promotion.unlocks import checkable_campaigns, grant_unlocks
+from users.identity_cache import apply_profile, identity_cache
+
+from . import quota, resume_read
+from .promo_read import get_active_promotion
+
+
+@dataclass
+class PromoVerification:
+    joined: int  # verified campaign channels
+    granted: int  # uploads newly unlocked today
+    checkable: bool  # False when no running campaign channel can be verified
+
+
+@dataclass
+class StartContext:
+    usage_count: int
+    upload_limit: int
+    promo_channel_name: Optional[str] = None
+    promo_campaign_id: Optional[int] = None
+
+
+def _telegram_profile(telegram_user) -> dict:
+    """Fields to sync from Telegram; username only when set, so a stored one isn't replaced by the fallback."""
+    profile = {
+        "first_name": telegram_user.first_name or "",
+        "last_name": telegram_user.last_name or "",
+    }
+    if telegram_user.username:
+        profile["username"] = telegram_user.username
+    return profile
+
+
+def _register_telegram_user(telegram_user, profile: dict):
+    User = get_user_model()
+    defaults = {"username": f"user_{telegram_user.id}", **profile}
+    user, created = User.objects.get_or_create(telegram_id=telegram_user.id, defaults=defaults)
+    if not created:
+        changed = apply_profile(user, profile)
+        if changed:
+            user.save(update_fields=changed)
+    # post_save refreshes the identity cache; cover the unchanged case too.
+    identity_cache.remember(user)
+    return user.id, created
+
+
+def _load_start_context(user_id: int) -> StartContext:
+    # Django and SQLAlchemy map the same `users` table, so the ids are shared.
+    context = StartContext(usage_count=quota.usage_today(user_id), upload_limit=quota.daily_limit(user_id))
+    if context.usage_count >= context.upload_limit:
+        promotion = get_active_promotion()
+        if promotion and promotion.channel:
+            context.promo_channel_name = promotion.channel.channel_name
+            context.promo_campaign_id = promotion.id
+    return context
+
+
+async def register_telegram_user(telegram_user):
+    """
+    Returns (user_id, created) for the Telegram user.
+    Returning users with an unchanged profile are answered from the identity cache with no DB access.
+    """
+    profile = _telegram_profile(telegram_user)
+    cached = identity_cache.get(telegram_user.id)
+    if cached and cached.matches(profile):
+        return cached.user_id, False
+    return await run_in_db_pool(_register_telegram_user, telegram_user, profile)
+
+
+async def get_start_context(user_id: int) -> StartContext:
+    """Today's usage, the limit including promo unlocks and, once it is reached, the promoted channel to follow."""
+    return await run_in_db_pool(_load_start_context, user_id)
+
+
+async def get_recent_resumes(user_id: int, limit: int = 5):
+    return await run_in_db_pool(resume_read.get_recent_resumes, user_id, limit)
+
+
+async def get_resend_info(user_id: int, resume_id: int):
+    return await run_in_db_pool(resume_read.get_resend_info, user_id, resume_id)
+
+
+async def verify_promo_membership(bot, telegram_id: int, user_id: int) -> PromoVerification:
+    """Check every running campaign channel in one batch and unlock uploads for the joined ones."""
+    campaigns = await run_in_db_pool(checkable_campaigns)
+    if not campaigns:
+        return PromoVerification(joined=0, granted=0, checkable=False)
+
+    results = await membership_verifier.check_many(bot, [(chat_id, telegram_id) for _, chat_id in campaigns])
+    joined = [campaign_id for campaign_id, chat_id in campaigns if results[(chat_id, telegram_id)]]
+    granted = await run_in_db_pool(grant_unlocks, user_id, joined) if joined else 0
+    if granted:
+        quota.invalidate_limit(user_id)
+    return PromoVerification(joined=len(joined), granted=granted, checkable=True)
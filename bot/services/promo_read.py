@@ -4,8 +4,17 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tenabot.settings")
 import django
 django.setup()
 
-from promotion.models import AdCampaign
+from promotion.rotation import campaign_rotation
+from promotion.tracking import promotion_tracker
 
 
 def get_active_promotion():
-    return AdCampaign.objects.filter(is_active=True).order_by('-id').first()
+    """
+    Campaign to show for one impression (channel/sponsor preloaded), chosen by
+    the weighted rotation, counted against its paid reach and recorded as an
+    impression for sponsor reports. None if none is running.
+    """
+    campaign = campaign_rotation.next_campaign()
+    if campaign is not None:
+        promotion_tracker.record_impression(campaign.id)
+    return campaign
@@ -0,0 +1,93 @@
+#tenabot/bot/services/quota.py
+"""
+Per-user daily upload quota.
+
+usage_tracker holds one row per (user_id, date). consume() reserves an
+upload with a single INSERT ... ON CONFLICT DO UPDATE ... RETURNING whose
+WHERE clause enforces the limit, so concurrent uploads can never push a
+user past it and a check costs one round trip. The limit itself (tier
+plus today's promo unlocks) is cached for UPLOAD_LIMIT_CACHE_TTL seconds.
+"""
+import threading
+from typing import Optional
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.utils import timezone
+from sqlalchemy import text
+
+from promotion.models import PromoUnlock
+from tenabot.db import engine
+
+_CONSUME = text("""
+    INSERT INTO usage_tracker (user_id, date, count) VALUES (:user_id, :day, 1)
+    ON CONFLICT (user_id, date) DO UPDATE SET count = usage_tracker.count + 1
+    WHERE usage_tracker.count < :limit
+    RETURNING count
+""")
+
+_REFUND = text("""
+    UPDATE usage_tracker SET count = count - 1
+    WHERE user_id = :user_id AND date = :day AND count > 0
+""")
+
+_USAGE = text("SELECT count FROM usage_tracker WHERE user_id = :user_id AND date = :day")
+
+_LIMIT_INPUTS = text(f"""
+    SELECT u.is_premium,
+           COALESCE((SELECT SUM(p.extra_uploads) FROM {PromoUnlock._meta.db_table} p
+                     WHERE p.user_id = u.id AND p.date = :day), 0)
+    FROM users u WHERE u.id = :user_id
+""")
+
+_limits = TTLCache(maxsize=settings.UPLOAD_LIMIT_CACHE_SIZE, ttl=settings.UPLOAD_LIMIT_CACHE_TTL)
+_limits_lock = threading.Lock()
+
+
+def daily_limit(user_id: int) -> int:
+    """Uploads allowed today: the tier limit plus any promo unlocks."""
+    day = timezone.localdate()
+    key = (user_id, day)
+    with _limits_lock:
+        limit = _limits.get(key)
+    if limit is not None:
+        return limit
+
+    with engine.connect() as conn:
+        row = conn.execute(_LIMIT_INPUTS, {"user_id": user_id, "day": day}).one_or_none()
+    if row is None:
+        return 0
+    is_premium, unlocked = row
+    limit = (settings.MAX_UPLOADS_PER_DAY_PREMIUM if is_premium else settings.MAX_UPLOADS_PER_DAY) + int(unlocked)
+    with _limits_lock:
+        _limits[key] = limit
+    return limit
+
+
+def invalidate_limit(user_id: int):
+    """Drop the cached limit after it changed (e.g. a promo unlock) in this process."""
+    with _limits_lock:
+        _limits.pop((user_id, timezone.localdate()), None)
+
+
+def consume(user_id: int, limit: int = None) -> Optional[int]:
+    """Reserve one upload; returns today's new count, or None if the limit is reached."""
+    if limit is None:
+        limit = daily_limit(user_id)
+    if limit <= 0:
+        return None
+    with engine.begin() as conn:
+        return conn.execute(
+            _CONSUME, {"user_id": user_id, "day": timezone.localdate(), "limit": limit}
+        ).scalar_one_or_none()
+
+
+def refund(user_id: int):
+    """Give back an upload reserved by consume() when the upload failed."""
+    with engine.begin() as conn:
+        conn.execute(_REFUND, {"user_id": user_id, "day": timezone.localdate()})
+
+
+def usage_today(user_id: int) -> int:
+    with engine.connect() as conn:
+        return conn.execute(_USAGE, {"user_id": user_id, "day": timezone.localdate()}).scalar_one_or_none() or 0
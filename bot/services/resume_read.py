@@ -0,0 +1,35 @@
+from bot.models import Resume
+from tenabot.db import get_db
+
+
+def get_recent_resumes(user_id: int, limit: int = 5):
+    """
+    Most recent delivered resumes for a user, newest first.
+    Only resumes with a stored Telegram file_id can be resent, so others are skipped.
+    """
+    db_gen = get_db()
+    db = next(db_gen)
+    try:
+        return (
+            db.query(Resume.id, Resume.job_title, Resume.created_at, Resume.telegram_file_id)
+            .filter(Resume.user_id == user_id, Resume.telegram_file_id.isnot(None))
+            .order_by(Resume.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+    finally:
+        db_gen.close()
+
+
+def get_resend_info(user_id: int, resume_id: int):
+    """(job_title, telegram_file_id) for one of the user's own resumes, or None."""
+    db_gen = get_db()
+    db = next(db_gen)
+    try:
+        return (
+            db.query(Resume.job_title, Resume.telegram_file_id)
+            .filter(Resume.id == resume_id, Resume.user_id == user_id)
+            .one_or_none()
+        )
+    finally:
+        db_gen.close()
@@ -1,3 +1,434 @@
-from django.test import TestCase
+import csv
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query, Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from bot import export, fulltext, views
+from bot.management.commands import broadcast_campaign
+from bot.models import Base, HourlyVolume, Resume, ResumeInfo, UsageTracker, User
+from bot.pagination import decode_cursor, paginate
+from bot.search import MAX_SKILLS, filter_resume_info, parse_skills
+from bot.serializers import ResumeInfoSerializer
+from bot.services import quota
+from bot.services.bot_data import _telegram_profile
+from bot.views import _list_page
+from tenabot.db import _call_in_db_thread
+from users.identity_cache import apply_profile
+
+
+@override_settings(MAX_UPLOADS_PER_DAY=2, MAX_UPLOADS_PER_DAY_PREMIUM=5)
+class QuotaTest(SimpleTestCase):
+    """Runs the quota SQL on SQLite, which supports the same UPSERT ... RETURNING syntax."""
+
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        Base.metadata.create_all(engine, tables=[User.__table__, UsageTracker.__table__])
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE promotion_promounlock (user_id INTEGER, date DATE, extra_uploads INTEGER)"))
+            conn.execute(text("INSERT INTO users (id, telegram_id, is_premium) VALUES (1, '100', 0), (2, '200', 1)"))
+        patcher = mock.patch.object(quota, "engine", engine)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(quota._limits.clear)
+        self.engine = engine
+
+    def test_consume_stops_at_the_limit(self):
+        self.assertEqual([quota.consume(1) for _ in range(3)], [1, 2, None])
+        self.assertEqual(quota.usage_today(1), 2)
+
+    def test_premium_tier_and_promo_unlocks(self):
+        self.assertEqual(quota.daily_limit(2), 5)
+        self.assertEqual(quota.daily_limit(1), 2)
+        with self.engine.begin() as conn:
+            conn.execute(text("INSERT INTO promotion_promounlock VALUES (1, :day, 1)"),
+                         {"day": quota.timezone.localdate()})
+        self.assertEqual(quota.daily_limit(1), 2)  # cached
+        quota.invalidate_limit(1)
+        self.assertEqual(quota.daily_limit(1), 3)
+
+    def test_refund_frees_a_slot(self):
+        quota.consume(1)
+        quota.consume(1)
+        quota.refund(1)
+        self.assertEqual(quota.consume(1), 2)
+
+    def test_unknown_user_gets_nothing(self):
+        self.assertIsNone(quota.consume(99))
+
+
+class TelegramProfileTest(SimpleTestCase):
+    def telegram_user(self, **overrides):
+        fields = dict(id=42, username=None, first_name="Nazri", last_name=None)
+        fields.update(overrides)
+        return SimpleNamespace(**fields)
+
+    def test_missing_username_keeps_the_stored_one(self):
+        user = SimpleNamespace(username="nazri", first_name="Nazri", last_name="")
+        self.assertEqual(apply_profile(user, _telegram_profile(self.telegram_user())), [])
+        self.assertEqual(user.username, "nazri")
+
+    def test_username_is_synced_when_sent(self):
+        self.assertEqual(_telegram_profile(self.telegram_user(username="renamed"))["username"], "renamed")
+
+
+class DBPoolJobTest(SimpleTestCase):
+    def test_stale_connections_are_closed_around_each_job(self):
+        with mock.patch("django.db.close_old_connections") as close_old:
+            self.assertEqual(_call_in_db_thread(lambda x: x + 1, (1,), {}), 2)
+        self.assertEqual(close_old.call_count, 2)
+
+    def test_failed_job_drops_its_connection(self):
+        def boom():
+            raise RuntimeError("connection lost")
+
+        with mock.patch("django.db.close_old_connections"), \
+                mock.patch("django.db.connection") as connection:
+            with self.assertRaises(RuntimeError):
+                _call_in_db_thread(boom, (), {})
+        connection.close.assert_called_once_with()
+
+
+class KeysetPaginationTest(SimpleTestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine, tables=[User.__table__, Resume.__table__])
+        self.session = Session(engine)
+        self.addCleanup(self.session.close)
+        base = datetime(2026, 1, 1)
+        # Pairs of rows share a timestamp, so the id tie-break matters.
+        self.session.add_all(
+            Resume(id=i, user_id=1, file_path="f", job_title="j", created_at=base + timedelta(minutes=i // 2))
+            for i in range(1, 8)
+        )
+        self.session.commit()
+
+    def page(self, cursor=None):
+        return paginate(self.session.query(Resume), Resume.created_at, Resume.id, 3, cursor)
+
+    def test_walks_forward_and_back(self):
+        first = self.page()
+        self.assertEqual([r.id for r in first.items], [7, 6, 5])
+        self.assertIsNone(first.previous)
+
+        second = self.page(first.next)
+        self.assertEqual([r.id for r in second.items], [4, 3, 2])
+        third = self.page(second.next)
+        self.assertEqual([r.id for r in third.items], [1])
+        self.assertIsNone(third.next)
+
+        back = self.page(third.previous)
+        self.assertEqual([r.id for r in back.items], [4, 3, 2])
+        self.assertEqual([r.id for r in self.page(back.previous).items], [7, 6, 5])
+
+    def test_rejects_garbage_cursor(self):
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor")
+
+
+class SparseFieldsTest(SimpleTestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine, tables=[User.__table__, Resume.__table__, ResumeInfo.__table__])
+        self.session = Session(engine)
+        self.addCleanup(self.session.close)
+        self.session.add(ResumeInfo(id=1, resume_id=1, position="Engineer", skills=["python"], created_at=datetime(2026, 1, 1)))
+        self.session.commit()
+        self.statements = []
+        event.listen(engine, "before_cursor_execute", lambda conn, cursor, sql, *args: self.statements.append(sql))
+
+    def list_page(self, **params):
+        return _list_page(SimpleNamespace(query_params=params), self.session, ResumeInfo, ResumeInfoSerializer)
+
+    def test_only_requested_fields_are_selected_and_returned(self):
+        body = self.list_page(fields="id,position")
+        self.assertEqual(body["results"], [{"id": 1, "position": "Engineer"}])
+        self.assertNotIn("skills", self.statements[-1])
+        self.assertNotIn("structured_json", self.statements[-1])
+
+    def test_all_fields_by_default(self):
+        body = self.list_page()
+        self.assertEqual(body["results"][0]["skills"], ["python"])
+
+    def test_unknown_field_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.list_page(fields="id,password")
+
+    def test_single_field(self):
+        body = self.list_page(fields="position")
+        self.assertEqual(body["results"], [{"position": "Engineer"}])
+
+
+class ExportTest(SimpleTestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        Base.metadata.create_all(engine, tables=[User.__table__, Resume.__table__, ResumeInfo.__table__])
+        self.session_factory = lambda: Session(engine)
+        with self.session_factory() as session:
+            session.add_all(
+                Resume(id=i, user_id=1, file_path="f", job_title="j", processed=i % 2 == 0) for i in range(1, 6)
+            )
+            session.add_all(
+                ResumeInfo(id=i, resume_id=i, position=f"Role {i}", skills=["python", "sql"],
+                           created_at=datetime(2026, 1, i, 12))
+                for i in range(1, 6)
+            )
+            session.commit()
+
+    def export(self, fmt, **filters):
+        chunks = export.stream_export(self.session_factory, fmt, fetch_size=2, **filters)
+        return "".join(c.decode() if isinstance(c, bytes) else c for c in chunks)
+
+    def test_ndjson_streams_every_row(self):
+        rows = [json.loads(line) for line in self.export("ndjson").splitlines()]
+        self.assertEqual([row["id"] for row in rows], [1, 2, 3, 4, 5])
+        self.assertEqual(rows[0]["skills"], ["python", "sql"])
+        self.assertEqual(rows[0]["created_at"], "2026-01-01T12:00:00Z")
+
+    def test_csv_has_header_and_json_cells(self):
+        rows = list(csv.DictReader(self.export("csv").splitlines()))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(json.loads(rows[0]["skills"]), ["python", "sql"])
+
+    def test_filters(self):
+        body = self.export("ndjson", since=date(2026, 1, 2), until=date(2026, 1, 4), processed=True)
+        self.assertEqual([json.loads(line)["id"] for line in body.splitlines()], [2, 4])
+
+    def test_empty_csv_is_just_the_header(self):
+        self.assertEqual(self.export("csv", since=date(2027, 1, 1)).strip(), ",".join(export.EXPORT_FIELDS))
+
+    def test_unknown_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            export.stream_export(self.session_factory, "xml")
+
+
+class SearchTest(SimpleTestCase):
+    def compiled(self, **filters):
+        query = filter_resume_info(Query(ResumeInfo), **filters)
+        return str(query.statement.compile(dialect=postgresql.dialect()))
+
+    def test_skill_match_operators(self):
+        self.assertIn("skills_normalized && ", self.compiled(skills=["django"], match="any"))
+        self.assertIn("skills_normalized @> ", self.compiled(skills=["django"], match="all"))
+
+    def test_position_and_education_filters(self):
+        sql = self.compiled(position="backend", education_level="Master")
+        self.assertIn("resume_info.position ILIKE", sql)
+        self.assertIn("lower(resume_info.education_level) =", sql)
+
+    def test_parse_skills_normalizes(self):
+        self.assertEqual(parse_skills("Postgres, django,,PostgreSQL"), ["postgresql", "django"])
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            filter_resume_info(Query(ResumeInfo), match="some")
+        with self.assertRaises(ValueError):
+            parse_skills(",".join(f"skill{i}" for i in range(MAX_SKILLS + 1)))
+
+
+class FulltextQueryTest(SimpleTestCase):
+    def test_prefix_terms_are_split_out(self):
+        self.assertEqual(
+            fulltext.parse_query('python devel* "data engineer" -php'),
+            ('python "data engineer" -php', ["devel"]),
+        )
+
+    def test_excluded_prefix_stays_a_plain_exclusion(self):
+        self.assertEqual(fulltext.parse_query("java -script*"), ("java -script", []))
+
+    def test_empty_query_is_rejected(self):
+        with self.assertRaises(ValueError):
+            fulltext.parse_query("  ")
+
+    def test_cursor_round_trip(self):
+        rank = 0.123456789
+        self.assertEqual(fulltext.decode_cursor(fulltext.encode_cursor(rank, 42)), (rank, 42))
+        with self.assertRaises(ValueError):
+            fulltext.decode_cursor("garbage")
+
+
+class SweepMediaTest(SimpleTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp(prefix="tenabot-sweep-")
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        Base.metadata.create_all(engine, tables=[User.__table__, Resume.__table__])
+        self.session = Session(engine)
+        self.addCleanup(self.session.close)
+        patcher = mock.patch("bot.management.commands.sweep_media.SessionLocal", sessionmaker(bind=engine))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.session.add_all([
+            Resume(id=1, user_id=1, file_path=self.old_file("processed.pdf"), job_title="x", processed=True),
+            Resume(id=2, user_id=1, file_path=self.old_file("pending.pdf"), job_title="x", processed=False),
+        ])
+        self.session.commit()
+        self.old_file("orphan.pdf")
+
+    def old_file(self, name: str) -> str:
+        relative = os.path.join("pdfs", "ab", "cd", name)
+        path = os.path.join(self.media_root, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(b"%PDF")
+        stale = time.time() - 40 * 86400
+        os.utime(path, (stale, stale))
+        return relative
+
+    def exists(self, name: str) -> bool:
+        return os.path.exists(os.path.join(self.media_root, "pdfs", "ab", "cd", name))
+
+    def test_keeps_unprocessed_uploads_and_flags_swept_resumes(self):
+        call_command("sweep_media", days=30, tree=["pdfs"], workers=1, stdout=StringIO())
+        self.assertFalse(self.exists("orphan.pdf"))
+        self.assertFalse(self.exists("processed.pdf"))
+        self.assertTrue(self.exists("pending.pdf"))
+        self.session.expire_all()
+        self.assertIsNotNone(self.session.get(Resume, 1).file_swept_at)
+        self.assertIsNone(self.session.get(Resume, 2).file_swept_at)
+
+    def test_file_vanishing_before_stat_is_skipped(self):
+        gone = mock.Mock(path=os.path.join(self.media_root, "pdfs", "gone.pdf"))
+        gone.stat.side_effect = FileNotFoundError
+        with mock.patch("bot.management.commands.sweep_media.iter_files", return_value=[gone]):
+            call_command("sweep_media", days=30, tree=["pdfs"], workers=1, stdout=StringIO())
+
+
+class BroadcastCampaignTest(SimpleTestCase):
+    def setUp(self):
+        self.command = broadcast_campaign.Command(stdout=StringIO(), stderr=StringIO())
+        self.broadcast = SimpleNamespace(pk=5, message="hi", target=10, sent=0, blocked=0, failed=0, last_user_id=0)
+        self.campaign = SimpleNamespace(pk=7, channel=SimpleNamespace(channel_name="Tena Jobs"))
+        self.futures = {}
+        dispatcher = SimpleNamespace(submit=lambda chat_id, call: self.futures.setdefault(chat_id, Future()))
+        for target, value in [
+            ("get_dispatcher", lambda: dispatcher),
+            ("SessionLocal", mock.MagicMock()),
+            ("promotion_tracker", mock.MagicMock()),
+        ]:
+            patcher = mock.patch.object(broadcast_campaign, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for method in ("_checkpoint", "_finish", "_release"):
+            patcher = mock.patch.object(self.command, method)
+            setattr(self, method.strip("_"), patcher.start())
+            self.addCleanup(patcher.stop)
+
+    def run_broadcast(self, reservations, recipients, **options):
+        options = {"max_in_flight": 200, "fetch_size": 100, "checkpoint_every": 60.0, "send_timeout": 5.0, **options}
+        with mock.patch.object(self.command, "_recipients", return_value=iter(recipients)), \
+                mock.patch.object(self.command, "_reserve", side_effect=reservations) as reserve:
+            self.command._run(self.broadcast, self.campaign, options)
+        return reserve
+
+    def test_stop_reasons(self):
+        today = timezone.localdate()
+        package = SimpleNamespace(number_of_people=100)
+
+        def campaign(**fields):
+            values = dict(is_active=True, start_date=today, end_date=None, impressions_served=0)
+            values.update(fields)
+            return SimpleNamespace(remaining_reach=package.number_of_people - values["impressions_served"], **values)
+
+        stop_reason = broadcast_campaign.Command._stop_reason
+        self.assertIsNone(stop_reason(campaign()))
+        self.assertEqual(stop_reason(campaign(is_active=False)), "it is not active")
+        self.assertIn("ended", stop_reason(campaign(end_date=today - timedelta(days=1))))
+        self.assertIn("starts", stop_reason(campaign(start_date=today + timedelta(days=1))))
+        self.assertEqual(stop_reason(campaign(impressions_served=100)), broadcast_campaign.REACH_USED_UP)
+
+    def test_deactivated_campaign_stops_the_push(self):
+        recipients = [(1, 101), (2, 102), (3, 103)]
+        self.futures = {101: Future(), 102: Future()}
+        for future in self.futures.values():
+            future.set_result(True)
+        reserve = self.run_broadcast([(2, None), (0, "it is not active")], recipients)
+        self.assertEqual(reserve.call_count, 2)
+        self.assertEqual((self.broadcast.sent, self.broadcast.last_user_id), (2, 2))
+        self.assertNotIn(103, self.futures)
+        self.finish.assert_not_called()
+        self.release.assert_called_once_with(7, 0)
+
+    def test_unanswered_send_times_out_and_returns_its_impression(self):
+        self.run_broadcast([(1, None)], [(1, 101)], send_timeout=0.01)
+        self.assertTrue(self.futures[101].cancelled())
+        self.assertEqual((self.broadcast.sent, self.broadcast.failed), (0, 1))
+        self.release.assert_called_once_with(7, 1)
+        self.finish.assert_called_once_with(self.broadcast)
+
+
+class ResumeUploadTest(SimpleTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp(prefix="tenabot-upload-")
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        Base.metadata.create_all(engine, tables=[
+            User.__table__, Resume.__table__, ResumeInfo.__table__, HourlyVolume.__table__,
+        ])
+        self.sessions = sessionmaker(bind=engine)
+
+        def get_db():
+            session = self.sessions()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        for target, value in [
+            ("get_db", get_db),
+            ("quota", mock.MagicMock(**{"consume.return_value": 1})),
+        ]:
+            patcher = mock.patch.object(views, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def upload(self):
+        request = APIRequestFactory().post("/bot/upload-resume/", {
+            "pdf_file": SimpleUploadedFile("cv.pdf", b"%PDF-1.4", content_type="application/pdf"),
+            "job_title": "Data Engineer",
+        }, format="multipart")
+        force_authenticate(request, user=SimpleNamespace(id=1, telegram_id=42, username="nazri", is_authenticated=True))
+        return views.ResumeUploadView.as_view()(request)
+
+    def test_processing_error_keeps_the_committed_upload(self):
+        with mock.patch.object(views.services, "process_and_save_resume_info", side_effect=RuntimeError("gemini down")):
+            with self.assertRaises(RuntimeError):
+                self.upload()
+        views.quota.refund.assert_not_called()
+        with self.sessions() as session:
+            resume = session.query(Resume).one()
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, resume.file_path)))
+
+    def test_failed_commit_refunds_and_removes_the_file(self):
+        with mock.patch.object(views.rollups, "record_upload", side_effect=RuntimeError("db down")), \
+                mock.patch.object(views.services, "process_and_save_resume_info") as process:
+            response = self.upload()
+        self.assertEqual(response.status_code, 500)
+        views.quota.refund.assert_called_once_with(1)
+        process.assert_not_called()
+        self.assertEqual([files for _, _, files in os.walk(self.media_root) if files], [])
@@ -8,6 +8,9 @@ urlpatterns = [
     path('upload-resume/', views.ResumeUploadView.as_view(), name='upload-resume'),
     path('resume-list/', views.ResumeListView.as_view(), name='resume-list'),
     path('resume-info-list/', views.ResumeInfoListView.as_view(), name='resume-info-list'),
+    path('resume-info-search/', views.ResumeInfoSearchView.as_view(), name='resume-info-search'),
+    path('resume-text-search/', views.ResumeTextSearchView.as_view(), name='resume-text-search'),
+    path('resume-info-export/', views.ResumeInfoExportView.as_view(), name='resume-info-export'),
     
  
 ]
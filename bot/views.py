@@ -1,29 +1,37 @@
 #tenabot/bot/views.py
 import logging
 import os
-from datetime import date
 
 
 from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.gzip import gzip_page
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 from rest_framework.authentication import SessionAuthentication
 
+from sqlalchemy.orm import load_only
 from sqlalchemy.orm.exc import NoResultFound
-from analytics import services
+from analytics import rollups, services
 
 # Local/Project Imports
 from .serializers import ResumeUploadSerializer, ResumeListSerializer, ResumeInfoSerializer
-from tenabot.db import get_db
-from .models import Resume, ResumeInfo, UsageTracker, User as SQLAlchemyUser
+from tenabot.db import SessionLocal, get_db
+from tenabot.media import sharded_path
+from . import export, fulltext, search
+from .models import Resume, ResumeInfo
+from .pagination import estimated_count, paginate
+from .renderers import ORJSONRenderer
+from .row_serializers import declared_fields, serialize_rows
 from analytics.services import process_and_save_resume_info
 from .services.promo_read import get_active_promotion
-from .services.usage_services import increase_usage,get_usage_count
+from .services import quota
 # Initialize logger
 # Assuming 'name' is defined or replaced with '__name__'
 logger = logging.getLogger(__name__) 
@@ -47,10 +55,6 @@ class ResumeUploadView(APIView):
 
     def post(self, request, *args, **kwargs):
 
-        usage_count = get_usage_count(request.user)
-        limit = os.getenv("MAX_UPLOADS_PER_DAY", 1)
-        if usage_count >= limit:
-            return Response({"detail": "Daily upload limit reached."}, status=status.HTTP_403_FORBIDDEN)
         logger.info("📥 [UPLOAD INIT] Incoming resume upload request.")
 
         serializer = ResumeUploadSerializer(data=request.data)
@@ -58,6 +62,12 @@ class ResumeUploadView(APIView):
             logger.warning(f"⚠️ Validation failed: {serializer.errors}")
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+        # Reserve the upload atomically; every failure before the commit gives it back.
+        # (Django and SQLAlchemy share the users table, so the ids match.)
+        uploads_today = quota.consume(request.user.id)
+        if uploads_today is None:
+            return Response({"detail": "Daily upload limit reached."}, status=status.HTTP_403_FORBIDDEN)
+
         pdf_file = serializer.validated_data['pdf_file']
         job_title = serializer.validated_data['job_title']
         job_description = serializer.validated_data.get('job_description', '')
@@ -65,11 +75,9 @@ class ResumeUploadView(APIView):
 
         logger.info(f"👤 Authenticated user: {django_user.username} (telegram_id={django_user.telegram_id})")
 
-        pdf_dir = os.path.join(settings.MEDIA_ROOT, 'pdfs')
-        os.makedirs(pdf_dir, exist_ok=True)
         filename = f"{django_user.telegram_id}_{pdf_file.name}"
-        file_path = os.path.join(pdf_dir, filename)
-        db_file_path = os.path.join('pdfs', filename)
+        db_file_path = sharded_path('pdfs', filename)
+        file_path = os.path.join(settings.MEDIA_ROOT, db_file_path)
 
         try:
             with open(file_path, 'wb+') as destination:
@@ -78,20 +86,15 @@ class ResumeUploadView(APIView):
             logger.info(f"✅ File saved successfully: {file_path}")
         except Exception as e:
             logger.error(f"❌ File saving failed: {e}", exc_info=True)
+            quota.refund(request.user.id)
             return Response({"detail": f"File saving failed: {e}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         db_gen = get_db()
         db = next(db_gen)
-        new_resume_id = None
 
         try:
-            sqla_user = db.query(SQLAlchemyUser).filter(SQLAlchemyUser.telegram_id == django_user.telegram_id).one_or_none()
-            if not sqla_user:
-                logger.error("❌ SQLAlchemy user not found for this telegram_id.")
-                return Response({"detail": "Corresponding SQLAlchemy User not found."}, status=status.HTTP_404_NOT_FOUND)
-            user_id = sqla_user.id
-
-            new_resume = Resume(user_id=user_id, file_path=db_file_path, job_title=job_title)
+            # Django and SQLAlchemy map the same users row: the session user's id is the FK.
+            new_resume = Resume(user_id=django_user.id, file_path=db_file_path, job_title=job_title)
             db.add(new_resume)
             db.flush()
             new_resume_id = new_resume.id
@@ -99,34 +102,14 @@ class ResumeUploadView(APIView):
 
             new_resume_info = ResumeInfo(resume_id=new_resume.id)
             db.add(new_resume_info)
-
-            today = date.today()
-            usage = db.query(UsageTracker).filter(
-                UsageTracker.user_id == user_id,
-                UsageTracker.date == today
-            ).one_or_none()
-            if usage and usage.date:
-                usage.count += 1
-            else:
-                usage = UsageTracker(user_id=user_id, date=today, count=1)
-                db.add(usage)
+            rollups.record_upload(db, new_resume.created_at)
 
             db.commit()
             logger.info(f"💾 [COMMIT] Database committed successfully for resume_id={new_resume_id}")
 
-            # Launch processing (currently synchronous call in your code — keep or change to background)
-            services.process_and_save_resume_info(new_resume_id, db_file_path, job_description)
-            logger.info(f"🚀 [PROCESS START] Processing launched for resume_id={new_resume_id}")
-
-            return Response({
-                "message": "Resume uploaded successfully. Processing started.",
-                "resume_id": new_resume.id,
-                "file_path": db_file_path,
-                "uploads_today": usage.count
-            }, status=status.HTTP_201_CREATED)
-
         except Exception as e:
             db.rollback()
+            quota.refund(request.user.id)
             logger.error(f"💥 [ROLLBACK] Transaction failed: {e}", exc_info=True)
             if os.path.exists(file_path):
                 os.remove(file_path)
@@ -134,34 +117,84 @@ class ResumeUploadView(APIView):
         finally:
             db_gen.close()
             logger.info("🔚 [UPLOAD END] Database session closed.")
+
+        # The upload is committed and counted from here on: a processing error goes through
+        # the normal error path and must not refund it or delete the stored file.
+        services.process_and_save_resume_info(
+            new_resume_id, db_file_path, job_description,
+            telegram_id=django_user.telegram_id, job_title=job_title,
+        )
+        logger.info(f"🚀 [PROCESS START] Processing launched for resume_id={new_resume_id}")
+
+        return Response({
+            "message": "Resume uploaded successfully. Processing started.",
+            "resume_id": new_resume_id,
+            "file_path": db_file_path,
+            "uploads_today": uploads_today
+        }, status=status.HTTP_201_CREATED)
 """ 📑 Resume List Views
 
 These views provide paginated read access to the database records.
 
  Resume List (`ResumeListView`)"""
 
+def _requested_fields(request, serializer_class):
+    """Field names from ?fields=a,b (None means all); ValueError for unknown names."""
+    raw = request.query_params.get('fields')
+    if not raw:
+        return None
+    fields = tuple(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+    unknown = set(fields) - set(declared_fields(serializer_class))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return fields
+
+
+def _list_page(request, db, model, serializer_class, query=None, allow_total=True):
+    """
+    Keyset-paginated response for a (created_at, id) ordered list (query defaults to the whole table).
+    ?cursor= comes from a previous response; ?include_total=true adds an estimated table count
+    (unless allow_total is off, as for filtered queries);
+    ?fields=a,b limits both the columns SELECTed and the fields returned.
+    """
+    page_size = max(1, min(int(request.query_params.get('page_size', 10)), 50))
+    fields = _requested_fields(request, serializer_class)
+
+    if query is None:
+        query = db.query(model)
+    if fields is not None:
+        # The cursor needs created_at and id even when they aren't returned.
+        columns = {getattr(model, name) for name in fields} | {model.created_at, model.id}
+        query = query.options(load_only(*columns, raiseload=True))
+    page = paginate(query, model.created_at, model.id, page_size, request.query_params.get('cursor'))
+    body = {
+        "page_size": page_size,
+        "next": page.next,
+        "previous": page.previous,
+        # The DRF serializer defines the schema; rows go through the attrgetter fast path.
+        "results": serialize_rows(model, fields or declared_fields(serializer_class), page.items),
+    }
+    if allow_total and request.query_params.get('include_total', '').lower() in ('1', 'true'):
+        body["count"] = estimated_count(db, model)
+    return body
+
+
+@method_decorator(gzip_page, name='dispatch')
 class ResumeListView(APIView):
     permission_classes = [permissions.AllowAny]
+    renderer_classes = [ORJSONRenderer]
 
     def get(self, request, *args, **kwargs):
         logger.info("📄 [LIST] Fetching paginated resumes.")
         db_gen = get_db()
         db = next(db_gen)
         try:
-            # Pagination Logic
-            page = int(request.query_params.get('page', 1))
-            page_size = min(int(request.query_params.get('page_size', 10)), 50)
-            offset = (page - 1) * page_size
-            
-            # Fetch Data
-            total = db.query(Resume).count()
-            resumes = db.query(Resume).order_by(Resume.created_at.desc()).limit(page_size).offset(offset).all()
-            logger.debug(f"📦 Retrieved {len(resumes)} resumes from DB (page={page}, size={page_size})")
-
-            # Response
-            data = ResumeListSerializer(resumes, many=True).data
-            return Response({"count": total, "page": page, "page_size": page_size, "results": data})
-            
+            body = _list_page(request, db, Resume, ResumeListSerializer)
+            logger.debug(f"📦 Retrieved {len(body['results'])} resumes from DB (size={body['page_size']})")
+            return Response(body)
+
+        except ValueError as e:
+            return Response({"detail": f"Invalid query parameters: {e}"}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f"❌ Error fetching resumes: {e}", exc_info=True)
             return Response({"detail": "A server error occurred while fetching resumes."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -171,31 +204,117 @@ class ResumeListView(APIView):
 
 ### Resume Info List (`ResumeInfoListView`)
 
+@method_decorator(gzip_page, name='dispatch')
 class ResumeInfoListView(APIView):
     permission_classes = [permissions.AllowAny]
+    renderer_classes = [ORJSONRenderer]
 
     def get(self, request, *args, **kwargs):
         logger.info("📊 [INFO LIST] Fetching resume info list.")
         db_gen = get_db()
         db = next(db_gen)
         try:
-            # Pagination Logic
-            page = int(request.query_params.get('page', 1))
-            page_size = min(int(request.query_params.get('page_size', 10)), 50)
-            offset = (page - 1) * page_size
-            
-            # Fetch Data
-            total = db.query(ResumeInfo).count()
-            infos = db.query(ResumeInfo).order_by(ResumeInfo.created_at.desc()).limit(page_size).offset(offset).all()
-            logger.debug(f"📦 Retrieved {len(infos)} resume info records (page={page}, size={page_size})")
-
-            # Response
-            data = ResumeInfoSerializer(infos, many=True).data
-            return Response({"count": total, "page": page, "page_size": page_size, "results": data})
-            
+            body = _list_page(request, db, ResumeInfo, ResumeInfoSerializer)
+            logger.debug(f"📦 Retrieved {len(body['results'])} resume info records (size={body['page_size']})")
+            return Response(body)
+
+        except ValueError as e:
+            return Response({"detail": f"Invalid query parameters: {e}"}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f"❌ Error fetching resume info: {e}", exc_info=True)
             return Response({"detail": "A server error occurred while fetching resume info."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         finally:
             db_gen.close()
-            logger.info("🔚 [INFO LIST END] Database session closed.")
\ No newline at end of file
+            logger.info("🔚 [INFO LIST END] Database session closed.")
+
+### Resume Info Search (`ResumeInfoSearchView`)
+
+@method_decorator(gzip_page, name='dispatch')
+class ResumeInfoSearchView(APIView):
+    """
+    Staff-only search over parsed resumes.
+    ?skills=django,postgresql&match=any|all, ?position= (substring), ?education_level= (exact, any case),
+    plus the list parameters (page_size, cursor, fields).
+    """
+    permission_classes = [permissions.IsAdminUser]
+    renderer_classes = [ORJSONRenderer]
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        db_gen = get_db()
+        db = next(db_gen)
+        try:
+            skills = search.parse_skills(params.get('skills'))
+            query = search.filter_resume_info(
+                db.query(ResumeInfo), skills, params.get('match', search.MATCH_ANY),
+                params.get('position'), params.get('education_level'),
+            )
+            logger.info(f"🔎 [SEARCH] skills={skills} match={params.get('match', search.MATCH_ANY)} "
+                        f"position={params.get('position')!r} education_level={params.get('education_level')!r}")
+            # The table estimate says nothing about the number of matches, so no count here.
+            body = _list_page(request, db, ResumeInfo, ResumeInfoSerializer, query, allow_total=False)
+            return Response(body)
+
+        except ValueError as e:
+            return Response({"detail": f"Invalid query parameters: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"❌ Error searching resume info: {e}", exc_info=True)
+            return Response({"detail": "A server error occurred while searching resume info."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        finally:
+            db_gen.close()
+
+### Resume Text Search (`ResumeTextSearchView`)
+
+@method_decorator(gzip_page, name='dispatch')
+class ResumeTextSearchView(APIView):
+    """
+    Staff-only ranked full-text search over the text of parsed resumes.
+    ?q= uses web search syntax ("exact phrase", or, -exclude) plus prefix terms (devel*);
+    ?cursor= comes from a previous response.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    renderer_classes = [ORJSONRenderer]
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        db_gen = get_db()
+        db = next(db_gen)
+        try:
+            page_size = max(1, min(int(params.get('page_size', 10)), 50))
+            logger.info(f"🔎 [TEXT SEARCH] q={params.get('q')!r}")
+            page = fulltext.search(db, params.get('q'), page_size, params.get('cursor'))
+            return Response({"page_size": page_size, "next": page.next, "results": page.items})
+
+        except ValueError as e:
+            return Response({"detail": f"Invalid query parameters: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"❌ Error searching resume text: {e}", exc_info=True)
+            return Response({"detail": "A server error occurred while searching resumes."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        finally:
+            db_gen.close()
+
+### Resume Info Export (`ResumeInfoExportView`)
+
+@method_decorator(gzip_page, name='dispatch')
+class ResumeInfoExportView(APIView):
+    """
+    Staff-only streaming export of resume_info.
+    ?output=ndjson|csv (default ndjson), ?since=/?until=YYYY-MM-DD on created_at, ?processed=true|false.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        fmt = params.get('output', 'ndjson')
+        try:
+            since, until = export.parse_date(params.get('since')), export.parse_date(params.get('until'))
+            processed = export.parse_processed(params.get('processed'))
+            chunks = export.stream_export(SessionLocal, fmt, since, until, processed)
+        except ValueError as e:
+            return Response({"detail": f"Invalid query parameters: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        logger.info(f"📤 [EXPORT] {request.user} exporting resume_info as {fmt} "
+                    f"(since={since}, until={until}, processed={processed})")
+        response = StreamingHttpResponse(chunks, content_type=export.CONTENT_TYPES[fmt])
+        response['Content-Disposition'] = f'attachment; filename="resume_info_{timezone.now():%Y%m%d_%H%M%S}.{fmt}"'
+        return response
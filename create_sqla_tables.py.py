@@ -1,19 +1,38 @@
 # create_sqla_tables.py
+import os
+
+import django
+
+# The engine is configured from Django settings (SQLALCHEMY_*)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tenabot.settings")
+django.setup()
 
 # Import the engine and Base from your SQLAlchemy setup
 from tenabot.db import engine
 
 
 # Import all your models so SQLAlchemy knows about them
-from bot.models import User, Resume, ResumeInfo, UsageTracker ,Base
+from bot.models import User, Resume, ResumeInfo, ResumeText, UsageTracker ,Base
+from bot.schema import apply_schema_upgrades, backfill_normalized_skills, create_extensions
 
 print("Starting SQLAlchemy table creation...")
 
 # Check if the 'users' table already exists (it should, from Django!)
 # SQLAlchemy will skip tables that exist but will create the others.
 
+# Extensions the model indexes rely on (pg_trgm)
+create_extensions(engine)
+
 # This command reads the metadata from all classes inheriting from Base
 # and creates the corresponding tables if they don't exist.
 Base.metadata.create_all(bind=engine) 
 
-print("SQLAlchemy tables created successfully (resumes, resume_info, usage_tracker).")
\ No newline at end of file
+print("SQLAlchemy tables created successfully (resumes, resume_info, resume_text, usage_tracker, rollups).")
+
+# Columns/indexes added after the tables first existed
+apply_schema_upgrades(engine)
+
+print("SQLAlchemy schema upgrades applied.")
+
+# Rows parsed before skills_normalized existed
+print(f"Normalized skills for {backfill_normalized_skills(engine)} resume_info rows.")
\ No newline at end of file
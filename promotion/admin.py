@@ -1,7 +1,10 @@
 from django.contrib import admin
-from .models import Sponsor, PromoChannel, AdCampaign, Package
+from .models import Sponsor, PromoChannel, AdCampaign, Package, CampaignDailyStat, PromoUnlock, Broadcast
 
 admin.site.register(Sponsor)
 admin.site.register(PromoChannel)
 admin.site.register(AdCampaign)
 admin.site.register(Package)
+admin.site.register(CampaignDailyStat)
+admin.site.register(PromoUnlock)
+admin.site.register(Broadcast)
@@ -0,0 +1,22 @@
+"""
+Signed click-through links for promoted channel buttons.
+
+The token names the campaign and the user the button was sent to, so
+/promotion/go/<token>/ can't be forged for other campaigns or users, and
+clicks are counted at most once per user, campaign and day.
+"""
+from django.conf import settings
+from django.core import signing
+
+SALT = "promotion.campaign-click"
+
+
+def click_url(campaign_id: int, user_id: int) -> str:
+    token = signing.dumps([campaign_id, user_id], salt=SALT)
+    return f"{settings.SITE_URL}/promotion/go/{token}/"
+
+
+def read_click_token(token: str):
+    """(campaign_id, user_id); raises signing.BadSignature for anything we didn't sign."""
+    campaign_id, user_id = signing.loads(token, salt=SALT)
+    return int(campaign_id), int(user_id)
@@ -0,0 +1,92 @@
+"""
+Checks whether a user has joined a promoted channel (Bot API getChatMember).
+
+Positive answers are cached for PROMO_MEMBERSHIP_CACHE_TTL seconds, so a
+user pressing "I've joined" twice costs one API call. Concurrent checks of
+the same (channel, user) pair share a single in-flight request, and
+check_many() runs a batch of distinct pairs concurrently, bounded by
+PROMO_MEMBERSHIP_CONCURRENCY. The bot must be an administrator of a
+channel for Telegram to report its members.
+"""
+import asyncio
+import logging
+import re
+from typing import Iterable, Optional
+
+from cachetools import TTLCache
+from django.conf import settings
+from telegram import Bot, ChatMember
+from telegram.error import TelegramError
+
+from tenabot.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+api_calls = registry.counter("promotion.membership.api_calls")
+cache_hits = registry.counter("promotion.membership.cache_hits")
+
+JOINED_STATUSES = {ChatMember.OWNER, ChatMember.ADMINISTRATOR, ChatMember.MEMBER}
+
+# https://t.me/name, t.me/name, @name; invite links (t.me/+xxx, t.me/joinchat/xxx) can't be checked.
+_PUBLIC_CHANNEL = re.compile(r"^(?:(?:https?://)?(?:t|telegram)\.me/|@)(?P<name>[A-Za-z]\w{3,})/?$")
+
+
+def channel_chat_id(channel_link: str) -> Optional[str]:
+    """'@username' for a public channel link, None if membership can't be checked."""
+    match = _PUBLIC_CHANNEL.match((channel_link or "").strip())
+    if not match or match["name"].lower() == "joinchat":
+        return None
+    return f"@{match['name']}"
+
+
+class MembershipVerifier:
+    def __init__(self, ttl: float, maxsize: int, concurrency: int):
+        self._verified = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._in_flight = {}
+        self._concurrency = concurrency
+        self._semaphore = None
+
+    async def is_member(self, bot: Bot, chat_id: str, user_id: int) -> bool:
+        key = (chat_id, user_id)
+        if key in self._verified:
+            cache_hits.inc()
+            return True
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(bot, chat_id, user_id))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # Shield: one caller giving up must not cancel the lookup for the others.
+        return await asyncio.shield(task)
+
+    async def check_many(self, bot: Bot, pairs: Iterable[tuple]) -> dict:
+        """{(chat_id, user_id): joined} for every distinct pair, looked up concurrently."""
+        unique = list(dict.fromkeys(pairs))
+        results = await asyncio.gather(*(self.is_member(bot, chat_id, user_id) for chat_id, user_id in unique))
+        return dict(zip(unique, results))
+
+    async def _fetch(self, bot: Bot, chat_id: str, user_id: int) -> bool:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+        async with self._semaphore:
+            api_calls.inc()
+            try:
+                member = await bot.get_chat_member(chat_id=chat_id, user_id=user_id)
+            except TelegramError as e:
+                logger.warning("⚠️ Could not check membership of %s in %s: %s", user_id, chat_id, e)
+                return False
+
+        joined = member.status in JOINED_STATUSES or (
+            member.status == ChatMember.RESTRICTED and getattr(member, "is_member", False)
+        )
+        if joined:
+            self._verified[(chat_id, user_id)] = True
+        return joined
+
+
+membership_verifier = MembershipVerifier(
+    ttl=settings.PROMO_MEMBERSHIP_CACHE_TTL,
+    maxsize=settings.PROMO_MEMBERSHIP_CACHE_SIZE,
+    concurrency=settings.PROMO_MEMBERSHIP_CONCURRENCY,
+)
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.26 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('promotion', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adcampaign',
+            name='impressions_served',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
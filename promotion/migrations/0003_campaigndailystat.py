@@ -0,0 +1,28 @@
+# Generated by Django 4.2.26 on 2026-10-19 02:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('promotion', '0002_adcampaign_impressions_served'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CampaignDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('impressions', models.PositiveBigIntegerField(default=0)),
+                ('clicks', models.PositiveBigIntegerField(default=0)),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='promotion.adcampaign')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='campaigndailystat',
+            constraint=models.UniqueConstraint(fields=('campaign', 'date'), name='unique_campaign_daily_stat'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.26 on 2026-10-19 02:43
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('promotion', '0003_campaigndailystat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PromoUnlock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(default=django.utils.timezone.localdate)),
+                ('extra_uploads', models.PositiveSmallIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='unlocks', to='promotion.adcampaign')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='promo_unlocks', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='promounlock',
+            constraint=models.UniqueConstraint(fields=('user', 'campaign', 'date'), name='unique_promo_unlock_per_day'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.26 on 2026-10-19 03:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('promotion', '0005_broadcast'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CampaignClick',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(default=django.utils.timezone.localdate)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='clicks', to='promotion.adcampaign')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='campaign_clicks', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='campaignclick',
+            constraint=models.UniqueConstraint(fields=('campaign', 'user', 'date'), name='unique_campaign_click_per_day'),
+        ),
+    ]
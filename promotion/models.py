@@ -48,8 +48,86 @@ class AdCampaign(models.Model):
     end_date = models.DateField(blank=True, null=True)
 
     is_active = models.BooleanField(default=True)
+    # Impressions reserved so far; the campaign retires at package.number_of_people
+    impressions_served = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return f"{self.title} - {self.sponsor.name}"
-    
-    
+
+    @property
+    def remaining_reach(self):
+        return max(0, self.package.number_of_people - self.impressions_served)
+
+
+class CampaignDailyStat(models.Model):
+    """Per-campaign, per-day totals written in batches by promotion/tracking.py."""
+    campaign = models.ForeignKey(AdCampaign, on_delete=models.CASCADE, related_name="daily_stats")
+    date = models.DateField()
+    impressions = models.PositiveBigIntegerField(default=0)
+    clicks = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["campaign", "date"], name="unique_campaign_daily_stat"),
+        ]
+
+    def __str__(self):
+        return f"{self.campaign_id} {self.date}: {self.impressions} / {self.clicks}"
+
+
+class PromoUnlock(models.Model):
+    """Extra uploads granted for the day after the user verifiably joined a campaign's channel."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="promo_unlocks")
+    campaign = models.ForeignKey(AdCampaign, on_delete=models.CASCADE, related_name="unlocks")
+    date = models.DateField(default=timezone.localdate)
+    extra_uploads = models.PositiveSmallIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "campaign", "date"], name="unique_promo_unlock_per_day"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} +{self.extra_uploads} ({self.campaign_id}, {self.date})"
+
+
+class CampaignClick(models.Model):
+    """A user's click on a campaign's channel button; at most one is counted per day."""
+    campaign = models.ForeignKey(AdCampaign, on_delete=models.CASCADE, related_name="clicks")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="campaign_clicks")
+    date = models.DateField(default=timezone.localdate)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["campaign", "user", "date"], name="unique_campaign_click_per_day"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.campaign_id} ({self.date})"
+
+
+class Broadcast(models.Model):
+    """One paid push of a campaign to users; progress is checkpointed so a crashed run resumes."""
+    RUNNING = "running"
+    COMPLETED = "completed"
+    STATUS_CHOICES = [(RUNNING, "Running"), (COMPLETED, "Completed")]
+
+    campaign = models.ForeignKey(AdCampaign, on_delete=models.CASCADE, related_name="broadcasts")
+    message = models.TextField()
+    target = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=RUNNING)
+
+    # Every user with id <= last_user_id has been handled.
+    last_user_id = models.BigIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    blocked = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.campaign} [{self.status}] {self.sent}/{self.target}"
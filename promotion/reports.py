@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import CampaignDailyStat
+
+
+def sponsor_report(sponsor_ids, start=None, end=None) -> list:
+    """
+    Impressions and clicks per campaign for the given sponsors, with a daily
+    breakdown. Reads the aggregated CampaignDailyStat table only; counts
+    not yet flushed by promotion.tracking are a few seconds behind.
+    """
+    end = end or timezone.localdate()
+    start = start or end - timedelta(days=29)
+    stats = CampaignDailyStat.objects.filter(
+        campaign__sponsor_id__in=sponsor_ids, date__range=(start, end)
+    )
+
+    campaigns = {}
+    for row in (
+        stats.values("campaign_id", "campaign__title", "campaign__sponsor__name")
+        .annotate(impressions=Sum("impressions"), clicks=Sum("clicks"))
+        .order_by("campaign_id")
+    ):
+        campaigns[row["campaign_id"]] = {
+            "campaign_id": row["campaign_id"],
+            "title": row["campaign__title"],
+            "sponsor": row["campaign__sponsor__name"],
+            "impressions": row["impressions"],
+            "clicks": row["clicks"],
+            "ctr": round(row["clicks"] / row["impressions"], 4) if row["impressions"] else 0.0,
+            "daily": [],
+        }
+    for campaign_id, day, impressions, clicks in stats.order_by("campaign_id", "date").values_list(
+        "campaign_id", "date", "impressions", "clicks"
+    ):
+        campaigns[campaign_id]["daily"].append({"date": day, "impressions": impressions, "clicks": clicks})
+    return list(campaigns.values())
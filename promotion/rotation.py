@@ -0,0 +1,229 @@
+"""
+Weighted rotation across all active campaigns.
+
+A schedule of campaign ids is precomputed from each campaign's amount_paid
+and remaining reach (smooth weighted round-robin, so campaigns are spread
+evenly rather than shown in runs). Picking the next campaign is one
+counter increment and one list index.
+
+Reach is enforced atomically in the database: each process leases blocks
+of PROMOTION_REACH_LEASE impressions with a locked UPDATE and serves them
+from memory. Unserved leases are handed back when the schedule is rebuilt
+and at shutdown. Campaigns past end_date or out of reach are retired
+(is_active=False) and dropped from the schedule.
+"""
+import atexit
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import AdCampaign
+
+logger = logging.getLogger(__name__)
+
+
+def build_schedule(weights: dict, slots: int) -> list:
+    """
+    Interleaved list of ids where each id appears in proportion to its weight
+    (every id at least once). Smooth weighted round-robin, as used by nginx.
+    """
+    if not weights:
+        return []
+    total = sum(weights.values()) or 1.0
+    counts = {key: max(1, round(weight / total * slots)) for key, weight in weights.items()}
+    length = sum(counts.values())
+    current = dict.fromkeys(counts, 0)
+    schedule = []
+    for _ in range(length):
+        for key, count in counts.items():
+            current[key] += count
+        best = max(current, key=current.get)
+        current[best] -= length
+        schedule.append(best)
+    return schedule
+
+
+@dataclass
+class _Snapshot:
+    schedule: list
+    campaigns: dict
+    built_on: object
+    expires: float
+
+
+class CampaignRotation:
+    def __init__(self, ttl: float, slots: int, lease_size: int):
+        self._ttl = ttl
+        self._slots = slots
+        self._lease_size = lease_size
+        # _build_lock lets one thread rebuild while the others keep serving; _state_lock
+        # guards _snapshot, _generation and _leases and is never held across a query.
+        self._build_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._counter = itertools.count()
+        self._snapshot = None
+        self._generation = 0
+        # Leased-but-unserved impressions per campaign
+        self._leases = {}
+
+    # --- schedule ---
+
+    def _build(self) -> _Snapshot:
+        today = timezone.localdate()
+        # Retire campaigns that ended or used up their paid reach.
+        retired = AdCampaign.objects.filter(is_active=True).filter(
+            Q(end_date__lt=today) | Q(impressions_served__gte=F("package__number_of_people"))
+        ).update(is_active=False)
+        if retired:
+            logger.info("🏁 Retired %d finished campaign(s)", retired)
+
+        campaigns = {
+            campaign.id: campaign
+            for campaign in AdCampaign.objects.filter(is_active=True, start_date__lte=today)
+            .select_related("channel", "sponsor", "package")
+        }
+        weights = {
+            campaign.id: float(campaign.amount_paid or 0) * campaign.remaining_reach
+            / max(1, campaign.package.number_of_people) or 1e-6
+            for campaign in campaigns.values()
+        }
+        schedule = build_schedule(weights, max(self._slots, len(campaigns)))
+        return _Snapshot(schedule, campaigns, today, time.monotonic() + self._ttl)
+
+    def _current(self) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot and time.monotonic() < snapshot.expires and snapshot.built_on == timezone.localdate():
+            return snapshot
+        with self._build_lock:
+            snapshot = self._snapshot
+            if snapshot and time.monotonic() < snapshot.expires and snapshot.built_on == timezone.localdate():
+                return snapshot
+            with self._state_lock:
+                generation = self._generation
+            # Hand back unserved leases first, so retiring and weights see the real reach.
+            self._refund_leases()
+            snapshot = self._build()
+            with self._state_lock:
+                # Don't keep a schedule that an invalidation raced with.
+                if generation == self._generation:
+                    self._snapshot = snapshot
+            return snapshot
+
+    def invalidate(self):
+        with self._state_lock:
+            self._generation += 1
+            self._snapshot = None
+
+    def _drop(self, snapshot: _Snapshot, campaign_ids: set):
+        """
+        Take exhausted campaigns out of the cached schedule. _lease retires them with
+        a bare UPDATE (no post_save), so otherwise every pick landing on one would
+        lock its row again until the TTL ran out.
+        """
+        with self._state_lock:
+            if self._snapshot is not snapshot:
+                return
+            campaigns = {key: value for key, value in snapshot.campaigns.items() if key not in campaign_ids}
+            schedule = [key for key in snapshot.schedule if key not in campaign_ids]
+            self._snapshot = _Snapshot(schedule, campaigns, snapshot.built_on, snapshot.expires)
+
+    # --- reach ---
+
+    def _lease(self, campaign_id: int) -> int:
+        """Atomically reserve up to lease_size impressions; 0 means the campaign is exhausted."""
+        with transaction.atomic():
+            campaign = (
+                AdCampaign.objects.select_for_update(of=("self",))
+                .select_related("package")
+                .filter(pk=campaign_id, is_active=True)
+                .first()
+            )
+            if campaign is None:
+                return 0
+            granted = min(self._lease_size, campaign.remaining_reach)
+            if granted <= 0:
+                AdCampaign.objects.filter(pk=campaign_id).update(is_active=False)
+                logger.info("🏁 Campaign %s reached its paid reach and was retired", campaign_id)
+                return 0
+            AdCampaign.objects.filter(pk=campaign_id).update(impressions_served=F("impressions_served") + granted)
+            return granted
+
+    def _take(self, campaign_id: int) -> bool:
+        """Serve one impression from this process's lease; caller holds _state_lock."""
+        if self._leases.get(campaign_id, 0) > 0:
+            self._leases[campaign_id] -= 1
+            return True
+        return False
+
+    def _consume(self, campaign_id: int) -> bool:
+        with self._state_lock:
+            if self._take(campaign_id):
+                return True
+        # The locked UPDATE runs without _state_lock, so other campaigns keep being served.
+        granted = self._lease(campaign_id)
+        with self._state_lock:
+            # Leases taken meanwhile by other threads add up.
+            self._leases[campaign_id] = self._leases.get(campaign_id, 0) + max(0, granted)
+            if self._take(campaign_id):
+                return True
+            self._leases.pop(campaign_id, None)
+            return False
+
+    def _refund_leases(self):
+        """Give unserved leased impressions back to their campaigns' reach."""
+        with self._state_lock:
+            leases, self._leases = self._leases, {}
+        for campaign_id, unserved in leases.items():
+            if unserved <= 0:
+                continue
+            try:
+                AdCampaign.objects.filter(pk=campaign_id).update(
+                    impressions_served=Greatest(F("impressions_served") - unserved, 0)
+                )
+            except Exception as e:
+                logger.warning("⚠️ Could not return %d leased impressions to campaign %s: %s",
+                               unserved, campaign_id, e)
+
+    # --- public API ---
+
+    def active_campaigns(self) -> list:
+        """Campaigns currently in the schedule (channel/sponsor preloaded); no reach is consumed."""
+        return list(self._current().campaigns.values())
+
+    def next_campaign(self):
+        """Campaign for one impression (channel/sponsor preloaded), or None if nothing is running."""
+        snapshot = self._current()
+        exhausted = set()
+        served = None
+        for _ in range(len(snapshot.schedule)):
+            campaign_id = snapshot.schedule[next(self._counter) % len(snapshot.schedule)]
+            if campaign_id in exhausted:
+                continue
+            if self._consume(campaign_id):
+                served = snapshot.campaigns[campaign_id]
+                break
+            exhausted.add(campaign_id)
+            if len(exhausted) == len(snapshot.campaigns):
+                break
+        if exhausted:
+            self._drop(snapshot, exhausted)
+        return served
+
+    def shutdown(self):
+        self._refund_leases()
+
+
+campaign_rotation = CampaignRotation(
+    ttl=settings.PROMOTION_CACHE_TTL,
+    slots=settings.PROMOTION_SCHEDULE_SLOTS,
+    lease_size=settings.PROMOTION_REACH_LEASE,
+)
+atexit.register(campaign_rotation.shutdown)
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+
+from .models import AdCampaign, Package, PromoChannel, Sponsor
+from .rotation import campaign_rotation
+
+
+def invalidate_rotation(sender, **kwargs):
+    campaign_rotation.invalidate()
+
+
+for model in (AdCampaign, PromoChannel, Sponsor, Package):
+    post_save.connect(invalidate_rotation, sender=model, dispatch_uid=f"promotion_rotation_save_{model.__name__}")
+    post_delete.connect(invalidate_rotation, sender=model, dispatch_uid=f"promotion_rotation_delete_{model.__name__}")
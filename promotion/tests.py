@@ -1,3 +1,214 @@
-from django.test import TestCase
+import asyncio
+from collections import Counter
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.core import signing
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase
+
+from . import views
+from .links import click_url, read_click_token
+from .membership import MembershipVerifier, channel_chat_id
+from .models import PromoUnlock
+from .rotation import CampaignRotation, _Snapshot, build_schedule
+from .tracking import PromotionTracker
+from .unlocks import grant_unlocks
+
+
+class BuildScheduleTest(SimpleTestCase):
+    def test_proportional_to_weight(self):
+        schedule = build_schedule({1: 3.0, 2: 1.0}, slots=100)
+        counts = Counter(schedule)
+        self.assertEqual(counts[1], 75)
+        self.assertEqual(counts[2], 25)
+
+    def test_interleaves_instead_of_runs(self):
+        schedule = build_schedule({1: 1.0, 2: 1.0}, slots=10)
+        self.assertTrue(all(a != b for a, b in zip(schedule, schedule[1:])))
+
+    def test_every_campaign_appears(self):
+        schedule = build_schedule({1: 1000.0, 2: 1e-6}, slots=10)
+        self.assertIn(2, schedule)
+
+    def test_empty(self):
+        self.assertEqual(build_schedule({}, slots=10), [])
+
+
+class CampaignRotationLeaseTest(SimpleTestCase):
+    def setUp(self):
+        self.rotation = CampaignRotation(ttl=60, slots=10, lease_size=3)
+
+    def test_lease_query_runs_without_the_state_lock(self):
+        def lease(campaign_id):
+            self.assertFalse(self.rotation._state_lock.locked())
+            return 3
+
+        with mock.patch.object(self.rotation, "_lease", side_effect=lease) as leased:
+            self.assertTrue(all(self.rotation._consume(1) for _ in range(3)))
+            self.assertTrue(self.rotation._consume(1))
+        self.assertEqual(leased.call_count, 2)
+        self.assertEqual(self.rotation._leases, {1: 2})
+
+    def test_exhausted_campaign_is_not_served(self):
+        with mock.patch.object(self.rotation, "_lease", return_value=0):
+            self.assertFalse(self.rotation._consume(1))
+        self.assertEqual(self.rotation._leases, {})
+
+    def test_exhausted_campaign_is_not_leased_again(self):
+        snapshot = _Snapshot([1, 2, 1, 2], {1: "one", 2: "two"}, None, float("inf"))
+        leases = {1: 0, 2: 3}
+        with mock.patch.object(self.rotation, "_current", side_effect=lambda: self.rotation._snapshot), \
+                mock.patch.object(self.rotation, "_lease", side_effect=leases.get) as leased:
+            self.rotation._snapshot = snapshot
+            served = [self.rotation.next_campaign() for _ in range(4)]
+        self.assertEqual(served, ["two"] * 4)
+        self.assertEqual([call.args[0] for call in leased.call_args_list], [1, 2, 2])
+        self.assertEqual(self.rotation._snapshot.schedule, [2, 2])
+
+    def test_unserved_leases_are_refunded_on_shutdown(self):
+        with mock.patch.object(self.rotation, "_lease", return_value=3):
+            self.rotation._consume(1)
+            self.rotation._consume(2)
+            self.rotation._consume(2)
+        with mock.patch("promotion.rotation.AdCampaign") as campaigns:
+            self.rotation.shutdown()
+        refunded = {call.kwargs["pk"]: call for call in campaigns.objects.filter.call_args_list}
+        self.assertEqual(set(refunded), {1, 2})
+        self.assertEqual(self.rotation._leases, {})
+
+
+class PromotionTrackerTest(SimpleTestCase):
+    def setUp(self):
+        self.tracker = PromotionTracker(interval=3600)
+        self.addCleanup(self.tracker._stop.set)
+
+    def test_counts_are_aggregated_into_one_row_per_campaign_day(self):
+        for _ in range(3):
+            self.tracker.record_impression(1)
+        self.tracker.record_click(1)
+        self.tracker.record_impression(2)
+
+        with mock.patch("promotion.tracking.connection") as connection:
+            self.assertEqual(self.tracker.flush(), 2)
+        cursor = connection.cursor.return_value.__enter__.return_value
+        sql, params = cursor.execute.call_args.args
+        self.assertEqual(sql.count("%s"), 8)
+        self.assertEqual(params[2:4], [3, 1])
+        self.assertEqual(params[6:8], [1, 0])
+        self.assertEqual(self.tracker.flush(), 0)
+
+    def test_failed_flush_keeps_counts(self):
+        self.tracker.record_impression(1)
+        with mock.patch("promotion.tracking.connection") as connection:
+            connection.cursor.side_effect = RuntimeError("db down")
+            self.assertEqual(self.tracker.flush(), 0)
+        self.tracker.record_impression(1)
+
+        with mock.patch("promotion.tracking.connection") as connection:
+            self.assertEqual(self.tracker.flush(), 1)
+        cursor = connection.cursor.return_value.__enter__.return_value
+        self.assertEqual(cursor.execute.call_args.args[1][2], 2)
+
+    def test_flush_leaves_the_callers_connection_open(self):
+        # Only the flusher thread closes its connection; atexit and request threads keep theirs.
+        self.tracker.record_impression(1)
+        with mock.patch("promotion.tracking.connection") as connection:
+            self.tracker.flush()
+        connection.close.assert_not_called()
+
+
+def click_token(campaign_id, user_id):
+    return click_url(campaign_id, user_id).rstrip("/").rsplit("/", 1)[1]
+
+
+class CampaignClickTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        patcher = mock.patch.object(views, "_channel_link", return_value="https://t.me/tena_jobs")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def click(self, token, created=True):
+        with mock.patch.object(views.CampaignClick.objects, "get_or_create", return_value=(None, created)) as get_or_create, \
+                mock.patch.object(views.promotion_tracker, "record_click") as record_click:
+            response = views.campaign_click(self.factory.get("/"), token)
+        return response, get_or_create, record_click
+
+    def test_signed_link_round_trip(self):
+        token = click_token(7, 42)
+        self.assertEqual(read_click_token(token), (7, 42))
+        # Another campaign's payload under this token's signature
+        forged = click_token(8, 42).split(":")[0] + token[token.index(":"):]
+        with self.assertRaises(signing.BadSignature):
+            read_click_token(forged)
+
+    def test_first_click_of_the_day_is_counted(self):
+        token = click_token(7, 42)
+        response, get_or_create, record_click = self.click(token)
+        self.assertEqual(response.url, "https://t.me/tena_jobs")
+        self.assertEqual(get_or_create.call_args.kwargs["user_id"], 42)
+        record_click.assert_called_once_with(7)
+
+    def test_repeated_click_is_not_counted(self):
+        token = click_token(7, 42)
+        response, _, record_click = self.click(token, created=False)
+        self.assertEqual(response.status_code, 302)
+        record_click.assert_not_called()
+
+    def test_forged_token_is_rejected(self):
+        with self.assertRaises(Http404):
+            self.click("7")
+
+
+class GrantUnlocksTest(SimpleTestCase):
+    def test_only_inserted_unlocks_are_counted(self):
+        # Campaign 1 was granted earlier today; a concurrent press inserted campaign 3 first.
+        existing = mock.MagicMock()
+        existing.values_list.return_value = [1]
+        with mock.patch.object(PromoUnlock.objects, "filter", return_value=existing), \
+                mock.patch.object(PromoUnlock.objects, "get_or_create",
+                                  side_effect=[(None, True), (None, False)]) as get_or_create, \
+                self.settings(PROMO_UNLOCK_UPLOADS=2):
+            self.assertEqual(grant_unlocks(42, [1, 2, 3]), 2)
+        self.assertEqual([c.kwargs["campaign_id"] for c in get_or_create.call_args_list], [2, 3])
+
+
+class FakeBot:
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.calls = []
+
+    async def get_chat_member(self, chat_id, user_id):
+        self.calls.append((chat_id, user_id))
+        await asyncio.sleep(0)
+        return SimpleNamespace(status=self.statuses.get((chat_id, user_id), "left"))
+
+
+class MembershipVerifierTest(SimpleTestCase):
+    def setUp(self):
+        self.verifier = MembershipVerifier(ttl=60, maxsize=100, concurrency=5)
+
+    def test_channel_chat_id(self):
+        self.assertEqual(channel_chat_id("https://t.me/tena_jobs"), "@tena_jobs")
+        self.assertEqual(channel_chat_id("@tena_jobs"), "@tena_jobs")
+        self.assertIsNone(channel_chat_id("https://t.me/+AbCdEf123"))
+        self.assertIsNone(channel_chat_id("https://t.me/joinchat/AbCdEf"))
+
+    def test_concurrent_checks_share_one_call(self):
+        bot = FakeBot({("@chan", 1): "member"})
+
+        async def run():
+            return await asyncio.gather(*(self.verifier.is_member(bot, "@chan", 1) for _ in range(5)))
+
+        self.assertEqual(asyncio.run(run()), [True] * 5)
+        self.assertEqual(bot.calls, [("@chan", 1)])
+
+    def test_only_positive_results_are_cached(self):
+        bot = FakeBot({("@a", 1): "administrator"})
+        pairs = [("@a", 1), ("@b", 1), ("@a", 1)]
+
+        first = asyncio.run(self.verifier.check_many(bot, pairs))
+        self.assertEqual(first, {("@a", 1): True, ("@b", 1): False})
+        asyncio.run(self.verifier.check_many(bot, pairs))
+        self.assertEqual(bot.calls, [("@a", 1), ("@b", 1), ("@b", 1)])
@@ -0,0 +1,122 @@
+"""
+Impression and click counters for sponsor reporting.
+
+Recording is an in-memory increment, so the /start handler never waits on
+an INSERT. A daemon thread flushes the accumulated (campaign, day) counts
+every PROMOTION_STATS_FLUSH_INTERVAL seconds with one bulk upsert into
+CampaignDailyStat. Counts from a failed flush are merged back and retried.
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from tenabot.metrics import registry
+
+from .models import AdCampaign, CampaignDailyStat
+
+logger = logging.getLogger(__name__)
+
+flush_timer = registry.timer("promotion.stats.flush_seconds")
+flush_failures = registry.counter("promotion.stats.flush_failures")
+
+IMPRESSIONS, CLICKS = 0, 1
+
+
+def _upsert_sql(rows: int) -> str:
+    quote = connection.ops.quote_name
+    table = quote(CampaignDailyStat._meta.db_table)
+    campaigns = quote(AdCampaign._meta.db_table)
+    values = ", ".join(["(%s::bigint, %s::date, %s::bigint, %s::bigint)"] * rows)
+    # The join drops counts for campaigns deleted since they were recorded,
+    # which would otherwise fail the whole batch on the foreign key.
+    return (
+        f"INSERT INTO {table} (campaign_id, date, impressions, clicks) "
+        f"SELECT v.campaign_id, v.date, v.impressions, v.clicks "
+        f"FROM (VALUES {values}) AS v (campaign_id, date, impressions, clicks) "
+        f"JOIN {campaigns} c ON c.id = v.campaign_id "
+        f"ON CONFLICT (campaign_id, date) DO UPDATE SET "
+        f"impressions = {table}.impressions + EXCLUDED.impressions, "
+        f"clicks = {table}.clicks + EXCLUDED.clicks"
+    )
+
+
+class PromotionTracker:
+    def __init__(self, interval: float):
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._pending = defaultdict(lambda: [0, 0])
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def record_impression(self, campaign_id: int):
+        self._record(campaign_id, IMPRESSIONS)
+
+    def record_click(self, campaign_id: int):
+        self._record(campaign_id, CLICKS)
+
+    def _record(self, campaign_id: int, kind: int):
+        self._ensure_started()
+        key = (campaign_id, timezone.localdate())
+        with self._lock:
+            self._pending[key][kind] += 1
+
+    def _ensure_started(self):
+        # The flusher thread doesn't survive a fork; start one per worker process.
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pending.clear()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="promotion-stats", daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            try:
+                self.flush()
+            finally:
+                # This thread owns its own connection; don't keep it open between flushes.
+                connection.close()
+
+    def flush(self) -> int:
+        """Write pending counts; returns the number of (campaign, day) rows upserted."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(lambda: [0, 0])
+        if not pending:
+            return 0
+
+        params = []
+        for (campaign_id, day), (impressions, clicks) in pending.items():
+            params.extend((campaign_id, day, impressions, clicks))
+        try:
+            with flush_timer.time(), connection.cursor() as cursor:
+                cursor.execute(_upsert_sql(len(pending)), params)
+        except Exception as e:
+            flush_failures.inc()
+            logger.error("❌ Failed to flush promotion stats (%d rows), will retry: %s", len(pending), e)
+            with self._lock:
+                for key, (impressions, clicks) in pending.items():
+                    counts = self._pending[key]
+                    counts[IMPRESSIONS] += impressions
+                    counts[CLICKS] += clicks
+            return 0
+        return len(pending)
+
+    def shutdown(self):
+        self._stop.set()
+        if self._pid == os.getpid():
+            self.flush()
+
+
+promotion_tracker = PromotionTracker(interval=settings.PROMOTION_STATS_FLUSH_INTERVAL)
+atexit.register(promotion_tracker.shutdown)
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.utils import timezone
+
+from .membership import channel_chat_id
+from .models import PromoUnlock
+from .rotation import campaign_rotation
+
+
+def checkable_campaigns() -> list:
+    """(campaign_id, chat_id) for running campaigns whose channel membership can be verified."""
+    campaigns = []
+    for campaign in campaign_rotation.active_campaigns():
+        chat_id = channel_chat_id(campaign.channel.channel_link)
+        if chat_id:
+            campaigns.append((campaign.id, chat_id))
+    return campaigns
+
+
+def grant_unlocks(user_id: int, campaign_ids) -> int:
+    """
+    Grant today's extra uploads for each joined campaign, once per campaign per day.
+    Returns the number of uploads newly granted.
+    """
+    today = timezone.localdate()
+    already = set(
+        PromoUnlock.objects.filter(user_id=user_id, date=today, campaign_id__in=campaign_ids)
+        .values_list("campaign_id", flat=True)
+    )
+    extra = settings.PROMO_UNLOCK_UPLOADS
+    granted = 0
+    for campaign_id in campaign_ids:
+        if campaign_id in already:
+            continue
+        # A concurrent double press loses the race on the unique constraint and
+        # gets the existing row back, so only this call's inserts are counted.
+        _, created = PromoUnlock.objects.get_or_create(
+            user_id=user_id, campaign_id=campaign_id, date=today, defaults={"extra_uploads": extra}
+        )
+        granted += extra if created else 0
+    return granted
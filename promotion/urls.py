@@ -0,0 +1,9 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('go/<int:campaign_id>/', views.legacy_campaign_click, name='campaign-click-legacy'),
+    path('go/<str:token>/', views.campaign_click, name='campaign-click'),
+    path('report/', views.SponsorReportView.as_view(), name='sponsor-report'),
+]
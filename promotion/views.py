@@ -1,3 +1,81 @@
-from django.shortcuts import render
+from django.core import signing
+from django.db import IntegrityError
+from django.http import Http404, HttpResponseRedirect
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from .links import read_click_token
+from .models import AdCampaign, CampaignClick, Sponsor
+from .reports import sponsor_report
+from .tracking import promotion_tracker
+
+
+def _channel_link(campaign_id):
+    return get_object_or_404(AdCampaign.objects.values_list("channel__channel_link", flat=True), pk=campaign_id)
+
+
+def campaign_click(request, token):
+    """
+    Forwards a signed channel button (promotion.links.click_url) to the channel,
+    counting at most one click per user, campaign and day.
+    """
+    try:
+        campaign_id, user_id = read_click_token(token)
+    except (signing.BadSignature, TypeError, ValueError):
+        raise Http404
+    channel_link = _channel_link(campaign_id)
+    try:
+        _, created = CampaignClick.objects.get_or_create(
+            campaign_id=campaign_id, user_id=user_id, date=timezone.localdate()
+        )
+    except IntegrityError:  # the user was deleted since the link was sent
+        created = False
+    if created:
+        promotion_tracker.record_click(campaign_id)
+    return HttpResponseRedirect(channel_link)
+
+
+def legacy_campaign_click(request, campaign_id):
+    """Unsigned /promotion/go/<id>/ links in messages sent before signing: forwarded, not counted."""
+    return HttpResponseRedirect(_channel_link(campaign_id))
+
+
+class SponsorReportView(APIView):
+    """
+    Impressions/clicks per campaign for the sponsors owned by the current user.
+    Staff can pass ?sponsor=<id>. Optional ?start= and ?end= (YYYY-MM-DD), default last 30 days.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @staticmethod
+    def _date_param(request, name):
+        value = request.query_params.get(name)
+        if value is None:
+            return None
+        parsed = parse_date(value)
+        if parsed is None:
+            raise ValueError(value)
+        return parsed
+
+    def get(self, request):
+        try:
+            start, end = (self._date_param(request, name) for name in ("start", "end"))
+        except ValueError:
+            return Response({"error": "start/end must be YYYY-MM-DD"}, status=status.HTTP_400_BAD_REQUEST)
+
+        sponsors = Sponsor.objects.all() if request.user.is_staff else Sponsor.objects.filter(user=request.user)
+        sponsor = request.query_params.get("sponsor")
+        if sponsor is not None:
+            if not sponsor.isdigit():
+                return Response({"error": "sponsor must be an id"}, status=status.HTTP_400_BAD_REQUEST)
+            sponsors = sponsors.filter(pk=sponsor)
+        sponsor_ids = list(sponsors.values_list("id", flat=True))
+        if not sponsor_ids:
+            return Response({"error": "No sponsor account found"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({"campaigns": sponsor_report(sponsor_ids, start, end)})
@@ -14,3 +14,11 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tenabot.settings')
 
 application = get_asgi_application()
+
+# In webhook mode the same ASGI app also receives Telegram updates (see tenabot/webhook.py).
+from django.conf import settings  # noqa: E402
+
+if settings.TELEGRAM_BOT_MODE == "webhook":
+    from tenabot.webhook import TelegramWebhookApp  # noqa: E402
+
+    application = TelegramWebhookApp(application)
@@ -1,20 +1,24 @@
+import asyncio
 import os
 from dotenv import load_dotenv
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo, Update
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.ext import Application, CallbackQueryHandler, CommandHandler, ContextTypes
 
-from asgiref.sync import sync_to_async
 from django.conf import settings
 import django
 import sys
 
-from django.contrib.auth import get_user_model
+from bot.services.bot_data import (
+    get_recent_resumes,
+    get_resend_info,
+    get_start_context,
+    register_telegram_user,
+    verify_promo_membership,
+)
+from promotion.links import click_url
+from tenabot.dispatcher import TelegramRateLimiter, get_send_limits
+from tenabot.update_processing import PerChatUpdateProcessor, TimestampedUpdateQueue
 
-from bot.services.promo_read import get_active_promotion
-from bot.services.usage_services import get_usage_count
-
-
-User = get_user_model()
 
 # Ensure Django is initialized
 # Note: '/path/to/your/project' should be configured correctly for your setup.
@@ -26,24 +30,11 @@ load_dotenv()
 BOT_TOKEN = settings.TELEGRAM_BOT_TOKEN
 
 
-@sync_to_async
-def register_telegram_user(telegram_user):
-    user, created = User.objects.get_or_create(
-        telegram_id=telegram_user.id,
-        defaults={
-            "username": telegram_user.username or f"user_{telegram_user.id}",
-            "first_name": telegram_user.first_name or "",
-            "last_name": telegram_user.last_name or "",
-        },
-    )
-    return user, created
-
-
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_user = update.effective_user
 
     # ✅ Register or get user
-    user, created = await register_telegram_user(telegram_user)
+    user_id, created = await register_telegram_user(telegram_user)
 
     # ✅ Prepare message
     if created:
@@ -60,35 +51,121 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     ]
     
     reply_markup = InlineKeyboardMarkup(keyboard)
-    await update.message.reply_text(message, reply_markup=reply_markup)
-
 
-    bot_user = await get_bot_user(user)
-    usage_count = get_usage_count(bot_user)
-    limit = os.getenv("MAX_UPLOADS_PER_DAY", 1)
-    if usage_count >= limit:
-        promotion = get_active_promotion()
-        if promotion.channel!="":
-            message = f"Welcome back, {telegram_user.first_name or telegram_user.username}! You have reached your daily upload limit. Please follow the following channels and continue to use tena bot {promotion.channel.channel_name}"
+    # The first reply doesn't depend on usage, so send it while the DB pool loads it
+    _, start_context = await asyncio.gather(
+        update.message.reply_text(message, reply_markup=reply_markup),
+        get_start_context(user_id),
+    )
+    if start_context.usage_count >= start_context.upload_limit:
+        if start_context.promo_channel_name:
+            message = f"Welcome back, {telegram_user.first_name or telegram_user.username}! You have reached your daily upload limit. Please follow the following channels and continue to use tena bot {start_context.promo_channel_name}"
+            # Goes through /promotion/go/ so the click is counted for the sponsor
+            keyboard.append([InlineKeyboardButton(
+                f"📢 Join {start_context.promo_channel_name}",
+                url=click_url(start_context.promo_campaign_id, user_id),
+            )])
+            keyboard.append([InlineKeyboardButton("✅ I've joined", callback_data="verify_promo")])
         else:
             message = f"Welcome back, {telegram_user.first_name or telegram_user.username}! we dont have any active promotion"
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    await update.message.reply_text(message, reply_markup=reply_markup)
+        # Only users at the limit get a second message, with the promotion buttons
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        await update.message.reply_text(message, reply_markup=reply_markup)
     
-@sync_to_async
-def get_bot_user(user):
-    # Assuming a BotUser model exists and is linked to the User model
-    from bot.models import User as BotUser  # Import your BotUser model
-    bot_user, created = BotUser.objects.get_or_create(user=user)
-    return bot_user
-  
+async def my_resumes(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/myresumes — list recent generated resumes with a resend button each."""
+    # Identity-cache hit for returning users: no DB round trip to map telegram_id -> user id
+    user_id, _ = await register_telegram_user(update.effective_user)
+    resumes = await get_recent_resumes(user_id)
+    if not resumes:
+        await update.message.reply_text("You don't have any generated resumes yet. Upload one in TenaBot to get started!")
+        return
 
-def main():
+    keyboard = [
+        [InlineKeyboardButton(f"📄 {resume.job_title} ({resume.created_at:%d %b %Y})", callback_data=f"resend:{resume.id}")]
+        for resume in resumes
+    ]
+    await update.message.reply_text("Your recent resumes — tap one to get it again:", reply_markup=InlineKeyboardMarkup(keyboard))
+
+
+async def resend_resume(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Resend a stored PDF by Telegram file_id: no re-upload, delivered instantly."""
+    query = update.callback_query
+    await query.answer()
+
+    resume_id = int(query.data.split(":", 1)[1])
+    user_id, _ = await register_telegram_user(update.effective_user)
+    info = await get_resend_info(user_id, resume_id)
+    if not info or not info.telegram_file_id:
+        await query.message.reply_text("Sorry, that resume is no longer available.")
+        return
+
+    await context.bot.send_document(
+        chat_id=query.message.chat_id,
+        document=info.telegram_file_id,
+        caption=f"📄 Your Harvard-Style PDF Resume for *{info.job_title}*.",
+        parse_mode="Markdown",
+    )
+
+
+async def verify_promo(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """"I've joined" button: verify channel membership and unlock extra uploads for today."""
+    query = update.callback_query
+    await query.answer()
+
+    telegram_user = update.effective_user
+    user_id, _ = await register_telegram_user(telegram_user)
+    result = await verify_promo_membership(context.bot, telegram_user.id, user_id)
+
+    if not result.checkable:
+        message = "There is no promotion to verify right now. Please try again later."
+    elif not result.joined:
+        message = "We couldn't find you in the promoted channel yet. Join it, then tap \"I've joined\" again."
+    elif result.granted:
+        message = f"🎉 Thanks for joining! You've unlocked {result.granted} extra upload(s) for today."
+    else:
+        message = "✅ You're verified — today's extra uploads are already unlocked."
+    await query.message.reply_text(message)
+
+
+def build_application(webhook: bool = False) -> Application:
+    """
+    Application with all handlers registered.
+    In webhook mode there is no Updater: tenabot.webhook pushes updates into app.update_queue.
+    """
     if not BOT_TOKEN:
         raise ValueError("BOT_TOKEN not found in environment variables!")
 
-    app = Application.builder().token(BOT_TOKEN).build()
+    # Updates run concurrently (bounded), but in order within each chat
+    update_queue = TimestampedUpdateQueue()
+    update_processor = PerChatUpdateProcessor(settings.BOT_CONCURRENT_UPDATES, update_queue)
+
+    # Replies share the process-wide flood limits and RetryAfter handling
+    builder = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .rate_limiter(TelegramRateLimiter(get_send_limits()))
+        .update_queue(update_queue)
+        .concurrent_updates(update_processor)
+    )
+    if webhook:
+        builder = builder.updater(None)
+    app = builder.build()
+
     app.add_handler(CommandHandler("start", start))
+    app.add_handler(CommandHandler("myresumes", my_resumes))
+    app.add_handler(CallbackQueryHandler(resend_resume, pattern=r"^resend:\d+$"))
+    app.add_handler(CallbackQueryHandler(verify_promo, pattern=r"^verify_promo$"))
+    return app
+
+
+def main():
+    if settings.TELEGRAM_BOT_MODE == "webhook":
+        # Telegram refuses getUpdates while a webhook is set.
+        print("🌐 TELEGRAM_BOT_MODE=webhook: updates are served by the ASGI app, not by polling.")
+        return
+
+    app = build_application()
 
     print("🤖 Tenabot is running...")
     app.run_polling()
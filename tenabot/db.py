@@ -1,9 +1,17 @@
+import asyncio
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from pathlib import Path#
 from dotenv import load_dotenv
 
+from .metrics import registry
+
 # Ensure the .env file is loaded at the start of the module execution
 load_dotenv()
 # from tenabot.config import settings  # your custom settings handler
@@ -17,9 +25,61 @@ DB_NAME = os.getenv("DB_NAME")
 DATABASE_URL = f'postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
 
 
+checkout_wait_timer = registry.timer("db.pool.checkout_wait_seconds")
+pool_timeouts = registry.counter("db.pool.checkout_timeouts")
+connections_opened = registry.counter("db.pool.connections_opened")
+connections_closed = registry.counter("db.pool.connections_closed")
+connections_invalidated = registry.counter("db.pool.connections_invalidated")
+
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_timeouts.inc()
+            raise
+        finally:
+            checkout_wait_timer.observe(time.perf_counter() - started)
+
+
+def build_engine(url: str = DATABASE_URL):
+    """Engine configured from the SQLALCHEMY_* settings, with pool metrics registered."""
+    connect_args = {}
+    if settings.SQLALCHEMY_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["options"] = f"-c statement_timeout={settings.SQLALCHEMY_STATEMENT_TIMEOUT_MS}"
+
+    db_engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.SQLALCHEMY_POOL_SIZE,
+        max_overflow=settings.SQLALCHEMY_MAX_OVERFLOW,
+        pool_timeout=settings.SQLALCHEMY_POOL_TIMEOUT,
+        pool_recycle=settings.SQLALCHEMY_POOL_RECYCLE,
+        pool_pre_ping=settings.SQLALCHEMY_POOL_PRE_PING,
+        connect_args=connect_args,
+        echo=settings.SQLALCHEMY_ECHO,
+    )
+
+    # Churn: with a healthy pool these stay flat after warm-up.
+    event.listen(db_engine.pool, "connect", lambda *args: connections_opened.inc())
+    event.listen(db_engine.pool, "close", lambda *args: connections_closed.inc())
+    event.listen(db_engine.pool, "invalidate", lambda *args: connections_invalidated.inc())
+
+    pool = db_engine.pool
+    capacity = settings.SQLALCHEMY_POOL_SIZE + max(0, settings.SQLALCHEMY_MAX_OVERFLOW)
+    registry.gauge("db.pool.checked_out", pool.checkedout)
+    registry.gauge("db.pool.idle", pool.checkedin)
+    registry.gauge("db.pool.overflow", pool.overflow)
+    registry.gauge("db.pool.utilisation", lambda: round(pool.checkedout() / capacity, 3))
+    return db_engine
 
 
-engine = create_engine(DATABASE_URL, echo=True)
+engine = build_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Dependency-like helper
@@ -28,4 +88,44 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# --- Dedicated DB thread pool for async callers (bot handlers) ---
+# sync_to_async(thread_sensitive=True) — and Django 4.2's async ORM methods,
+# which use it — run every query on one shared thread. This pool lets DB
+# concurrency scale with BOT_DB_POOL_SIZE instead.
+
+_db_executor = None
+_db_executor_lock = threading.Lock()
+
+
+def _get_db_executor():
+    global _db_executor
+    if _db_executor is None:
+        with _db_executor_lock:
+            if _db_executor is None:
+                _db_executor = ThreadPoolExecutor(
+                    max_workers=settings.BOT_DB_POOL_SIZE, thread_name_prefix="bot-db"
+                )
+    return _db_executor
+
+
+def _call_in_db_thread(func, args, kwargs):
+    from django.db import close_old_connections, connection
+    # Like a request: each pool thread keeps its own Django connection, so drop it
+    # when it is past CONN_MAX_AGE or unusable, both before and after every job.
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        # Don't hand a connection broken by this job to the next one.
+        connection.close()
+        raise
+    finally:
+        close_old_connections()
+
+
+async def run_in_db_pool(func, *args, **kwargs):
+    """Run a blocking DB function on the dedicated pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_db_executor(), _call_in_db_thread, func, args, kwargs)
@@ -0,0 +1,253 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future
+from datetime import timedelta
+from typing import Any, Awaitable, Callable
+
+from django.conf import settings
+from telegram import Bot
+from telegram.error import BadRequest, NetworkError, RetryAfter, TimedOut
+from telegram.ext import BaseRateLimiter
+
+from .metrics import registry
+from .telegram_client import TelegramClient, get_telegram_client
+
+logger = logging.getLogger(__name__)
+
+sent_counter = registry.counter("telegram.outbound.sent")
+failed_counter = registry.counter("telegram.outbound.failed")
+retry_counter = registry.counter("telegram.outbound.retries")
+retry_after_counter = registry.counter("telegram.outbound.retry_after")
+request_timer = registry.timer("telegram.outbound.request_seconds")
+latency_timer = registry.timer("telegram.outbound.latency_seconds")
+
+
+class SendRateLimits:
+    """
+    Telegram flood limits for one bot token: a global messages-per-second cap
+    and a minimum spacing per chat. Slots are reserved under a lock, so the
+    limits hold across threads and event loops within the process.
+    """
+
+    MAX_TRACKED_CHATS = 10000
+
+    def __init__(self, global_per_second: float, per_chat_per_second: float):
+        self._global_interval = 1.0 / global_per_second
+        self._chat_interval = 1.0 / per_chat_per_second
+        self._next_global = 0.0
+        self._next_chat = {}
+        self._lock = threading.Lock()
+
+    def _reserve_chat(self, chat_id) -> float:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_chat.get(chat_id, 0.0))
+            self._next_chat[chat_id] = slot + self._chat_interval
+            if len(self._next_chat) > self.MAX_TRACKED_CHATS:
+                self._next_chat = {k: v for k, v in self._next_chat.items() if v > now}
+            return slot - now
+
+    def _reserve_global(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_global)
+            self._next_global = slot + self._global_interval
+            return slot - now
+
+    async def acquire(self, chat_id=None):
+        """Wait for the chat's next slot first, then for a global one."""
+        if chat_id is not None:
+            delay = self._reserve_chat(chat_id)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        delay = self._reserve_global()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def back_off(self, seconds: float):
+        """Hold every sender until Telegram's retry_after has passed."""
+        with self._lock:
+            self._next_global = max(self._next_global, time.monotonic() + seconds)
+
+
+def _is_idempotent_endpoint(endpoint: str) -> bool:
+    """Bot API methods that are safe to repeat after a timeout (reads, and calls with the same outcome twice)."""
+    return endpoint.startswith("get") or endpoint in {"answerCallbackQuery", "setWebhook", "deleteWebhook"}
+
+
+def _retry_after_seconds(error: RetryAfter) -> float:
+    retry_after = error.retry_after
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+async def send_with_retries(limits: SendRateLimits, chat_id, call: Callable[[], Awaitable],
+                            max_retries: int = None, idempotent: bool = False) -> Any:
+    """
+    Run one Bot API call within the rate limits.
+    Honours RetryAfter and retries transient network errors with jittered
+    exponential backoff; BadRequest and Forbidden are raised immediately.
+    TimedOut is only retried for idempotent calls: a send that timed out may
+    have been delivered, and repeating it would message the user twice.
+    """
+    if max_retries is None:
+        max_retries = settings.TELEGRAM_MAX_RETRIES
+    attempt = 0
+    while True:
+        await limits.acquire(chat_id)
+        try:
+            with request_timer.time():
+                return await call()
+        except RetryAfter as e:
+            error = e
+            delay = _retry_after_seconds(e)
+            limits.back_off(delay)
+            retry_after_counter.inc()
+            logger.warning("⏳ Telegram flood limit hit for chat %s, retrying in %.1fs", chat_id, delay)
+        except BadRequest:
+            raise
+        except NetworkError as e:
+            if isinstance(e, TimedOut) and not idempotent:
+                raise
+            error = e
+            # Full jitter keeps retries from many workers from re-synchronising.
+            delay = random.uniform(0, min(30.0, 0.5 * 2 ** attempt))
+            logger.warning("🔁 Transient Telegram error for chat %s (%s), retry %d in %.2fs",
+                           chat_id, e, attempt + 1, delay)
+        attempt += 1
+        if attempt > max_retries:
+            raise error
+        retry_counter.inc()
+        await asyncio.sleep(delay)
+
+
+class OutboundDispatcher:
+    """
+    Queue for every outbound Telegram message sent outside the bot handlers.
+    Workers run on the shared TelegramClient loop and send through
+    send_with_retries, so global and per-chat limits apply to all callers.
+    """
+
+    def __init__(self, client: TelegramClient, limits: SendRateLimits, workers: int = 4):
+        self._client = client
+        self._limits = limits
+        self._workers = workers
+        self._lock = threading.Lock()
+        self._loop = None
+        self._queue = None
+        self._tasks = []
+
+    def _ensure_started(self):
+        loop = self._client.loop
+        if self._loop is loop:
+            return
+        with self._lock:
+            if self._loop is loop:
+                return
+            asyncio.run_coroutine_threadsafe(self._start(), loop).result()
+            self._loop = loop
+            registry.gauge("telegram.outbound.queue_depth", self._queue.qsize)
+            logger.info("📬 Outbound dispatcher started with %d workers", self._workers)
+
+    async def _start(self):
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self._workers)]
+
+    async def _worker(self):
+        while True:
+            chat_id, call, future, enqueued = await self._queue.get()
+            try:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    result = await send_with_retries(self._limits, chat_id, lambda: call(self._client.bot))
+                except Exception as e:
+                    failed_counter.inc()
+                    future.set_exception(e)
+                else:
+                    sent_counter.inc()
+                    future.set_result(result)
+                latency_timer.observe(time.perf_counter() - enqueued)
+            finally:
+                self._queue.task_done()
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def submit(self, chat_id, call: Callable[[Bot], Awaitable]) -> Future:
+        """
+        Enqueue call(bot) for chat_id from any thread.
+        The returned Future resolves with the Bot API result or the final error.
+        """
+        self._ensure_started()
+        future = Future()
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (chat_id, call, future, time.perf_counter()))
+        return future
+
+    def send_message(self, chat_id, text: str, **kwargs) -> Future:
+        return self.submit(chat_id, lambda bot: bot.send_message(chat_id=chat_id, text=text, **kwargs))
+
+
+class TelegramRateLimiter(BaseRateLimiter):
+    """Applies the same SendRateLimits and retry policy to the bot Application's own requests."""
+
+    def __init__(self, limits: SendRateLimits):
+        self._limits = limits
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def process_request(self, callback, args, kwargs, endpoint, data, rate_limit_args):
+        chat_id = data.get("chat_id")
+        # getUpdates/getMe etc. carry no chat and shouldn't consume message slots.
+        if chat_id is None:
+            return await callback(*args, **kwargs)
+        return await send_with_retries(self._limits, chat_id, lambda: callback(*args, **kwargs),
+                                       idempotent=_is_idempotent_endpoint(endpoint))
+
+
+_limits = None
+_dispatcher = None
+_singleton_lock = threading.Lock()
+
+
+def get_send_limits() -> SendRateLimits:
+    global _limits
+    if _limits is None:
+        with _singleton_lock:
+            if _limits is None:
+                _limits = SendRateLimits(
+                    settings.TELEGRAM_GLOBAL_MESSAGES_PER_SECOND,
+                    settings.TELEGRAM_PER_CHAT_MESSAGES_PER_SECOND,
+                )
+    return _limits
+
+
+def get_dispatcher() -> OutboundDispatcher:
+    """Process-wide dispatcher on the shared TelegramClient."""
+    global _dispatcher
+    if _dispatcher is None:
+        limits = get_send_limits()
+        with _singleton_lock:
+            if _dispatcher is None:
+                _dispatcher = OutboundDispatcher(
+                    get_telegram_client(), limits, workers=settings.TELEGRAM_DISPATCHER_WORKERS
+                )
+    return _dispatcher
+
+
+def log_send_failure(future: Future, description: str = "Telegram message"):
+    """Done-callback for fire-and-forget sends: surfaces the final error in the logs."""
+    def _callback(f: Future):
+        error = f.exception()
+        if error is not None:
+            logger.error("⚠️ %s failed: %s", description, error, exc_info=error)
+    future.add_done_callback(_callback)
+    return future
@@ -0,0 +1,44 @@
+import hashlib
+import os
+
+from django.conf import settings
+
+# Two levels of two hex chars -> 65,536 leaf directories per tree, which keeps
+# every directory small even with millions of files.
+SHARD_DEPTH = 2
+SHARD_WIDTH = 2
+
+
+def shard_dirs(filename: str) -> list:
+    """Return the shard directory components for a filename, e.g. ['3f', 'a2']."""
+    digest = hashlib.sha1(filename.encode("utf-8")).hexdigest()
+    return [digest[i * SHARD_WIDTH:(i + 1) * SHARD_WIDTH] for i in range(SHARD_DEPTH)]
+
+
+def sharded_path(tree: str, filename: str) -> str:
+    """
+    Relative (to MEDIA_ROOT) path for a file inside a sharded media tree.
+    Creates the shard directories on disk so callers can open the path directly.
+    """
+    relative_dir = os.path.join(tree, *shard_dirs(filename))
+    os.makedirs(os.path.join(settings.MEDIA_ROOT, relative_dir), exist_ok=True)
+    return os.path.join(relative_dir, filename)
+
+
+def iter_files(root: str):
+    """
+    Yield os.DirEntry objects for every file below root.
+    Uses os.scandir depth-first so only one directory listing is held per level.
+    """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+        except FileNotFoundError:
+            continue
@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class Counter:
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self._value += amount
+
+    def snapshot(self):
+        return self._value
+
+
+class Gauge:
+    """Reads its value from a callable at snapshot time (e.g. a queue's qsize)."""
+
+    def __init__(self, read):
+        self._read = read
+
+    def snapshot(self):
+        try:
+            return self._read()
+        except Exception:
+            return None
+
+
+class Timer:
+    """Latency summary: count, mean and max over all samples, percentiles over recent ones."""
+
+    def __init__(self, window: int = 1024):
+        self._samples = deque(maxlen=window)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+            self._count += 1
+            self._total += seconds
+            self._max = max(self._max, seconds)
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def snapshot(self):
+        with self._lock:
+            recent = sorted(self._samples)
+            count, total, peak = self._count, self._total, self._max
+
+        def percentile(p):
+            if not recent:
+                return None
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))], 6)
+
+        return {
+            "count": count,
+            "mean": round(total / count, 6) if count else None,
+            "max": round(peak, 6),
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+        }
+
+
+class MetricsRegistry:
+    """Process-local metrics, exposed as JSON by tenabot.views.MetricsView."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, name, factory):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = factory()
+            return self._metrics[name]
+
+    def counter(self, name: str) -> Counter:
+        return self._get_or_create(name, Counter)
+
+    def timer(self, name: str) -> Timer:
+        return self._get_or_create(name, Timer)
+
+    def gauge(self, name: str, read) -> Gauge:
+        # Re-registering replaces the reader, so a re-created component reports its own state.
+        with self._lock:
+            self._metrics[name] = Gauge(read)
+            return self._metrics[name]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            items = list(self._metrics.items())
+        return {name: metric.snapshot() for name, metric in sorted(items)}
+
+
+registry = MetricsRegistry()
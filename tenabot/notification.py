@@ -1,19 +1,34 @@
-import asyncio
 import os
 import time
+from concurrent.futures import TimeoutError as FutureTimeout
 from telegram import Bot, InputFile
 from django.conf import settings
 import logging
 
+from bot.models import Resume
+from .db import get_db, run_in_db_pool
+from .dispatcher import get_dispatcher
+
 # Ensure 'name' is defined or use a specific module name
 # For this example, assuming 'name' is intended to be the module name.
 logger = logging.getLogger(__name__)
 
 
-async def _send_pdf(bot_token: str, telegram_id: int, pdf_path: str, filename: str, caption: str):
-    """Async function to send a PDF via Telegram."""
-    bot = Bot(token=bot_token)
-    
+def _store_file_id(resume_id: int, file_id: str):
+    """Keep Telegram's file_id so /myresumes can resend without re-uploading."""
+    db_gen = get_db()
+    db = next(db_gen)
+    try:
+        db.query(Resume).filter(Resume.id == resume_id).update(
+            {Resume.telegram_file_id: file_id}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db_gen.close()
+
+
+async def _send_pdf(bot: Bot, telegram_id: int, pdf_path: str, filename: str, caption: str, resume_id: int = None):
+    """Async function to send a PDF via Telegram using the shared bot client."""
     file_stats = os.stat(pdf_path)
     logger.info(
         "📊 File details - Size: %d bytes, Modified: %s", 
@@ -30,27 +45,36 @@ async def _send_pdf(bot_token: str, telegram_id: int, pdf_path: str, filename: s
         logger.error("❌ PDF file not found at path: %s", pdf_path)
         return
 
-    async with bot:
-        # Re-open the file for sending within the async context
-        try:
-            with open(pdf_path, "rb") as f:  # ✅ Send as file object
-                logger.info("📤 Uploading '%s' to chat %d...", filename, telegram_id)
-                result = await bot.send_document(
-                    chat_id=telegram_id,
-                    document=InputFile(f, filename=filename),
-                    caption=caption,
-                    parse_mode="Markdown"
-                )
-                if hasattr(result, "document"):
-                    logger.info("✅ File sent successfully. Telegram file ID: %s", result.document.file_id)
-                else:
-                    logger.warning("⚠️ Message sent, but document details missing")
-        except Exception as e:
-            logger.error("❌ File reading error during upload: %s", e, exc_info=True)
-
-
-def send_pdf_to_telegram(telegram_id: int, pdf_path: str, job_title: str):
-    """Sync wrapper to send PDF to Telegram."""
+    # Re-open the file for every attempt; errors propagate so the dispatcher can retry
+    with open(pdf_path, "rb") as f:  # ✅ Send as file object
+        logger.info("📤 Uploading '%s' to chat %d...", filename, telegram_id)
+        result = await bot.send_document(
+            chat_id=telegram_id,
+            document=InputFile(f, filename=filename),
+            caption=caption,
+            parse_mode="Markdown"
+        )
+    if hasattr(result, "document"):
+        logger.info("✅ File sent successfully. Telegram file ID: %s", result.document.file_id)
+        if resume_id is not None:
+            # Stored here rather than by the caller, so it isn't lost when the caller stops waiting.
+            # Never raise: the dispatcher would treat it as a failed send.
+            try:
+                await run_in_db_pool(_store_file_id, resume_id, result.document.file_id)
+            except Exception as e:
+                logger.error("❌ Could not store file_id for resume %s: %s", resume_id, e, exc_info=True)
+    else:
+        logger.warning("⚠️ Message sent, but document details missing")
+    return result
+
+
+def send_pdf_to_telegram(telegram_id: int, pdf_path: str, job_title: str, wait: bool = True, resume_id: int = None):
+    """
+    Sync wrapper to send PDF to Telegram.
+    Blocks until the upload finishes (at most TELEGRAM_PDF_SEND_WAIT) unless wait=False,
+    and returns the Telegram file_id of the delivered document (None if unknown or not
+    sent yet). With resume_id, the file_id is saved on that Resume whenever it is delivered.
+    """
     try:
         # Load bot token from Django settings
         bot_token = settings.TELEGRAM_BOT_TOKEN
@@ -78,20 +102,20 @@ def send_pdf_to_telegram(telegram_id: int, pdf_path: str, job_title: str):
     caption = f"✅ Resume Analysis Complete!\n\nHere is your **Harvard-Style PDF Resume** for *{clean_job_title}*."
 
     try:
-        logger.info("⏳ Waiting 2s before sending...")
-        time.sleep(2)
-
-        send_task = _send_pdf(bot_token, telegram_id, pdf_path, filename, caption)
-        loop = asyncio.get_event_loop()
-        
-        # Check if an event loop is already running (e.g., in an async context)
-        if loop.is_running():
-            asyncio.ensure_future(send_task)
+        # Queued on the shared dispatcher; safe from sync code and from other event loops.
+        future = get_dispatcher().submit(
+            telegram_id, lambda bot: _send_pdf(bot, telegram_id, pdf_path, filename, caption, resume_id)
+        )
+        if not wait:
             logger.info("📨 PDF scheduled to send to chat %d", telegram_id)
-        else:
-            # Run the async task synchronously
-            loop.run_until_complete(send_task)
-            logger.info("✅ PDF successfully sent to chat %d", telegram_id)
-            
+            return
+        # Covers queue wait and rate-limit retries, not just the upload itself.
+        result = future.result(timeout=settings.TELEGRAM_PDF_SEND_WAIT)
+        logger.info("✅ PDF successfully sent to chat %d", telegram_id)
+        return result.document.file_id if getattr(result, "document", None) else None
+
+    except FutureTimeout:
+        logger.warning("⏳ PDF for chat %d still queued after %.0fs; it will go out in the background",
+                       telegram_id, settings.TELEGRAM_PDF_SEND_WAIT)
     except Exception as e:
         logger.error("❌ Telegram send failed: %s", e, exc_info=True)
\ No newline at end of file
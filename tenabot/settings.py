@@ -15,6 +15,7 @@ from dotenv import load_dotenv
 import sys
 import os
 import logging
+from urllib.parse import urlparse
 
 sys.stdout.reconfigure(encoding='utf-8')
 sys.stderr.reconfigure(encoding='utf-8')
@@ -137,6 +138,10 @@ DATABASES = {
         'PASSWORD': DB_PASSWORD,
         'HOST': DB_HOST,  # or your database server IP/domain
         'PORT': DB_PORT,       # default PostgreSQL port
+        # Persistent connections; close_old_connections() (per request, and per job in
+        # tenabot.db.run_in_db_pool) replaces them after this age or when a health check fails
+        'CONN_MAX_AGE': int(os.getenv("DB_CONN_MAX_AGE", 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -189,6 +194,10 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR,'media/')
 
+# media retention (manage.py sweep_media)
+MEDIA_RETENTION_DAYS = int(os.getenv("MEDIA_RETENTION_DAYS", 30))
+MEDIA_SWEEP_TREES = ["pdfs", "generated_resumes"]
+
 # permission
 
 SECURE_BROWSER_XSS_FILTER = True
@@ -208,6 +217,77 @@ REST_FRAMEWORK = {
 
 TELEGRAM_BOT_TOKEN="8396582526:AAFk6qgvwI858nv1LLTOmUEoGt_JAwDhonw"
 
+# shared outbound bot client (tenabot/telegram_client.py)
+TELEGRAM_CONNECTION_POOL_SIZE = int(os.getenv("TELEGRAM_CONNECTION_POOL_SIZE", 8))
+TELEGRAM_READ_TIMEOUT = float(os.getenv("TELEGRAM_READ_TIMEOUT", 10))
+TELEGRAM_WRITE_TIMEOUT = float(os.getenv("TELEGRAM_WRITE_TIMEOUT", 60))
+
+# outbound dispatcher (tenabot/dispatcher.py) — Telegram flood limits per bot token
+TELEGRAM_GLOBAL_MESSAGES_PER_SECOND = float(os.getenv("TELEGRAM_GLOBAL_MESSAGES_PER_SECOND", 30))
+TELEGRAM_PER_CHAT_MESSAGES_PER_SECOND = float(os.getenv("TELEGRAM_PER_CHAT_MESSAGES_PER_SECOND", 1))
+TELEGRAM_MAX_RETRIES = int(os.getenv("TELEGRAM_MAX_RETRIES", 5))
+TELEGRAM_DISPATCHER_WORKERS = int(os.getenv("TELEGRAM_DISPATCHER_WORKERS", 4))
+# how long the processing pipeline waits for its PDF to go out (queue wait and retries
+# included); a late delivery still stores the file_id, the wait only ends earlier
+TELEGRAM_PDF_SEND_WAIT = float(os.getenv("TELEGRAM_PDF_SEND_WAIT", 300))
+
+# bot update delivery: "polling" (manage.py bot) or "webhook" (served by tenabot/asgi.py)
+TELEGRAM_BOT_MODE = os.getenv("TELEGRAM_BOT_MODE", "polling")
+TELEGRAM_WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET")
+TELEGRAM_WEBHOOK_PATH = os.getenv("TELEGRAM_WEBHOOK_PATH") or (urlparse(WEBHOOK_URL).path if WEBHOOK_URL else "") or "/telegram/webhook/"
+TELEGRAM_WEBHOOK_MAX_CONNECTIONS = int(os.getenv("TELEGRAM_WEBHOOK_MAX_CONNECTIONS", 40))
+
+# bot update processing (tenabot/update_processing.py): max updates handled at once
+BOT_CONCURRENT_UPDATES = int(os.getenv("BOT_CONCURRENT_UPDATES", 64))
+# threads for bot DB access (tenabot.db.run_in_db_pool); one DB connection each
+BOT_DB_POOL_SIZE = int(os.getenv("BOT_DB_POOL_SIZE", 10))
+
+# SQLAlchemy engine (tenabot/db.py); size the pools so every process together stays below
+# Postgres max_connections: processes * (SQLALCHEMY_POOL_SIZE + SQLALCHEMY_MAX_OVERFLOW)
+SQLALCHEMY_POOL_SIZE = int(os.getenv("SQLALCHEMY_POOL_SIZE", 10))
+SQLALCHEMY_MAX_OVERFLOW = int(os.getenv("SQLALCHEMY_MAX_OVERFLOW", 5))
+SQLALCHEMY_POOL_TIMEOUT = float(os.getenv("SQLALCHEMY_POOL_TIMEOUT", 30))
+SQLALCHEMY_POOL_RECYCLE = int(os.getenv("SQLALCHEMY_POOL_RECYCLE", 1800))
+SQLALCHEMY_POOL_PRE_PING = os.getenv("SQLALCHEMY_POOL_PRE_PING", "true").lower() == "true"
+# milliseconds, 0 disables
+SQLALCHEMY_STATEMENT_TIMEOUT_MS = int(os.getenv("SQLALCHEMY_STATEMENT_TIMEOUT_MS", 30000))
+SQLALCHEMY_ECHO = os.getenv("SQLALCHEMY_ECHO", "false").lower() == "true"
+
+# telegram_id -> user identity cache (users/identity_cache.py)
+USER_IDENTITY_CACHE_SIZE = int(os.getenv("USER_IDENTITY_CACHE_SIZE", 50000))
+USER_IDENTITY_CACHE_TTL = int(os.getenv("USER_IDENTITY_CACHE_TTL", 600))
+
+# daily upload quota per tier (bot/services/quota.py); promo unlocks are added on top
+MAX_UPLOADS_PER_DAY = int(os.getenv("MAX_UPLOADS_PER_DAY", 1))
+MAX_UPLOADS_PER_DAY_PREMIUM = int(os.getenv("MAX_UPLOADS_PER_DAY_PREMIUM", 5))
+UPLOAD_LIMIT_CACHE_TTL = int(os.getenv("UPLOAD_LIMIT_CACHE_TTL", 30))
+UPLOAD_LIMIT_CACHE_SIZE = int(os.getenv("UPLOAD_LIMIT_CACHE_SIZE", 50000))
+
+# list endpoints (bot/pagination.py): how long an estimated total is reused
+LIST_COUNT_CACHE_TTL = int(os.getenv("LIST_COUNT_CACHE_TTL", 300))
+
+# candidate matching (analytics/matching.py): index written by manage.py build_matching_index,
+# memory-mapped by every worker and re-read when a newer build appears
+MATCHING_INDEX_DIR = os.getenv("MATCHING_INDEX_DIR", os.path.join(BASE_DIR, "matching_index"))
+MATCHING_RELOAD_INTERVAL = float(os.getenv("MATCHING_RELOAD_INTERVAL", 60))
+MATCHING_MAX_K = int(os.getenv("MATCHING_MAX_K", 100))
+
+# campaign rotation (promotion/rotation.py); signals rebuild the schedule, TTL is a safety net
+PROMOTION_CACHE_TTL = int(os.getenv("PROMOTION_CACHE_TTL", 60))
+PROMOTION_SCHEDULE_SLOTS = int(os.getenv("PROMOTION_SCHEDULE_SLOTS", 1000))
+# impressions reserved per DB round trip; unserved ones are returned on rebuild and shutdown
+PROMOTION_REACH_LEASE = int(os.getenv("PROMOTION_REACH_LEASE", 20))
+# impression/click counters (promotion/tracking.py) are bulk-upserted this often
+PROMOTION_STATS_FLUSH_INTERVAL = float(os.getenv("PROMOTION_STATS_FLUSH_INTERVAL", 5))
+# promo channel membership checks (promotion/membership.py); only positive results are cached
+PROMO_MEMBERSHIP_CACHE_TTL = int(os.getenv("PROMO_MEMBERSHIP_CACHE_TTL", 3600))
+PROMO_MEMBERSHIP_CACHE_SIZE = int(os.getenv("PROMO_MEMBERSHIP_CACHE_SIZE", 100000))
+PROMO_MEMBERSHIP_CONCURRENCY = int(os.getenv("PROMO_MEMBERSHIP_CONCURRENCY", 10))
+# extra daily uploads granted per verified campaign channel
+PROMO_UNLOCK_UPLOADS = int(os.getenv("PROMO_UNLOCK_UPLOADS", 1))
+# public base URL, used for links the bot sends (e.g. promoted channel click-through)
+SITE_URL = os.getenv("SITE_URL", "https://tena.bdnsys.com").rstrip("/")
+
 
 
 GEMINI_API_TOKEN=os.getenv("GEMINI_API_TOKEN")
@@ -252,5 +332,10 @@ LOGGING = {
             "level": "DEBUG",
             "propagate": True,
         },
+        # SQLAlchemy names pool loggers after the pool class, which lives in tenabot.db;
+        # keep per-checkout chatter out of the logs like SQLAlchemy's own pools.
+        "tenabot.db.InstrumentedQueuePool": {
+            "level": "WARNING",
+        },
     },
 }
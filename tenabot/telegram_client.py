@@ -0,0 +1,110 @@
+import asyncio
+import atexit
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable
+
+from django.conf import settings
+from telegram import Bot
+from telegram.request import HTTPXRequest
+
+logger = logging.getLogger(__name__)
+
+
+class TelegramClient:
+    """
+    One long-lived Bot per worker process.
+
+    The Bot and its pooled httpx client live on a dedicated event-loop thread,
+    so sync code (views, the processing pipeline) can hand it coroutines with
+    submit() instead of spinning up a client and an event loop per message.
+    """
+
+    def __init__(self, token: str, pool_size: int = 8):
+        self._token = token
+        self._pool_size = pool_size
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._bot = None
+        self._pid = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        self._ensure_started()
+        return self._loop
+
+    @property
+    def bot(self) -> Bot:
+        self._ensure_started()
+        return self._bot
+
+    def _ensure_started(self):
+        # Re-create everything after a fork: threads and sockets don't survive it.
+        if self._loop is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return
+            if not self._token:
+                raise ValueError("TELEGRAM_BOT_TOKEN missing in settings.")
+
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="telegram-client", daemon=True)
+            thread.start()
+
+            request = HTTPXRequest(
+                connection_pool_size=self._pool_size,
+                read_timeout=settings.TELEGRAM_READ_TIMEOUT,
+                write_timeout=settings.TELEGRAM_WRITE_TIMEOUT,
+            )
+            bot = Bot(token=self._token, request=request)
+            asyncio.run_coroutine_threadsafe(bot.initialize(), loop).result(settings.TELEGRAM_READ_TIMEOUT)
+
+            self._bot, self._loop, self._thread, self._pid = bot, loop, thread, os.getpid()
+            logger.info("🤖 Telegram client started (pool size %d)", self._pool_size)
+
+    def submit(self, call: Callable[[Bot], Awaitable]) -> Future:
+        """
+        Schedule call(bot) on the client loop from any thread.
+        Returns a concurrent.futures.Future with the coroutine's result.
+        """
+        self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(call(self._bot), self._loop)
+
+    def run(self, call: Callable[[Bot], Awaitable], timeout: float = None):
+        """Blocking variant of submit() for sync callers."""
+        return self.submit(call).result(timeout)
+
+    def shutdown(self):
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._bot.shutdown(), self._loop).result(10)
+            except Exception as e:
+                logger.warning("⚠️ Telegram client shutdown failed: %s", e)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+            self._loop.close()
+            self._bot = self._loop = self._thread = None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_telegram_client() -> TelegramClient:
+    """Process-wide TelegramClient built from Django settings."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = TelegramClient(
+                    settings.TELEGRAM_BOT_TOKEN,
+                    pool_size=settings.TELEGRAM_CONNECTION_POOL_SIZE,
+                )
+                atexit.register(_client.shutdown)
+    return _client
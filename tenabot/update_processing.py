@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+from .metrics import registry
+
+queue_wait_timer = registry.timer("bot.updates.queue_wait_seconds")
+handle_timer = registry.timer("bot.updates.handle_seconds")
+
+
+class TimestampedUpdateQueue(asyncio.Queue):
+    """
+    Application update_queue that remembers when each Update arrived, so the
+    processor can measure how long it waited before a handler started.
+    Shared by the polling Updater and the webhook endpoint.
+    """
+
+    MAX_TRACKED = 10000
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.arrivals = {}
+
+    def _put(self, item):
+        if isinstance(item, Update):
+            self.arrivals[item.update_id] = time.perf_counter()
+            if len(self.arrivals) > self.MAX_TRACKED:
+                # Drop the oldest entry (dicts keep insertion order).
+                self.arrivals.pop(next(iter(self.arrivals)))
+        super()._put(item)
+
+    def pop_arrival(self, update):
+        if isinstance(update, Update):
+            return self.arrivals.pop(update.update_id, None)
+        return None
+
+
+class PerChatUpdateProcessor(BaseUpdateProcessor):
+    """
+    Processes up to max_concurrent_updates updates at once while keeping
+    updates from the same chat strictly in arrival order (one asyncio.Lock
+    per active chat, FIFO). Locks are dropped once a chat has no pending work.
+
+    PTB's process_update() holds the base class semaphore for the whole of
+    do_process_update(), including the wait for a chat's lock, so a busy
+    chat's backlog would use up every slot. The base semaphore is therefore
+    given a limit it never reaches, and the real one is taken only once an
+    update is next in its chat.
+    """
+
+    _UNBOUNDED = 2 ** 30
+
+    def __init__(self, max_concurrent_updates: int, update_queue: TimestampedUpdateQueue = None):
+        if max_concurrent_updates < 1:
+            raise ValueError("max_concurrent_updates must be a positive integer")
+        super().__init__(self._UNBOUNDED)
+        self._slots = asyncio.BoundedSemaphore(max_concurrent_updates)
+        self._running = 0
+        self._update_queue = update_queue
+        self._chat_locks = {}
+
+    @property
+    def current_concurrent_updates(self) -> int:
+        """Updates whose handlers are running (not those waiting behind their chat)."""
+        return self._running
+
+    @staticmethod
+    def _chat_key(update):
+        if isinstance(update, Update):
+            if update.effective_chat:
+                return update.effective_chat.id
+            if update.effective_user:
+                return update.effective_user.id
+        return None
+
+    async def do_process_update(self, update, coroutine):
+        arrived = self._update_queue.pop_arrival(update) if self._update_queue is not None else None
+        chat_key = self._chat_key(update)
+
+        if chat_key is None:
+            await self._run(coroutine, arrived)
+            return
+
+        entry = self._chat_locks.get(chat_key)
+        if entry is None:
+            entry = self._chat_locks[chat_key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                await self._run(coroutine, arrived)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._chat_locks[chat_key]
+
+    async def _run(self, coroutine, arrived):
+        async with self._slots:
+            started = time.perf_counter()
+            if arrived is not None:
+                queue_wait_timer.observe(started - arrived)
+            self._running += 1
+            try:
+                await coroutine
+            finally:
+                self._running -= 1
+                handle_timer.observe(time.perf_counter() - started)
+
+    async def initialize(self) -> None:
+        registry.gauge("bot.updates.in_flight", lambda: self.current_concurrent_updates)
+
+    async def shutdown(self) -> None:
+        self._chat_locks.clear()
@@ -24,7 +24,10 @@ from django.conf.urls.static import static,serve
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('bot/', include('bot.urls')),
+    path('promotion/', include('promotion.urls')),
+    path('analytics/', include('analytics.urls')),
     path('api/register_telegram_user/', views.RegisterTelegramUser.as_view(), name="register_telegram_user"),
+    path('api/metrics/', views.MetricsView.as_view(), name="metrics"),
     # path('api/get_user/<str:telegram_id>/', views.get_user, name='get_user'),
     # path('api/get_users/', views.get_users, name='get_users'),
 ]
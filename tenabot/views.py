@@ -8,12 +8,14 @@ from django.middleware.csrf import get_token
 from django.contrib.auth import login
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 
 from .utils import check_telegram_data_integrity
+from .metrics import registry
 from users.models import User
 from users.serializers import UserSerializer
+from users.identity_cache import apply_profile, identity_cache
 from rest_framework.authentication import BasicAuthentication, SessionAuthentication
 logger = logging.getLogger(__name__)
 
@@ -105,24 +107,38 @@ class RegisterTelegramUser(APIView):
 
             # Step 3: get or create user
             try:
-                user, created = User.objects.get_or_create(
-                    telegram_id=telegram_id,
-                    defaults={
-                        "username": telegram_user_data.get("username") or f"user_{telegram_id}",
-                        "first_name": telegram_user_data.get("first_name", ""),
-                        "last_name": telegram_user_data.get("last_name", ""),
-                        "avatar_url": telegram_user_data.get("photo_url", None),
-                    },
-                )
-                logger.debug("User get_or_create result: created=%s, user_id=%s, username=%s", created, user.id, user.username)
-                if not created:
-                    # update latest info
-                    user.username = telegram_user_data.get("username", user.username)
-                    user.first_name = telegram_user_data.get("first_name", user.first_name)
-                    user.last_name = telegram_user_data.get("last_name", user.last_name)
-                    user.avatar_url = telegram_user_data.get("photo_url", user.avatar_url)
-                    user.save()
-                    logger.debug("Existing user updated from Telegram data: %s", user.id)
+                # Only fields Telegram actually sent; missing keys keep their stored value
+                profile = {
+                    field: telegram_user_data[key]
+                    for field, key in (("username", "username"), ("first_name", "first_name"),
+                                       ("last_name", "last_name"), ("avatar_url", "photo_url"))
+                    if key in telegram_user_data
+                }
+                user = None
+                cached = identity_cache.get(telegram_id)
+                if cached and cached.matches(profile):
+                    # Returning user, profile unchanged: one primary-key read, no write
+                    user = User.objects.filter(pk=cached.user_id).first()
+                    logger.debug("User resolved from identity cache: user_id=%s", cached.user_id)
+                if user is None:
+                    user, created = User.objects.get_or_create(
+                        telegram_id=telegram_id,
+                        defaults={
+                            "username": telegram_user_data.get("username") or f"user_{telegram_id}",
+                            "first_name": telegram_user_data.get("first_name", ""),
+                            "last_name": telegram_user_data.get("last_name", ""),
+                            "avatar_url": telegram_user_data.get("photo_url", None),
+                        },
+                    )
+                    logger.debug("User get_or_create result: created=%s, user_id=%s, username=%s", created, user.id, user.username)
+                    if not created:
+                        # update latest info, writing only the fields that changed
+                        changed = apply_profile(user, profile)
+                        if changed:
+                            user.save(update_fields=changed)
+                            logger.debug("Existing user updated from Telegram data: %s (%s)", user.id, changed)
+                        else:
+                            identity_cache.remember(user)
             except Exception as e:
                 logger.exception("DB error creating/updating user: %s", e)
                 return Response({"success": False, "detail": "Database error creating/updating user."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -145,6 +161,14 @@ class RegisterTelegramUser(APIView):
             logger.exception("Unhandled exception in register_telegram_user: %s", top_e)
             return Response({"success": False, "detail": "Internal server error."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class MetricsView(APIView):
+    """Staff-only snapshot of process-local metrics (dispatcher queue depth, send latency, ...)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(registry.snapshot())
+
+
 # from django.views.decorators.csrf import ensure_csrf_cookie
 # from rest_framework.decorators import api_view, permission_classes
 # from rest_framework.permissions import AllowAny
@@ -0,0 +1,123 @@
+import asyncio
+import hmac
+import json
+import logging
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from telegram import Update
+
+logger = logging.getLogger(__name__)
+
+# Telegram updates are small; anything bigger is not from Telegram.
+MAX_UPDATE_BYTES = 1024 * 1024
+
+
+class TelegramWebhookApp:
+    """
+    ASGI wrapper used in webhook mode.
+
+    POSTs to settings.TELEGRAM_WEBHOOK_PATH are verified against the secret
+    token and pushed straight into the bot Application's update_queue, so
+    updates are handled in-process. Every other request goes to Django.
+    """
+
+    def __init__(self, django_app):
+        if not settings.TELEGRAM_WEBHOOK_SECRET:
+            raise ImproperlyConfigured("TELEGRAM_WEBHOOK_SECRET is required when TELEGRAM_BOT_MODE=webhook.")
+        self.django_app = django_app
+        self.path = settings.TELEGRAM_WEBHOOK_PATH
+        self.secret = settings.TELEGRAM_WEBHOOK_SECRET.encode()
+        self.bot_app = None
+        self._start_lock = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http" and scope["path"] == self.path:
+            await self._handle_update(scope, receive, send)
+        else:
+            await self.django_app(scope, receive, send)
+
+    async def _ensure_started(self):
+        if self.bot_app is not None:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.bot_app is not None:
+                return
+            from .bot import build_application
+
+            app = build_application(webhook=True)
+            await app.initialize()
+            await app.start()
+            self.bot_app = app
+            logger.info("🌐 Telegram webhook handler ready at %s", self.path)
+
+    async def _shutdown(self):
+        if self.bot_app is None:
+            return
+        await self.bot_app.stop()
+        await self.bot_app.shutdown()
+        self.bot_app = None
+
+    async def _lifespan(self, receive, send):
+        # Django's ASGI handler doesn't speak lifespan, so it is handled here.
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self._ensure_started()
+                except Exception as e:
+                    logger.error("❌ Telegram webhook startup failed: %s", e, exc_info=True)
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self._shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _handle_update(self, scope, receive, send):
+        if scope["method"] != "POST":
+            await self._respond(send, 405)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        token = headers.get(b"x-telegram-bot-api-secret-token", b"")
+        if not hmac.compare_digest(token, self.secret):
+            logger.warning("⚠️ Rejected webhook call with a missing or invalid secret token")
+            await self._respond(send, 403)
+            return
+
+        body = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            body.extend(message.get("body", b""))
+            more_body = message.get("more_body", False)
+            if len(body) > MAX_UPDATE_BYTES:
+                await self._respond(send, 413)
+                return
+
+        try:
+            await self._ensure_started()
+            update = Update.de_json(json.loads(body), self.bot_app.bot)
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning("⚠️ Malformed Telegram update: %s", e)
+            await self._respond(send, 400)
+            return
+
+        # Acknowledge immediately; the Application processes the queue in the background.
+        await self.bot_app.update_queue.put(update)
+        await self._respond(send, 200)
+
+    @staticmethod
+    async def _respond(send, status):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"text/plain"), (b"content-length", b"0")],
+        })
+        await send({"type": "http.response.body", "body": b""})
@@ -0,0 +1,76 @@
+# tenabot/tests/resume_factory.py
+"""
+Synthetic resume generators used by the PDF benchmark suite.
+
+Every generator is seeded so the same scenario always renders the same
+document, which keeps the stored baseline comparable between runs.
+"""
+import random
+
+SKILL_POOL = [
+    "Python", "Django", "PostgreSQL", "Docker", "Kubernetes", "Golang (Go)", "Gin",
+    "React.js", "TypeScript", "Redis", "Celery", "AWS", "GCP", "Terraform", "Git",
+    "GraphQL", "REST APIs", "CI/CD", "Linux", "Nginx", "SQLAlchemy", "Pandas",
+]
+
+UNICODE_WORDS = [
+    "Ethiopia", "አዲስ አበባ", "ሶፍትዌር", "Zürich", "São Paulo", "Kraków", "Ελληνικά",
+    "Москва", "東京", "서울", "مرحبا", "naïve", "façade", "Ångström", "😀", "🚀",
+]
+
+LOREM = (
+    "Designed, built and operated services handling millions of requests per day "
+    "while mentoring engineers and improving reliability across the platform"
+).split()
+
+
+def _sentence(rng, words, length):
+    return " ".join(rng.choice(words) for _ in range(length)).capitalize() + "."
+
+
+def make_resume(skills=10, jobs=3, summary_words=40, unicode_heavy=False, seed=0):
+    """Build a resume dict shaped like the Gemini output consumed by generate_harvard_pdf."""
+    rng = random.Random(seed)
+    words = LOREM + UNICODE_WORDS if unicode_heavy else LOREM
+    skill_pool = SKILL_POOL + UNICODE_WORDS if unicode_heavy else SKILL_POOL
+
+    return {
+        "name": "Ŝýnthetic Çandidate" if unicode_heavy else "Synthetic Candidate",
+        "position_inferred": "Backend Developer",
+        "phone": "+251 900 000 000",
+        "email": "candidate@example.com",
+        "linkedin": "linkedin.com/in/synthetic",
+        "github": "github.com/synthetic",
+        "core_values": [_sentence(rng, words, 3) for _ in range(4)],
+        "skills": [f"{rng.choice(skill_pool)} {i}" for i in range(skills)],
+        "work_history": [
+            {
+                "title": _sentence(rng, words, 2),
+                "company": _sentence(rng, words, 2),
+                "start_date": f"0{1 + i % 9}/20{10 + i % 15}",
+                "end_date": "Present" if i == 0 else f"0{1 + i % 9}/20{11 + i % 15}",
+                "summary": _sentence(rng, words, summary_words),
+            }
+            for i in range(jobs)
+        ],
+        "full_education": [
+            {
+                "degree": "BSc",
+                "field_of_study": "Computer Science",
+                "institution": "University of Gondar",
+                "graduation_date": "2021",
+            }
+        ],
+    }
+
+
+# Scenario name -> generator kwargs. Names are the keys of the stored baseline.
+SCENARIOS = {
+    "small": dict(skills=5, jobs=1, summary_words=30),
+    "typical": dict(skills=15, jobs=4, summary_words=60),
+    "many_skills": dict(skills=200, jobs=3, summary_words=60),
+    "many_jobs": dict(skills=15, jobs=40, summary_words=60),
+    "long_summaries": dict(skills=15, jobs=6, summary_words=600),
+    "unicode_heavy": dict(skills=40, jobs=8, summary_words=120, unicode_heavy=True),
+    "worst_case": dict(skills=200, jobs=40, summary_words=300, unicode_heavy=True),
+}
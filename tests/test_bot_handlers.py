@@ -0,0 +1,35 @@
+import asyncio
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from bot.services.bot_data import StartContext
+from tenabot import bot
+
+
+class StartHandlerTest(SimpleTestCase):
+    def start(self, start_context):
+        message = SimpleNamespace(reply_text=mock.AsyncMock())
+        update = SimpleNamespace(
+            effective_user=SimpleNamespace(id=42, first_name="Nazri", username="nazri"),
+            message=message,
+        )
+        with mock.patch.object(bot, "register_telegram_user", mock.AsyncMock(return_value=(7, False))), \
+                mock.patch.object(bot, "get_start_context", mock.AsyncMock(return_value=start_context)):
+            asyncio.run(bot.start(update, None))
+        return message.reply_text
+
+    def test_under_the_limit_gets_one_welcome(self):
+        reply_text = self.start(StartContext(usage_count=1, upload_limit=3))
+        reply_text.assert_awaited_once()
+        self.assertIn("Welcome back", reply_text.await_args.args[0])
+
+    def test_at_the_limit_also_gets_the_promotion(self):
+        reply_text = self.start(StartContext(usage_count=3, upload_limit=3,
+                                             promo_channel_name="Tena Jobs", promo_campaign_id=5))
+        self.assertEqual(reply_text.await_count, 2)
+        promo = reply_text.await_args
+        self.assertIn("daily upload limit", promo.args[0])
+        buttons = [row[0].text for row in promo.kwargs["reply_markup"].inline_keyboard]
+        self.assertEqual(buttons[1:], ["📢 Join Tena Jobs", "✅ I've joined"])
@@ -0,0 +1,81 @@
+import asyncio
+from unittest import mock
+
+from django.test import SimpleTestCase
+from telegram.error import BadRequest, NetworkError, RetryAfter, TimedOut
+
+from tenabot.dispatcher import SendRateLimits, TelegramRateLimiter, send_with_retries
+
+
+class SendRateLimitsTest(SimpleTestCase):
+    def setUp(self):
+        self.limits = SendRateLimits(global_per_second=10, per_chat_per_second=1)
+
+    def test_same_chat_is_spaced_by_the_chat_interval(self):
+        self.assertEqual(self.limits._reserve_chat(1), 0)
+        self.assertAlmostEqual(self.limits._reserve_chat(1), 1.0, places=2)
+        self.assertAlmostEqual(self.limits._reserve_chat(1), 2.0, places=2)
+
+    def test_chats_do_not_share_slots(self):
+        self.limits._reserve_chat(1)
+        self.assertEqual(self.limits._reserve_chat(2), 0)
+
+    def test_global_slots_are_spaced_by_the_global_rate(self):
+        delays = [self.limits._reserve_global() for _ in range(3)]
+        self.assertEqual(delays[0], 0)
+        self.assertAlmostEqual(delays[1], 0.1, places=2)
+        self.assertAlmostEqual(delays[2], 0.2, places=2)
+
+    def test_back_off_holds_every_sender(self):
+        self.limits.back_off(5)
+        self.assertAlmostEqual(self.limits._reserve_global(), 5.0, places=1)
+        # A shorter back-off never pulls the hold forward
+        self.limits.back_off(1)
+        self.assertGreater(self.limits._reserve_global(), 4.9)
+
+
+class SendWithRetriesTest(SimpleTestCase):
+    def setUp(self):
+        self.limits = SendRateLimits(global_per_second=1000, per_chat_per_second=1000)
+        patcher = mock.patch("tenabot.dispatcher.asyncio.sleep", new=mock.AsyncMock())
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def send(self, *outcomes, **kwargs):
+        """Run send_with_retries against a call that raises or returns each outcome in turn."""
+        call = mock.AsyncMock(side_effect=list(outcomes))
+        result = asyncio.run(send_with_retries(self.limits, 1, call, max_retries=3, **kwargs))
+        return result, call.await_count
+
+    def test_retry_after_backs_off_and_retries(self):
+        with mock.patch.object(self.limits, "back_off", wraps=self.limits.back_off) as back_off:
+            self.assertEqual(self.send(RetryAfter(7), "ok"), ("ok", 2))
+        back_off.assert_called_once_with(7.0)
+        self.sleep.assert_any_await(7.0)
+
+    def test_network_errors_are_retried_up_to_the_limit(self):
+        self.assertEqual(self.send(NetworkError("reset"), NetworkError("reset"), "ok"), ("ok", 3))
+        with self.assertRaises(NetworkError):
+            self.send(*[NetworkError("down")] * 4)
+
+    def test_timed_out_send_is_not_repeated(self):
+        with self.assertRaises(TimedOut):
+            self.send(TimedOut(), "ok")
+
+    def test_timed_out_idempotent_call_is_retried(self):
+        self.assertEqual(self.send(TimedOut(), "ok", idempotent=True), ("ok", 2))
+
+    def test_bad_request_is_not_retried(self):
+        with self.assertRaises(BadRequest):
+            self.send(BadRequest("chat not found"), "ok")
+
+    def test_rate_limiter_retries_only_idempotent_endpoints_on_timeout(self):
+        limiter = TelegramRateLimiter(self.limits)
+
+        def request(endpoint):
+            callback = mock.AsyncMock(side_effect=[TimedOut(), "ok"])
+            return asyncio.run(limiter.process_request(callback, (), {}, endpoint, {"chat_id": 1}, None))
+
+        self.assertEqual(request("getChatMember"), "ok")
+        with self.assertRaises(TimedOut):
+            request("sendMessage")
@@ -0,0 +1,43 @@
+import asyncio
+import os
+import tempfile
+from concurrent.futures import Future
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from tenabot import notification
+
+
+class SendPdfTest(SimpleTestCase):
+    def setUp(self):
+        handle, self.pdf_path = tempfile.mkstemp(suffix=".pdf")
+        os.write(handle, b"%PDF-1.4")
+        os.close(handle)
+        self.addCleanup(os.remove, self.pdf_path)
+        self.bot = SimpleNamespace(send_document=mock.AsyncMock(
+            return_value=SimpleNamespace(document=SimpleNamespace(file_id="FILE"))
+        ))
+
+    def send(self, store):
+        with mock.patch.object(notification, "run_in_db_pool", store):
+            return asyncio.run(notification._send_pdf(self.bot, 1, self.pdf_path, "cv.pdf", "caption", resume_id=5))
+
+    def test_send_stores_the_file_id_itself(self):
+        store = mock.AsyncMock()
+        self.send(store)
+        store.assert_awaited_once_with(notification._store_file_id, 5, "FILE")
+
+    def test_store_failure_does_not_fail_the_send(self):
+        result = self.send(mock.AsyncMock(side_effect=RuntimeError("db down")))
+        self.assertEqual(result.document.file_id, "FILE")
+        self.bot.send_document.assert_awaited_once()
+
+    @override_settings(TELEGRAM_PDF_SEND_WAIT=0.01)
+    def test_caller_stops_waiting_without_cancelling_the_send(self):
+        queued = Future()
+        dispatcher = SimpleNamespace(submit=mock.Mock(return_value=queued))
+        with mock.patch.object(notification, "get_dispatcher", return_value=dispatcher):
+            self.assertIsNone(notification.send_pdf_to_telegram(1, self.pdf_path, "Data Engineer", resume_id=5))
+        self.assertFalse(queued.cancelled())
@@ -0,0 +1,126 @@
+import gc
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+import logging
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from analytics import pdf_service
+
+from .resume_factory import SCENARIOS, make_resume
+
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "benchmarks", "pdf_render_baseline.json")
+
+# Set PDF_BENCH_UPDATE=1 to rewrite the stored baseline from the current run.
+UPDATE_BASELINE = os.getenv("PDF_BENCH_UPDATE") == "1"
+REPEATS = int(os.getenv("PDF_BENCH_REPEATS", 3))
+
+# Allowed relative regression per metric; output size should be nearly deterministic.
+TOLERANCE = {
+    "peak_alloc_bytes": float(os.getenv("PDF_BENCH_MEMORY_TOLERANCE", 0.25)),
+    "output_bytes": float(os.getenv("PDF_BENCH_SIZE_TOLERANCE", 0.10)),
+}
+# Wall time depends on the machine the baseline was recorded on, so it is only
+# logged unless PDF_BENCH_CHECK_TIME=1 (on the same hardware as the baseline).
+if os.getenv("PDF_BENCH_CHECK_TIME") == "1":
+    TOLERANCE["wall_time_s"] = float(os.getenv("PDF_BENCH_TIME_TOLERANCE", 1.0))
+
+
+def measure_render(resume_data: dict, telegram_id: int = 9999) -> dict:
+    """Render once and return wall time, peak traced allocation and output size."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        pdf_path = pdf_service.generate_harvard_pdf(resume_data, telegram_id)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    if not pdf_path:
+        raise AssertionError("PDF generation returned None — it failed somewhere.")
+    return {
+        "wall_time_s": elapsed,
+        "peak_alloc_bytes": peak,
+        "output_bytes": os.path.getsize(pdf_path),
+    }
+
+
+def detach_file_handlers() -> list:
+    """Drop the LOGGING file handlers so renders don't fill logs/tena.log; console output stays."""
+    detached = []
+    for name in [None, *settings.LOGGING.get("loggers", {})]:
+        target = logging.getLogger(name)
+        for handler in list(target.handlers):
+            if isinstance(handler, logging.FileHandler):
+                target.removeHandler(handler)
+                detached.append((target, handler))
+    return detached
+
+
+def load_baseline() -> dict:
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class PDFRenderBenchmarkTest(SimpleTestCase):
+    """Renders every synthetic scenario and fails when memory or output size regresses past its tolerance."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp(prefix="tenabot-bench-")
+        cls._media_override = override_settings(MEDIA_ROOT=cls.media_root)
+        cls._media_override.enable()
+        cls._file_handlers = detach_file_handlers()
+        cls.baseline = load_baseline()
+        cls.results = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._media_override.disable()
+        for target, handler in cls._file_handlers:
+            target.addHandler(handler)
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        if UPDATE_BASELINE and cls.results:
+            os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+            with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+                json.dump(cls.results, f, indent=2, sort_keys=True)
+                f.write("\n")
+            print(f"📝 PDF benchmark baseline written to {BASELINE_PATH}")
+        super().tearDownClass()
+
+    def test_render_scenarios(self):
+        for name, params in SCENARIOS.items():
+            with self.subTest(scenario=name):
+                resume_data = make_resume(**params)
+                runs = [measure_render(resume_data) for _ in range(REPEATS)]
+                # Best-of-N smooths out scheduler noise for time and allocation.
+                result = {
+                    "wall_time_s": round(min(r["wall_time_s"] for r in runs), 4),
+                    "peak_alloc_bytes": min(r["peak_alloc_bytes"] for r in runs),
+                    "output_bytes": min(r["output_bytes"] for r in runs),
+                }
+                self.results[name] = result
+                logger.info(f"📏 [BENCH] {name}: {result}")
+
+                baseline = self.baseline.get(name)
+                if UPDATE_BASELINE or not baseline:
+                    continue
+                for metric, tolerance in TOLERANCE.items():
+                    allowed = baseline[metric] * (1 + tolerance)
+                    self.assertLessEqual(
+                        result[metric],
+                        allowed,
+                        f"{name}: {metric} regressed to {result[metric]} "
+                        f"(baseline {baseline[metric]}, tolerance {tolerance:.0%})",
+                    )
@@ -0,0 +1,78 @@
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+
+from bot.models import ResumeInfo
+from bot.renderers import ORJSONRenderer
+from bot.row_serializers import declared_fields, serialize_rows
+from bot.serializers import ResumeInfoSerializer
+
+from .resume_factory import make_resume
+
+logger = logging.getLogger(__name__)
+
+REPEATS = int(os.getenv("SERIALIZE_BENCH_REPEATS", 20))
+# Timings are always logged; set SERIALIZE_BENCH_ASSERT=1 to also fail when the fast path isn't faster.
+ASSERT_TIMING = os.getenv("SERIALIZE_BENCH_ASSERT") == "1"
+PAGE_SIZE = 50
+
+
+def make_page(size: int = PAGE_SIZE) -> list:
+    """A list page of JSON-heavy ResumeInfo rows, shaped like what the pipeline stores."""
+    rows = []
+    for i in range(size):
+        resume = make_resume(skills=40, jobs=6, summary_words=80, unicode_heavy=i % 5 == 0, seed=i)
+        rows.append(ResumeInfo(
+            id=i + 1,
+            resume_id=i + 1,
+            phone=resume["phone"],
+            email=resume["email"],
+            linkedin=resume["linkedin"],
+            position=resume["position_inferred"],
+            education_level="Bachelor",
+            work_history=resume["work_history"],
+            skills=resume["skills"],
+            core_values=resume["core_values"],
+            structured_json=resume,
+            created_at=datetime(2026, 1, 1) + timedelta(minutes=i, microseconds=i),
+        ))
+    return rows
+
+
+def best_of(func, repeats: int = REPEATS) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+class SerializationBenchmarkTest(SimpleTestCase):
+    """Compares the DRF serializer + JSONRenderer path with the attrgetter rows + orjson path."""
+
+    def setUp(self):
+        self.rows = make_page()
+        self.fields = declared_fields(ResumeInfoSerializer)
+
+    def drf_path(self):
+        return JSONRenderer().render(ResumeInfoSerializer(self.rows, many=True).data)
+
+    def fast_path(self):
+        return ORJSONRenderer().render(serialize_rows(ResumeInfo, self.fields, self.rows))
+
+    def test_fast_path_matches_drf_output(self):
+        self.assertEqual(json.loads(self.fast_path()), json.loads(self.drf_path()))
+
+    def test_report_timings(self):
+        drf = best_of(self.drf_path)
+        fast = best_of(self.fast_path)
+        logger.info(f"📏 [BENCH] {PAGE_SIZE}-row ResumeInfo page: DRF {drf * 1000:.2f} ms, "
+                    f"attrgetter+orjson {fast * 1000:.2f} ms ({drf / fast:.1f}x)")
+        if ASSERT_TIMING:
+            self.assertLess(fast, drf)
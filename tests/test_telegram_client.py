@@ -0,0 +1,59 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from tenabot.telegram_client import TelegramClient
+
+
+class FakeBot:
+    def __init__(self, token, request):
+        self.token = token
+        self.initialized = self.closed = False
+
+    async def initialize(self):
+        self.initialized = True
+
+    async def shutdown(self):
+        self.closed = True
+
+
+class TelegramClientTest(SimpleTestCase):
+    def setUp(self):
+        for name, value in [("Bot", FakeBot), ("HTTPXRequest", mock.MagicMock())]:
+            patcher = mock.patch(f"tenabot.telegram_client.{name}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TelegramClient("token", pool_size=2)
+        self.addCleanup(self.client.shutdown)
+
+    def test_calls_share_one_bot_on_the_client_thread(self):
+        async def whoami(bot):
+            return bot, threading.current_thread().name
+
+        first_bot, thread_name = self.client.run(whoami, timeout=5)
+        second_bot, _ = self.client.run(whoami, timeout=5)
+        self.assertIs(first_bot, second_bot)
+        self.assertTrue(first_bot.initialized)
+        self.assertEqual(thread_name, "telegram-client")
+
+    def test_fork_gets_a_fresh_loop_and_bot(self):
+        parent_loop, parent_bot = self.client.loop, self.client.bot
+        with mock.patch("tenabot.telegram_client.os.getpid", return_value=-1):
+            self.assertIsNot(self.client.loop, parent_loop)
+            self.assertIsNot(self.client.bot, parent_bot)
+            self.client.shutdown()
+        # The parent's loop is only dropped, never stopped from the child.
+        self.assertTrue(parent_loop.is_running())
+        parent_loop.call_soon_threadsafe(parent_loop.stop)
+
+    def test_shutdown_closes_the_bot_and_stops_the_thread(self):
+        bot = self.client.bot
+        thread = self.client._thread
+        self.client.shutdown()
+        self.assertTrue(bot.closed)
+        self.assertFalse(thread.is_alive())
+
+    def test_missing_token_is_reported(self):
+        with self.assertRaises(ValueError):
+            TelegramClient("").run(mock.AsyncMock())
@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime, timezone
+
+from django.test import SimpleTestCase
+from telegram import Chat, Message, Update
+
+from tenabot.update_processing import PerChatUpdateProcessor
+
+
+def chat_update(update_id: int, chat_id: int) -> Update:
+    message = Message(update_id, datetime.now(timezone.utc), Chat(chat_id, Chat.PRIVATE))
+    return Update(update_id, message=message)
+
+
+class PerChatUpdateProcessorTest(SimpleTestCase):
+    def test_blocked_chat_does_not_delay_other_chats(self):
+        async def scenario():
+            processor = PerChatUpdateProcessor(2)
+            release = asyncio.Event()
+            done = []
+
+            async def handler(name, wait=False):
+                if wait:
+                    await release.wait()
+                done.append(name)
+
+            # Chat 1's first update blocks; its backlog queues behind it.
+            busy = [
+                asyncio.create_task(processor.process_update(chat_update(i, 1), handler(f"a{i}", wait=i == 1)))
+                for i in range(1, 4)
+            ]
+            await asyncio.sleep(0)
+            await asyncio.wait_for(processor.process_update(chat_update(10, 2), handler("b")), timeout=1)
+            self.assertEqual(done, ["b"])
+            self.assertEqual(processor.current_concurrent_updates, 1)
+
+            release.set()
+            await asyncio.gather(*busy)
+            self.assertEqual(done, ["b", "a1", "a2", "a3"])
+
+        asyncio.run(scenario())
+
+    def test_limit_applies_to_running_handlers(self):
+        async def scenario():
+            processor = PerChatUpdateProcessor(2)
+            release = asyncio.Event()
+            peak = 0
+
+            async def handler():
+                nonlocal peak
+                peak = max(peak, processor.current_concurrent_updates)
+                await release.wait()
+
+            tasks = [asyncio.create_task(processor.process_update(chat_update(i, i), handler())) for i in range(5)]
+            await asyncio.sleep(0.01)
+            self.assertEqual(processor.current_concurrent_updates, 2)
+            release.set()
+            await asyncio.gather(*tasks)
+            self.assertEqual(peak, 2)
+
+        asyncio.run(scenario())
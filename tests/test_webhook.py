@@ -0,0 +1,62 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from tenabot import webhook
+from tenabot.webhook import TelegramWebhookApp
+
+UPDATE = {"update_id": 1, "message": {"message_id": 2, "date": 0, "chat": {"id": 3, "type": "private"}, "text": "hi"}}
+
+
+@override_settings(TELEGRAM_WEBHOOK_SECRET="s3cret", TELEGRAM_WEBHOOK_PATH="/telegram/webhook/")
+class TelegramWebhookAppTest(SimpleTestCase):
+    def setUp(self):
+        self.django_app = mock.AsyncMock()
+        self.app = TelegramWebhookApp(self.django_app)
+        self.queue = asyncio.Queue()
+        self.app.bot_app = SimpleNamespace(bot=None, update_queue=self.queue)
+
+    def call(self, body=b"", path="/telegram/webhook/", method="POST", secret=b"s3cret", chunks=None):
+        scope = {"type": "http", "path": path, "method": method,
+                 "headers": [(b"x-telegram-bot-api-secret-token", secret)] if secret is not None else []}
+        messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks or []]
+        messages.append({"type": "http.request", "body": body, "more_body": False})
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(self.app(scope, receive, send))
+        return sent[0]["status"] if sent else None
+
+    def test_valid_update_is_queued_and_acknowledged(self):
+        self.assertEqual(self.call(json.dumps(UPDATE).encode()), 200)
+        self.assertEqual(self.queue.get_nowait().message.text, "hi")
+
+    def test_wrong_or_missing_secret_is_rejected(self):
+        self.assertEqual(self.call(json.dumps(UPDATE).encode(), secret=b"guess"), 403)
+        self.assertEqual(self.call(json.dumps(UPDATE).encode(), secret=None), 403)
+        self.assertTrue(self.queue.empty())
+
+    def test_bad_requests(self):
+        self.assertEqual(self.call(method="GET"), 405)
+        self.assertEqual(self.call(b"{not json"), 400)
+        with mock.patch.object(webhook, "MAX_UPDATE_BYTES", 10):
+            self.assertEqual(self.call(b"x" * 6, chunks=[b"x" * 6]), 413)
+        self.assertTrue(self.queue.empty())
+
+    def test_other_paths_go_to_django(self):
+        self.assertIsNone(self.call(path="/api/resumes/"))
+        self.django_app.assert_awaited_once()
+
+    @override_settings(TELEGRAM_WEBHOOK_SECRET="")
+    def test_secret_is_required(self):
+        with self.assertRaises(ImproperlyConfigured):
+            TelegramWebhookApp(self.django_app)
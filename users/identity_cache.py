@@ -0,0 +1,65 @@
+#tenabot/users/identity_cache.py
+"""
+Bounded LRU/TTL cache of telegram_id -> (user id, Telegram profile).
+
+Lets /start and the WebApp registration endpoint skip get_or_create and
+the profile UPDATE for returning users whose Telegram profile is unchanged.
+Entries are refreshed from post_save/post_delete on User (users/signals.py).
+"""
+import threading
+from dataclasses import dataclass
+
+from cachetools import TTLCache
+from django.conf import settings
+
+# Telegram-sourced fields we keep in sync on every registration.
+PROFILE_FIELDS = ("username", "first_name", "last_name", "avatar_url")
+
+
+@dataclass(frozen=True)
+class CachedIdentity:
+    user_id: int
+    profile: tuple
+
+    def matches(self, profile: dict) -> bool:
+        """True if every provided profile field equals the cached value."""
+        cached = dict(zip(PROFILE_FIELDS, self.profile))
+        return all(cached.get(field) == value for field, value in profile.items())
+
+
+def profile_of(user) -> tuple:
+    return tuple(getattr(user, field) for field in PROFILE_FIELDS)
+
+
+def apply_profile(user, profile: dict) -> list:
+    """Copy profile values onto user; returns the names of the fields that changed."""
+    changed = []
+    for field, value in profile.items():
+        if getattr(user, field) != value:
+            setattr(user, field, value)
+            changed.append(field)
+    return changed
+
+
+class UserIdentityCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, telegram_id):
+        with self._lock:
+            return self._cache.get(str(telegram_id))
+
+    def remember(self, user):
+        with self._lock:
+            self._cache[str(user.telegram_id)] = CachedIdentity(user.id, profile_of(user))
+
+    def invalidate(self, telegram_id):
+        with self._lock:
+            self._cache.pop(str(telegram_id), None)
+
+
+identity_cache = UserIdentityCache(
+    maxsize=settings.USER_IDENTITY_CACHE_SIZE,
+    ttl=settings.USER_IDENTITY_CACHE_TTL,
+)
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .identity_cache import identity_cache
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def refresh_identity_cache(sender, instance, **kwargs):
+    identity_cache.remember(instance)
+
+
+@receiver(post_delete, sender=User)
+def evict_identity_cache(sender, instance, **kwargs):
+    identity_cache.invalidate(instance.telegram_id)
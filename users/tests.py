@@ -1,3 +1,38 @@
-from django.test import TestCase
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from .identity_cache import UserIdentityCache, apply_profile
+
+
+def make_user(**overrides):
+    fields = dict(id=7, telegram_id="42", username="nazri", first_name="Nazri", last_name="", avatar_url=None)
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+class UserIdentityCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.cache = UserIdentityCache(maxsize=2, ttl=60)
+
+    def test_unchanged_profile_is_a_hit(self):
+        self.cache.remember(make_user())
+        cached = self.cache.get(42)
+        self.assertEqual(cached.user_id, 7)
+        self.assertTrue(cached.matches({"username": "nazri", "first_name": "Nazri"}))
+
+    def test_changed_profile_is_a_miss(self):
+        self.cache.remember(make_user())
+        self.assertFalse(self.cache.get("42").matches({"username": "renamed"}))
+
+    def test_cache_is_bounded(self):
+        for telegram_id in ("1", "2", "3"):
+            self.cache.remember(make_user(telegram_id=telegram_id))
+        self.assertIsNone(self.cache.get("1"))
+        self.assertIsNotNone(self.cache.get("3"))
+
+    def test_apply_profile_reports_only_changed_fields(self):
+        user = make_user()
+        changed = apply_profile(user, {"username": "nazri", "last_name": "Gedion"})
+        self.assertEqual(changed, ["last_name"])
+        self.assertEqual(user.last_name, "Gedion")